@@ -0,0 +1,214 @@
+"""
+Multi-criteria batch generation fanned out across a process pool.
+
+A batch is a list of criteria rows, each split into shards of at most
+`shard_size` prospects. Every shard gets its own seed derived from one base
+seed, so the output depends only on the base seed and shard size, never on the
+number of workers: a parallel run is byte-identical to a serial one.
+
+Shards are generated as prospects.ProspectBatch code columns. Workers send
+back only the columns and the small company and title pools; the parent looks
+the name pools and template ids up again, so a shard crosses the process
+boundary in a few bytes per row and templates are rendered only when read.
+"""
+import itertools
+import os
+import random
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from catalog import FIRST_NAMES, FOCUS_OPTIONS, INDUSTRIES, LAST_NAMES, ROLE_OPTIONS
+from corpus import load_vocabulary
+from prospects import ProspectBatch
+from sampling import UniqueNameSampler
+from templates import email_template_ids, follow_up_template_ids
+from utils import generate_linkedin_prospects
+
+CRITERIA_FIELDS = ("location", "demographic", "industry", "industry_focus", "target_role")
+
+# Largest number of prospects generated by a single task
+DEFAULT_SHARD_SIZE = 50_000
+
+# Fewest prospects worth starting worker processes for; smaller batches are
+# generated in-process, where drawing the codes is cheaper than the pool start-up
+PARALLEL_MIN_PROSPECTS = 500_000
+
+# ProspectBatch columns sent back from worker processes
+PACKED_COLUMNS = (
+    "first_codes", "last_codes", "suffixes", "company_codes", "title_codes", "email_codes", "relevance_scores"
+)
+
+def criteria_grid(locations, demographic, industries=None):
+    """
+    Yield criteria rows for every industry x focus option x role option x location.
+
+    Parameters:
+    - locations: Locations to cross with every combination
+    - demographic: Demographic used for every row
+    - industries: Industry names to include (defaults to the whole catalog)
+    """
+    for industry in industries or INDUSTRIES:
+        ind = INDUSTRIES.index(industry)
+        for focus, role, location in itertools.product(FOCUS_OPTIONS[ind], ROLE_OPTIONS[ind], locations):
+            yield {
+                "location": location,
+                "demographic": demographic,
+                "industry": industry,
+                "industry_focus": focus,
+                "target_role": role,
+            }
+
+def derive_seeds(seed, n):
+    """
+    Return `n` independent integer seeds derived from one base seed.
+
+    Without a base seed, one is drawn from the module-level `random`, so
+    random.seed() still controls batch output.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    elif seed < 0:
+        # SeedSequence rejects negative entropy, so negative seeds wrap to their 64-bit two's complement
+        seed &= 2**64 - 1
+    return [
+        int.from_bytes(child.generate_state(4).tobytes(), "little")
+        for child in np.random.SeedSequence(seed).spawn(n)
+    ]
+
+def plan_tasks(criteria_rows, count=5, seed=None, shard_size=DEFAULT_SHARD_SIZE, unique=False, vocabulary=None):
+    """
+    Split criteria rows into (row_index, criteria, count, seed, names, vocabulary) generation tasks.
+
+    Rows may carry their own `count`; larger counts are split into shards of at
+    most `shard_size` prospects. With `unique`, `names` is the (seed, position)
+    of the row's UniqueNameSampler, so shards of one row never repeat a profile
+    URL; otherwise it is None. `vocabulary` is a corpus directory each worker
+    maps for itself.
+    """
+    if shard_size <= 0:
+        raise ValueError("shard_size must be a positive integer")
+    shards = []
+    for row_index, row in enumerate(criteria_rows):
+        criteria = tuple(row.get(field) or None for field in CRITERIA_FIELDS)
+        total = int(row.get("count") or count)
+        for offset in range(0, total, shard_size):
+            shards.append((row_index, criteria, min(shard_size, total - offset), offset))
+    seeds = derive_seeds(seed, len(shards))
+
+    tasks = []
+    name_seed = None
+    for (row_index, criteria, size, offset), shard_seed in zip(shards, seeds):
+        if offset == 0:
+            # Every shard of a row continues the sampler seeded by the row's first shard
+            name_seed = shard_seed
+        names = (name_seed, offset) if unique else None
+        tasks.append((row_index, criteria, size, shard_seed, names, vocabulary))
+    return tasks
+
+def _name_pools(vocabulary):
+    """Return the (first, last) name pools shards draw from"""
+    if vocabulary is None:
+        return FIRST_NAMES, LAST_NAMES
+    return vocabulary.first_names, vocabulary.last_names
+
+def _run_task(task):
+    """Generate one shard as a ProspectBatch, returning (row_index, batch)"""
+    row_index, criteria, size, seed, names, vocabulary = task
+    vocabulary = load_vocabulary(vocabulary) if vocabulary else None
+    unique = False
+    if names is not None:
+        first_names, last_names = _name_pools(vocabulary)
+        unique = UniqueNameSampler(len(first_names), len(last_names), seed=names[0], position=names[1])
+    return row_index, generate_linkedin_prospects(
+        *criteria, count=size, seed=seed, unique=unique, vocabulary=vocabulary, columnar=True
+    )
+
+def _run_packed_task(task):
+    """Generate one shard in a worker process and return only its code columns and company and title pools"""
+    row_index, batch = _run_task(task)
+    columns = {name: getattr(batch, name) for name in PACKED_COLUMNS}
+    return row_index, (batch.companies, batch.titles, columns)
+
+def _unpack(task, packed):
+    """Rebuild a worker's shard, looking up the pools and template ids that stay in this process"""
+    criteria, vocabulary = task[1], task[5]
+    companies, titles, columns = packed
+    first_names, last_names = _name_pools(load_vocabulary(vocabulary) if vocabulary else None)
+    # Template ids are assigned per process, so they are looked up again from the criteria
+    template_criteria = criteria[2:]
+    return ProspectBatch(
+        criteria[0], first_names, last_names, columns["first_codes"], columns["last_codes"], columns["suffixes"],
+        companies, columns["company_codes"], titles, columns["title_codes"], email_template_ids(*template_criteria),
+        columns["email_codes"], follow_up_template_ids(*template_criteria), columns["relevance_scores"]
+    )
+
+def iter_batch(criteria_rows, count=5, seed=None, workers=None, shard_size=DEFAULT_SHARD_SIZE, ordered=True,
+               unique=False, vocabulary=None):
+    """
+    Generate prospects for many criteria rows, yielding (row_index, prospects) per shard.
+
+    Each shard's prospects are a ProspectBatch, whose templates are rendered
+    when its rows are read.
+
+    Parameters:
+    - criteria_rows: Iterable of dicts with location, demographic, industry and optional
+      industry_focus, target_role and count
+    - count: Prospects per row when a row has no count of its own
+    - seed: Base seed every shard seed is derived from
+    - workers: Worker processes (defaults to one per CPU; 1 runs serially in-process, as do batches
+      under PARALLEL_MIN_PROSPECTS prospects)
+    - shard_size: Largest number of prospects per task
+    - ordered: Yield shards in plan order; otherwise yield them as they complete
+    - unique: Never repeat a profile URL within a criteria row
+    - vocabulary: Directory of weighted corpora (see corpus.load_vocabulary)
+    """
+    tasks = plan_tasks(criteria_rows, count, seed, shard_size, unique, vocabulary)
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1 or sum(task[2] for task in tasks) < PARALLEL_MIN_PROSPECTS:
+        for task in tasks:
+            yield _run_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of tasks in flight so results don't pile up in memory
+        window = 2 * workers
+        pending = deque()
+        remaining = iter(tasks)
+        tasks_of = {}
+        for task in itertools.islice(remaining, window):
+            future = executor.submit(_run_packed_task, task)
+            tasks_of[future] = task
+            pending.append(future)
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                row_index, packed = future.result()
+                yield row_index, _unpack(tasks_of.pop(future), packed)
+                for task in itertools.islice(remaining, 1):
+                    future = executor.submit(_run_packed_task, task)
+                    tasks_of[future] = task
+                    pending.append(future)
+
+def generate_batch(criteria_rows, count=5, seed=None, workers=None, shard_size=DEFAULT_SHARD_SIZE, unique=False,
+                   vocabulary=None):
+    """
+    Generate prospects for many criteria rows and merge them in row order.
+
+    Returns one list of prospects per criteria row, as read-only views into the
+    rows' shards. Output is identical for any number of workers given the same
+    seed and shard size.
+    """
+    criteria_rows = list(criteria_rows)
+    results = [[] for _ in criteria_rows]
+    for row_index, prospects in iter_batch(criteria_rows, count, seed, workers, shard_size, unique=unique,
+                                                 vocabulary=vocabulary):
+        results[row_index].extend(prospects)
+    return results
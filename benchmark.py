@@ -0,0 +1,251 @@
+"""
+Throughput and peak-memory benchmarks for every generator stage.
+
+Each benchmark runs at every size for every industry plus an unknown one
+(which takes the generic fallback path). Per-call stages are called `size`
+times; the end-to-end benchmark generates `size` prospects in one call.
+Timings are the best of --repeat runs without tracing; peak memory comes
+from a separate tracemalloc run, counting only what the workload allocates.
+
+Examples:
+    python benchmark.py --save baseline.json
+    python benchmark.py --sizes 5 1000 --benchmarks prospects --compare baseline.json --threshold 0.2
+
+--compare exits with status 1 if any case is slower, or uses more memory,
+than the baseline by more than the threshold.
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from catalog import FIRST_NAMES, FOCUS_OPTIONS, INDUSTRIES, LAST_NAMES, ROLE_OPTIONS
+from utils import (
+    generate_companies_for_industry, generate_email_template, generate_follow_up_templates,
+    generate_job_titles, generate_linkedin_prospects
+)
+
+DEFAULT_SIZES = (5, 1_000, 100_000, 1_000_000)
+
+# Not in the catalog, so every stage takes its generic fallback
+UNKNOWN_INDUSTRY = "Underwater Basket Weaving"
+
+# Stop repeating a case once its runs have taken this long (it always runs at least once)
+MAX_CASE_SECONDS = 5.0
+
+# Distinct (name, title, company) inputs cycled through by the per-call template benchmarks
+INPUT_POOL_SIZE = 1_000
+
+SEED = 1234
+
+def industry_criteria(industry):
+    """Return (industry_focus, target_role) for an industry: its first options, or None for unknown ones"""
+    if industry not in INDUSTRIES:
+        return None, None
+    industry_id = INDUSTRIES.index(industry)
+    return FOCUS_OPTIONS[industry_id][0], ROLE_OPTIONS[industry_id][0]
+
+def _inputs(industry, focus, role, size):
+    """Return `size` (name, title, company) inputs cycled from a fixed pool"""
+    rng = random.Random(SEED)
+    companies = generate_companies_for_industry(industry, focus, rng)
+    titles = generate_job_titles(industry, role)
+    pool = [
+        (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(titles), rng.choice(companies))
+        for _ in range(min(size, INPUT_POOL_SIZE))
+    ]
+    return list(itertools.islice(itertools.cycle(pool), size))
+
+# Each benchmark prepares its inputs (untimed) and returns the workload to time
+
+def bench_companies(industry, focus, role, size):
+    def run():
+        rng = random.Random(SEED)
+        for _ in range(size):
+            generate_companies_for_industry(industry, focus, rng)
+    return run
+
+def bench_titles(industry, focus, role, size):
+    def run():
+        for _ in range(size):
+            generate_job_titles(industry, role)
+    return run
+
+def bench_email_template(industry, focus, role, size):
+    inputs = _inputs(industry, focus, role, size)
+    def run():
+        for name, title, company in inputs:
+            generate_email_template(name, title, company, industry, focus, role)
+    return run
+
+def bench_follow_up_templates(industry, focus, role, size):
+    inputs = _inputs(industry, focus, role, size)
+    def run():
+        for name, _, company in inputs:
+            generate_follow_up_templates(name, company, industry, focus, role)
+    return run
+
+def bench_prospects(industry, focus, role, size):
+    def run():
+        generate_linkedin_prospects("San Francisco", "Decision Makers", industry, focus, role, count=size, seed=SEED)
+    return run
+
+BENCHMARKS = {
+    "companies": bench_companies,
+    "titles": bench_titles,
+    "email_template": bench_email_template,
+    "follow_up_templates": bench_follow_up_templates,
+    "prospects": bench_prospects,
+}
+
+def case_key(benchmark, industry, size):
+    return f"{benchmark}/{industry}/{size}"
+
+def measure(workload, repeat, memory=True):
+    """
+    Time a workload and measure its peak traced allocation.
+
+    Returns a dict with the best run time in seconds and the peak bytes
+    (None when `memory` is off).
+    """
+    best, spent = float("inf"), 0.0
+    for _ in range(repeat):
+        random.seed(SEED)
+        start = time.perf_counter()
+        workload()
+        elapsed = time.perf_counter() - start
+        best, spent = min(best, elapsed), spent + elapsed
+        if spent >= MAX_CASE_SECONDS:
+            break
+
+    peak = None
+    if memory:
+        random.seed(SEED)
+        tracemalloc.start()
+        try:
+            workload()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+def run_benchmarks(benchmarks, industries, sizes, repeat, memory=True, report=None):
+    """
+    Run every benchmark for every industry and size.
+
+    Parameters:
+    - benchmarks: Names from BENCHMARKS
+    - industries: Industry names (unknown names exercise the fallback path)
+    - sizes: Calls per per-call benchmark, prospects for the end-to-end one
+    - repeat: Timed runs per case (the best is kept)
+    - memory: Also measure peak memory
+    - report: Optional function(key, result) called after each case
+    """
+    results = {}
+    for name, industry, size in itertools.product(benchmarks, industries, sizes):
+        focus, role = industry_criteria(industry)
+        result = measure(BENCHMARKS[name](industry, focus, role, size), repeat, memory)
+        result["size"] = size
+        result["per_second"] = size / result["seconds"] if result["seconds"] > 0 else None
+        key = case_key(name, industry, size)
+        results[key] = result
+        if report is not None:
+            report(key, result)
+    return results
+
+def environment():
+    """Describe the machine and library versions a baseline was recorded with"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline's.
+
+    Returns (key, metric, baseline value, current value, ratio) for every case
+    whose time or peak memory grew by more than `threshold` (0.2 = 20%).
+    Cases or metrics missing from either side are skipped.
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                regressions.append((key, metric, old, new, ratio))
+    return regressions
+
+def _format_result(key, result):
+    peak = result["peak_bytes"]
+    peak_text = f"{peak / (1024 * 1024):9.2f} MiB" if peak is not None else "          n/a"
+    rate = result["per_second"]
+    rate_text = f"{rate:14,.0f}/s" if rate is not None else "            n/a"
+    return f"{key:<60} {result['seconds'] * 1000:12.3f} ms {rate_text} {peak_text}"
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the prospect generator stages.")
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS), help="Benchmarks to run"
+    )
+    parser.add_argument(
+        "--industries", nargs="+", default=[*INDUSTRIES, UNKNOWN_INDUSTRY],
+        help="Industries to run (default: every industry plus an unknown one)"
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="Sizes to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case, best kept (default: 3)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the peak memory runs")
+    parser.add_argument("--save", help="Write the results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare the results with this JSON baseline file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown or memory growth (default: 0.2 = 20%%)"
+    )
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.repeat <= 0 or args.threshold < 0 or any(size <= 0 for size in args.sizes):
+        parser.error("--repeat and --sizes must be positive, --threshold non-negative")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = run_benchmarks(
+        args.benchmarks, args.industries, args.sizes, args.repeat, args.memory,
+        report=lambda key, result: print(_format_result(key, result), flush=True)
+    )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for key, metric, old, new, ratio in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.6g} -> {new:.6g} ({ratio - 1:+.1%})", file=sys.stderr)
+        compared = sum(key in baseline for key in results)
+        print(f"{len(regressions)} regression(s) in {compared} compared case(s)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
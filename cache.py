@@ -0,0 +1,139 @@
+"""
+Caching helpers: criteria keys, result size estimates and a bounded LRU cache.
+
+Search results are keyed by the normalized criteria plus count, seed and lazy
+flag (see result_store.ResultStore); ProspectCache is the LRU/TTL cache behind
+the export cache and the stage pipeline.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Number of rows sampled when estimating the size of a result set
+_SIZE_SAMPLE_ROWS = 64
+
+def normalize_criteria(location, demographic, industry, industry_focus=None, target_role=None):
+    """Strip and collapse whitespace in each criterion, mapping empty values to None"""
+    return tuple(
+        (" ".join(value.split()) or None) if isinstance(value, str) else value
+        for value in (location, demographic, industry, industry_focus, target_role)
+    )
+
+def estimate_size(prospects):
+    """Estimate the bytes held by a list of prospects from a sample of its rows"""
+    if hasattr(prospects, "nbytes"):
+        # Columnar batches and disk-backed sequences report what they hold in memory
+        return sys.getsizeof(prospects) + prospects.nbytes
+    if not prospects:
+        return sys.getsizeof(prospects)
+    step = max(1, len(prospects) // _SIZE_SAMPLE_ROWS)
+    sample = prospects[::step]
+    sampled = 0
+    for prospect in sample:
+        sampled += sys.getsizeof(prospect)
+        # Lazy records only hold their slot values, so don't render them to measure
+        if isinstance(prospect, dict):
+            values = prospect.values()
+        else:
+            values = (getattr(prospect, slot) for slot in prospect.__slots__)
+        for value in values:
+            sampled += sys.getsizeof(value)
+    return sys.getsizeof(prospects) + sampled * len(prospects) // len(sample)
+
+class ProspectCache:
+    """
+    Thread-safe LRU cache with a time-to-live, bounded by entries and bytes.
+
+    Parameters:
+    - max_entries: Maximum number of cached result sets
+    - max_bytes: Maximum approximate size of all cached result sets
+    - ttl: Seconds an entry stays valid after it is stored (None for no expiry)
+    - clock: Time source, monotonic by default
+    """
+
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 * 1024, ttl=3600, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default` if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """Store `value` under `key`, evicting least recently used entries to stay in bounds"""
+        if size is None:
+            size = sys.getsizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            expires_at = self.clock() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            self._evict()
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self):
+        # Drop expired entries first, then the least recently used ones
+        now = self.clock()
+        for key in [k for k, (_, _, expires_at) in self._entries.items() if expires_at is not None and expires_at <= now]:
+            self._remove(key)
+            self.expirations += 1
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > self.clock())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+def cache_key(location, demographic, industry, industry_focus=None, target_role=None, count=5, seed=None, lazy=False):
+    """Return the cache key of a search's criteria, count, seed and lazy flag"""
+    return normalize_criteria(location, demographic, industry, industry_focus, target_role) + (count, seed, lazy)
@@ -0,0 +1,198 @@
+"""
+Client-side prospect components.
+
+The carousel ships one page of prospects (card fields and rendered templates)
+to the browser as a single embedded HTML component. Navigation, scenario
+switching and copy-to-clipboard then run in the browser without any server
+round trip. copy_button is a standalone copy-to-clipboard button for text
+rendered by the server.
+"""
+import json
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from export import FOLLOW_UP_SCENARIOS
+
+# Component heights in pixels
+CAROUSEL_HEIGHT = 640
+COPY_BUTTON_HEIGHT = 48
+
+# Labels of the follow-up scenarios, in FOLLOW_UP_SCENARIOS order
+SCENARIO_LABELS = ("Positive Response", "Negative Response", "No Response")
+
+# The component runs in an iframe, so it carries its own copy of the card styles
+_STYLE = """
+<style>
+body { margin: 0; font-family: -apple-system, BlinkMacSystemFont, sans-serif; color: #2d3748; }
+.nav { display: flex; align-items: center; gap: 8px; background: #f7fafc; padding: 8px; border-radius: 6px; }
+.nav .position { flex: 1; text-align: center; font-size: 0.875rem; color: #4a5568; }
+button { border-radius: 6px; font-weight: 500; border: 1px solid #e2e8f0; background: #f8fafc;
+         color: #2d3748; padding: 0.4rem 0.9rem; cursor: pointer; font-size: 0.875rem; }
+button:disabled { opacity: 0.4; cursor: default; }
+button.primary { background: #2d3748; color: white; border: none; }
+button.selected { background: white; border-color: #2d3748; }
+.prospect-card { background: white; border-radius: 8px; padding: 1.25rem; margin: 1rem 0; border: 1px solid #edf2f7; }
+.prospect-card h3 { margin: 0; font-size: 1.25rem; font-weight: 500; }
+.prospect-card .title { color: #4a5568; margin: 0.5rem 0; font-size: 1rem; }
+.prospect-details { margin-top: 0.75rem; color: #718096; font-size: 0.875rem; }
+.prospect-details p { margin: 0.25rem 0; }
+a { color: #2d3748; text-decoration: none; font-weight: 500; }
+a:hover { text-decoration: underline; }
+.tabs, .scenarios { display: flex; gap: 6px; margin: 0.5rem 0; }
+.template { display: flex; gap: 8px; align-items: flex-start; }
+textarea { flex: 1; height: 200px; border: 1px solid #e2e8f0; border-radius: 6px; font-size: 0.875rem;
+           line-height: 1.5; padding: 0.75rem; font-family: ui-monospace, SFMono-Regular, Menlo, monospace; }
+</style>
+"""
+
+# Copies with the async Clipboard API, falling back to a hidden selection where it is blocked
+_COPY_SCRIPT = """
+function copyText(text, button) {
+  const done = () => {
+    const label = button.textContent;
+    button.textContent = "Copied!";
+    setTimeout(() => { button.textContent = label; }, 1200);
+  };
+  const fallback = () => {
+    const area = document.createElement("textarea");
+    area.value = text;
+    area.style.position = "fixed";
+    area.style.opacity = "0";
+    document.body.appendChild(area);
+    area.select();
+    document.execCommand("copy");
+    area.remove();
+    done();
+  };
+  if (navigator.clipboard && window.isSecureContext) {
+    navigator.clipboard.writeText(text).then(done, fallback);
+  } else {
+    fallback();
+  }
+}
+"""
+
+_CAROUSEL_SCRIPT = """
+const prospects = JSON.parse(document.getElementById("prospect-data").textContent);
+let current = 0, tab = "initial", scenario = 0;
+
+function element(tag, attributes, text) {
+  const node = document.createElement(tag);
+  Object.assign(node, attributes || {});
+  if (text !== undefined) node.textContent = text;
+  return node;
+}
+
+function render() {
+  const p = prospects[current];
+  document.getElementById("position").textContent = `Prospect ${current + 1} of ${prospects.length}`;
+  document.getElementById("previous").disabled = current === 0;
+  document.getElementById("next").disabled = current === prospects.length - 1;
+
+  const card = document.getElementById("card");
+  card.replaceChildren(element("h3", {}, p.name), element("p", {className: "title"}, `${p.title} at ${p.company}`));
+  const details = element("div", {className: "prospect-details"});
+  details.append(element("p", {}, p.location));
+  if (p.relevance_score !== null) details.append(element("p", {}, `Match: ${Math.round(p.relevance_score * 100)}%`));
+  if (/^https?:\\/\\//.test(p.profile_url)) {
+    const link = element("p");
+    link.append(element("a", {href: p.profile_url, target: "_blank", rel: "noopener"}, "View Profile ↗"));
+    details.append(link);
+  }
+  card.append(details);
+
+  document.querySelectorAll(".tabs button").forEach(b => b.classList.toggle("selected", b.dataset.tab === tab));
+  document.querySelectorAll(".scenarios button").forEach(b => b.classList.toggle("selected", +b.dataset.index === scenario));
+  document.querySelector(".scenarios").style.display = tab === "follow_up" ? "flex" : "none";
+  document.getElementById("template").value = tab === "initial" ? p.email_template : p.follow_ups[scenario];
+}
+
+document.getElementById("previous").onclick = () => { current = Math.max(0, current - 1); render(); };
+document.getElementById("next").onclick = () => { current = Math.min(prospects.length - 1, current + 1); render(); };
+document.querySelectorAll(".tabs button").forEach(b => b.onclick = () => { tab = b.dataset.tab; render(); });
+document.querySelectorAll(".scenarios button").forEach(b => b.onclick = () => { scenario = +b.dataset.index; render(); });
+document.getElementById("copy").onclick = (event) => copyText(document.getElementById("template").value, event.target);
+document.addEventListener("keydown", (event) => {
+  if (event.target.tagName === "TEXTAREA") return;
+  if (event.key === "ArrowLeft") document.getElementById("previous").click();
+  if (event.key === "ArrowRight") document.getElementById("next").click();
+});
+render();
+"""
+
+def _embed(html, height):
+    """Embed an HTML document in an iframe (st.iframe replaces components.html in newer releases)"""
+    if hasattr(st, "iframe"):
+        st.iframe(html, height=height)
+    else:
+        components.html(html, height=height)
+
+def _json_for_script(value):
+    """Serialize a value for an inline <script> block, so text can't close the tag"""
+    return json.dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+def carousel_payload(prospects):
+    """Return the card fields and rendered templates of prospects as JSON-ready dicts"""
+    payload = []
+    for prospect in prospects:
+        follow_ups = prospect.get("follow_up_templates") or {}
+        payload.append({
+            "name": prospect["name"],
+            "title": prospect["title"],
+            "company": prospect["company"],
+            "location": prospect["location"],
+            "profile_url": prospect["profile_url"],
+            "relevance_score": prospect.get("relevance_score"),
+            "email_template": prospect["email_template"],
+            "follow_ups": [follow_ups.get(scenario, "") for scenario in FOLLOW_UP_SCENARIOS],
+        })
+    return payload
+
+def carousel_html(prospects):
+    """Return the self-contained carousel document for a page of prospects"""
+    scenario_buttons = "".join(
+        f'<button data-index="{i}">{label}</button>' for i, label in enumerate(SCENARIO_LABELS)
+    )
+    return f"""{_STYLE}
+<div class="nav">
+  <button id="previous">← Previous</button>
+  <span class="position" id="position"></span>
+  <button id="next">Next →</button>
+</div>
+<div class="prospect-card" id="card"></div>
+<div class="tabs">
+  <button data-tab="initial">Initial Outreach</button>
+  <button data-tab="follow_up">Follow-up Templates</button>
+</div>
+<div class="scenarios">{scenario_buttons}</div>
+<div class="template">
+  <textarea id="template" aria-label="Template"></textarea>
+  <button class="primary" id="copy">Copy Template</button>
+</div>
+<script type="application/json" id="prospect-data">{_json_for_script(carousel_payload(prospects))}</script>
+<script>{_COPY_SCRIPT}{_CAROUSEL_SCRIPT}</script>
+"""
+
+def render_carousel(prospects, height=CAROUSEL_HEIGHT):
+    """
+    Render a page of prospects as one client-side carousel component.
+
+    Parameters:
+    - prospects: The prospects to ship to the browser (keep this to one page)
+    - height: Component height in pixels
+    """
+    _embed(carousel_html(prospects), height)
+
+def copy_button(text, label="Copy Template", height=COPY_BUTTON_HEIGHT):
+    """Render a button that copies `text` to the clipboard in the browser, without a rerun"""
+    _embed(
+        f"""{_STYLE}
+<button class="primary" id="copy" style="width: 100%">{label}</button>
+<script>
+const text = {_json_for_script(text)};
+document.getElementById("copy").onclick = (event) => copyText(text, event.target);
+{_COPY_SCRIPT}
+</script>""",
+        height,
+    )
@@ -0,0 +1,302 @@
+"""
+Industry catalog shared by the prospect generator and the Streamlit UI.
+
+Everything here is built once at import into immutable, index-based tables.
+Industries, focus options and role options are addressed by integer ids
+(their position in INDUSTRIES, FOCUS_OPTIONS[industry_id] and
+ROLE_OPTIONS[industry_id]); lookups by name go through the *_ids mappings.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+# Mock data with realistic names
+FIRST_NAMES = (
+    "Michael", "Sarah", "David", "Jennifer", "Robert",
+    "Emma", "James", "Lisa", "William", "Rachel",
+    "John", "Jessica", "Thomas", "Emily", "Daniel",
+    "Michelle", "Christopher", "Amanda", "Matthew", "Ashley"
+)
+LAST_NAMES = (
+    "Anderson", "Chen", "Patel", "Martinez", "Thompson",
+    "Rodriguez", "Smith", "Johnson", "Wilson", "Brown",
+    "Lee", "Garcia", "Miller", "Davis", "Lopez",
+    "Harris", "Clark", "Lewis", "Young", "Walker"
+)
+
+# Industry definitions, in the order they appear in the UI. Each entry holds the
+# step-2 questions plus the vocabulary the generator draws from. Opening lines and
+# resources are str.format templates paired with defaults for empty fields.
+_INDUSTRY_DATA = (
+    {
+        "name": "Technology & Software",
+        "focus_question": "What market segment are you targeting?",
+        "focus_options": ("B2B", "B2C", "Enterprise", "SMB", "Startups"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("CTO/CIO", "Software Engineers", "Product Managers", "IT Directors", "DevOps"),
+        "prefixes": ("Tech", "Software", "Digital", "Cyber", "Cloud", "Data", "AI"),
+        "suffixes": ("Systems", "Solutions", "Technologies", "Software", "Networks", "Platforms", "Labs"),
+        "titles": (
+            "CTO", "Software Engineer", "Product Manager", "IT Director",
+            "DevOps Manager", "Data Scientist", "VP of Engineering"
+        ),
+        "openings": (
+            ("I noticed your role as {title} at {company} and your focus on {industry_focus} really caught my attention.",
+             {"industry_focus": "technology"}),
+            ("Your background in {target_role} at {company} is impressive.",
+             {"target_role": "technology leadership"}),
+            ("I've been following {company}'s innovations in {industry_focus} and wanted to connect.",
+             {"industry_focus": "the tech space"}),
+        ),
+        "resource": ("our latest guide on optimizing {industry_focus} processes", {"industry_focus": "technology"}),
+    },
+    {
+        "name": "Finance & Banking",
+        "focus_question": "What financial segment are you targeting?",
+        "focus_options": ("Retail Banking", "Investment Banking", "Wealth Management", "Insurance", "Fintech"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("CFO", "Financial Advisors", "Risk Managers", "Investment Analysts", "Banking Executives"),
+        "prefixes": ("Financial", "Capital", "Invest", "Asset", "Wealth", "Bank"),
+        "suffixes": ("Group", "Partners", "Advisors", "Management", "Trust", "Securities"),
+        "titles": (
+            "CFO", "Financial Advisor", "Investment Banker", "Risk Manager",
+            "Portfolio Manager", "Banking Executive", "Wealth Manager"
+        ),
+        "openings": (
+            ("Your experience as {title} at {company} in the {industry_focus} sector stands out.",
+             {"industry_focus": "financial"}),
+            ("I've been researching leaders in {industry_focus} and your work at {company} is noteworthy.",
+             {"industry_focus": "finance"}),
+            ("Your background in {target_role} is exactly what I was looking for.",
+             {"target_role": "financial leadership"}),
+        ),
+        "resource": ("a market analysis on trends in {industry_focus}", {"industry_focus": "financial services"}),
+    },
+    {
+        "name": "Healthcare & Pharmaceuticals",
+        "focus_question": "What healthcare segment are you targeting?",
+        "focus_options": ("Hospitals", "Clinics", "Research", "Pharmaceuticals", "Medical Devices"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("Physicians", "Hospital Administrators", "Research Directors", "Medical Staff", "Healthcare IT"),
+        "prefixes": ("Health", "Care", "Medical", "Pharma", "Bio", "Life"),
+        "suffixes": ("Healthcare", "Medical", "Therapeutics", "Sciences", "Pharmaceuticals"),
+        "titles": (
+            "Medical Director", "Chief Medical Officer", "Research Director",
+            "Clinical Manager", "Healthcare Administrator", "Pharmaceutical Executive"
+        ),
+        "openings": (
+            ("I've been following {company}'s advancements in {industry_focus} and was impressed by your work as {title}.",
+             {"industry_focus": "healthcare"}),
+            ("Your expertise in {target_role} at {company} caught my attention.",
+             {"target_role": "healthcare management"}),
+            ("I'm reaching out to leaders in {industry_focus} like yourself who are making an impact.",
+             {"industry_focus": "healthcare"}),
+        ),
+        "resource": ("a whitepaper on innovations in {industry_focus} management", {"industry_focus": "healthcare"}),
+    },
+    {
+        "name": "Manufacturing & Industrial",
+        "focus_question": "What manufacturing segment are you targeting?",
+        "focus_options": ("Automotive", "Electronics", "Chemical", "Aerospace", "Consumer Goods"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("Plant Managers", "Operations Directors", "Supply Chain Managers", "Quality Control", "Engineers"),
+        "prefixes": ("Industrial", "Manufacturing", "Production", "Factory", "Assembly"),
+        "suffixes": ("Manufacturing", "Industries", "Products", "Works", "Solutions"),
+        "titles": (
+            "Plant Manager", "Operations Director", "Production Supervisor",
+            "Quality Control Manager", "Supply Chain Director", "Process Engineer"
+        ),
+        "openings": None,
+        "resource": ("our case study on improving efficiency in {industry_focus} operations",
+                     {"industry_focus": "manufacturing"}),
+    },
+    {
+        "name": "Retail & E-commerce",
+        "focus_question": "What retail segment are you targeting?",
+        "focus_options": ("Brick & Mortar", "Online-only", "Omnichannel", "Luxury", "Mass Market"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("Merchandisers", "Digital Marketing Managers", "Store Managers", "E-commerce Directors", "Retail Buyers"),
+        "prefixes": ("Retail", "Shop", "Store", "Market", "Commerce", "Trade"),
+        "suffixes": ("Retailers", "Stores", "Marketplace", "Outlets", "Emporium"),
+        "titles": (
+            "Retail Manager", "E-commerce Director", "Merchandising Manager",
+            "Store Operations Director", "Digital Retail Strategist", "Buyer"
+        ),
+        "openings": None,
+        "resource": ("our report on {industry_focus} customer engagement strategies", {"industry_focus": "retail"}),
+    },
+    {
+        "name": "Education & Training",
+        "focus_question": "What education segment are you targeting?",
+        "focus_options": ("K-12", "Higher Education", "Corporate Training", "Online Learning", "EdTech"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("School Administrators", "Faculty", "Educational Directors", "Training Managers", "EdTech Buyers"),
+        "prefixes": ("Edu", "Learn", "Training", "Academy", "Institute", "School"),
+        "suffixes": ("Education", "Learning", "Academy", "Institute", "University"),
+        "titles": (
+            "Principal", "Dean", "Educational Director", "Training Coordinator",
+            "Curriculum Developer", "Academic Affairs Director"
+        ),
+        "openings": None,
+        "resource": ("our guide on {industry_focus} technology integration", {"industry_focus": "education"}),
+    },
+    {
+        "name": "Professional Services",
+        "focus_question": "What professional service segment are you targeting?",
+        "focus_options": ("Consulting", "Legal", "Accounting", "HR", "Marketing Agencies"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("Partners", "Practice Leaders", "Associates", "Consultants", "Department Heads"),
+        "prefixes": ("Consult", "Advisory", "Service", "Solution", "Professional"),
+        "suffixes": ("Consultants", "Partners", "Associates", "Group", "Advisors"),
+        "titles": (
+            "Managing Partner", "Senior Consultant", "Practice Lead",
+            "Principal Advisor", "Associate Director", "Client Services Manager"
+        ),
+        "openings": None,
+        "resource": ("a framework for optimizing {industry_focus} delivery", {"industry_focus": "professional service"}),
+    },
+    {
+        "name": "Media & Entertainment",
+        "focus_question": "What media segment are you targeting?",
+        "focus_options": ("Film & TV", "Music", "Digital Media", "Publishing", "Gaming"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("Content Creators", "Producers", "Studio Executives", "Media Buyers", "Creative Directors"),
+        "prefixes": ("Media", "Entertainment", "Creative", "Studio", "Production"),
+        "suffixes": ("Studios", "Media", "Entertainment", "Productions", "Group"),
+        "titles": (
+            "Creative Director", "Content Producer", "Media Manager",
+            "Entertainment Executive", "Studio Head", "Production Manager"
+        ),
+        "openings": None,
+        "resource": ("our analysis of {industry_focus} audience engagement trends", {"industry_focus": "media"}),
+    },
+    {
+        "name": "Energy & Utilities",
+        "focus_question": "What energy segment are you targeting?",
+        "focus_options": ("Oil & Gas", "Renewable Energy", "Utilities", "Power Generation", "Energy Services"),
+        "role_question": "What is your ideal target role?",
+        "role_options": ("Operations Managers", "Project Engineers", "Sustainability Directors", "Plant Supervisors", "Business Development"),
+        "prefixes": ("Energy", "Power", "Utility", "Resource", "Grid"),
+        "suffixes": ("Energy", "Power", "Resources", "Utilities", "Group"),
+        "titles": (
+            "Energy Director", "Operations Manager", "Sustainability Manager",
+            "Plant Supervisor", "Project Engineer", "Grid Operations Manager"
+        ),
+        "openings": None,
+        "resource": ("our whitepaper on {industry_focus} efficiency innovations", {"industry_focus": "energy"}),
+    },
+)
+
+# Base companies that could work for any industry
+BASE_COMPANIES = (
+    "Global Solutions", "Advanced Systems",
+    "Innovative Partners", "Strategic Ventures",
+    "Premier Group", "Elite Services"
+)
+DEFAULT_PREFIXES = ("Global", "Advanced", "Innovative", "Strategic")
+DEFAULT_SUFFIXES = ("Group", "Inc", "Corporation", "Company")
+
+# Base titles that could work for any industry
+BASE_TITLES = ("CEO", "Founder", "Managing Director", "Business Owner", "Director of Operations")
+
+# Opening lines used for industries without their own
+DEFAULT_OPENINGS = (
+    ("I noticed your role as {title} at {company} and your experience in the {industry} sector really caught my attention.", {}),
+    ("Your background at {company} in {industry} is impressive.", {}),
+    ("I've been researching leaders in {industry} and your work stood out to me.", {}),
+)
+DEFAULT_RESOURCE = ("some insights that might be valuable for {company}", {})
+
+# Index-based tables, one entry per industry id
+INDUSTRIES = tuple(data["name"] for data in _INDUSTRY_DATA)
+FOCUS_OPTIONS = tuple(data["focus_options"] for data in _INDUSTRY_DATA)
+ROLE_OPTIONS = tuple(data["role_options"] for data in _INDUSTRY_DATA)
+PREFIXES = tuple(data["prefixes"] for data in _INDUSTRY_DATA)
+SUFFIXES = tuple(data["suffixes"] for data in _INDUSTRY_DATA)
+TITLES = tuple(data["titles"] for data in _INDUSTRY_DATA)
+OPENINGS = tuple(
+    tuple((text, MappingProxyType(defaults)) for text, defaults in (data["openings"] or DEFAULT_OPENINGS))
+    for data in _INDUSTRY_DATA
+)
+RESOURCES = tuple((data["resource"][0], MappingProxyType(data["resource"][1])) for data in _INDUSTRY_DATA)
+DEFAULT_OPENINGS = tuple((text, MappingProxyType(defaults)) for text, defaults in DEFAULT_OPENINGS)
+DEFAULT_RESOURCE = (DEFAULT_RESOURCE[0], MappingProxyType(DEFAULT_RESOURCE[1]))
+
+# Name -> id lookups
+INDUSTRY_IDS = MappingProxyType({name: i for i, name in enumerate(INDUSTRIES)})
+FOCUS_IDS = tuple(MappingProxyType({name: i for i, name in enumerate(options)}) for options in FOCUS_OPTIONS)
+ROLE_IDS = tuple(MappingProxyType({name: i for i, name in enumerate(options)}) for options in ROLE_OPTIONS)
+
+# Industry-specific questions, keyed by industry name for the UI
+INDUSTRY_QUESTIONS = MappingProxyType({
+    data["name"]: MappingProxyType({
+        "focus_question": data["focus_question"],
+        "focus_options": data["focus_options"],
+        "role_question": data["role_question"],
+        "role_options": data["role_options"],
+    })
+    for data in _INDUSTRY_DATA
+})
+
+def industry_id(industry):
+    """Return the integer id for an industry name, or None if it is not in the catalog"""
+    return INDUSTRY_IDS.get(industry)
+
+@lru_cache(maxsize=1024)
+def company_candidates(industry, industry_focus=None):
+    """
+    Return the candidate company name pools for an (industry, focus) pair.
+
+    Returns (prefixes, suffixes, plain, focused) where `plain` and `focused` hold
+    every "{prefix} {suffix}" and "{prefix} {focus_word} {suffix}" name, indexed by
+    prefix_index * len(suffixes) + suffix_index. `focused` is empty without a focus.
+    """
+    ind = industry_id(industry)
+    prefixes = PREFIXES[ind] if ind is not None else DEFAULT_PREFIXES
+    suffixes = SUFFIXES[ind] if ind is not None else DEFAULT_SUFFIXES
+    plain = tuple(f"{prefix} {suffix}" for prefix in prefixes for suffix in suffixes)
+    if industry_focus:
+        focus_word = industry_focus.split()[0] if " " in industry_focus else industry_focus
+        focused = tuple(f"{prefix} {focus_word} {suffix}" for prefix in prefixes for suffix in suffixes)
+    else:
+        focused = ()
+    return prefixes, suffixes, plain, focused
+
+@lru_cache(maxsize=1024)
+def title_pool(industry, target_role=None):
+    """Return every job title candidate for an (industry, role) pair"""
+    ind = industry_id(industry)
+    specialized = TITLES[ind] if ind is not None else BASE_TITLES
+
+    # If target_role is provided, make sure to include it and variations of it
+    if target_role:
+        role_variations = (
+            target_role,
+            f"Senior {target_role}",
+            f"Lead {target_role}",
+            f"Head of {target_role}",
+            f"{target_role} Manager"
+        )
+        # Filter out variations that don't make sense
+        specialized += tuple(r for r in role_variations if "Manager Manager" not in r)
+
+    return BASE_TITLES + specialized
+
+def email_openings(industry):
+    """Return the (template, defaults) opening lines for an industry"""
+    ind = industry_id(industry)
+    return OPENINGS[ind] if ind is not None else DEFAULT_OPENINGS
+
+def follow_up_resource(industry):
+    """Return the (template, defaults) resource offered in negative follow-ups"""
+    ind = industry_id(industry)
+    return RESOURCES[ind] if ind is not None else DEFAULT_RESOURCE
+
+# Precompute the candidate pools for every catalog (industry, focus, role) combination
+for _ind, _industry in enumerate(INDUSTRIES):
+    company_candidates(_industry)
+    title_pool(_industry)
+    for _focus in FOCUS_OPTIONS[_ind]:
+        company_candidates(_industry, _focus)
+    for _role in ROLE_OPTIONS[_ind]:
+        title_pool(_industry, _role)
+del _ind, _industry, _focus, _role
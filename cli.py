@@ -0,0 +1,124 @@
+"""
+Headless batch generation of prospect datasets.
+
+Examples:
+    python cli.py --location "London" --demographic "C-level Executives" \\
+        --industry "Finance & Banking" --focus Fintech --role CFO \\
+        --count 1000000 --seed 42 --format parquet --output prospects.parquet
+
+    python cli.py --criteria-file searches.csv --count 10000 --format jsonl --gzip -o out.jsonl.gz
+
+A criteria file is CSV or JSONL with location, demographic, industry and
+optional industry_focus, target_role and count columns, one search per row.
+Output for a given seed is the same whatever the number of --workers.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+from batch import CRITERIA_FIELDS, DEFAULT_SHARD_SIZE, iter_batch
+from export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, ProspectBatches, write_export
+
+def read_criteria_file(path):
+    """Read criteria rows from a CSV or JSONL file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    for number, row in enumerate(rows, 1):
+        missing = [field for field in CRITERIA_FIELDS[:3] if not row.get(field)]
+        if missing:
+            raise ValueError(f"{path}: row {number} is missing {', '.join(missing)}")
+    return rows
+
+def iter_shards(criteria_rows, count, seed, workers, shard_size, unique, vocabulary):
+    """Yield the ProspectBatch shards of every criteria row in order"""
+    batches = iter_batch(criteria_rows, count, seed, workers, shard_size, unique=unique, vocabulary=vocabulary)
+    for _, prospects in batches:
+        yield prospects
+
+def peak_memory_bytes():
+    """Return the peak resident set size of this process, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class _Counter:
+    """Count prospects as their shards pass through to the writer"""
+
+    def __init__(self, shards):
+        self.shards = shards
+        self.count = 0
+
+    def __iter__(self):
+        for shard in self.shards:
+            self.count += len(shard)
+            yield shard
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate synthetic LinkedIn prospect datasets.")
+    parser.add_argument("--location", help="Target geographic location")
+    parser.add_argument("--demographic", help="Target demographic group")
+    parser.add_argument("--industry", help="Target industry")
+    parser.add_argument("--focus", dest="industry_focus", help="Specific focus within the industry")
+    parser.add_argument("--role", dest="target_role", help="Specific role being targeted")
+    parser.add_argument("--criteria-file", help="CSV or JSONL file with one set of criteria per row")
+    parser.add_argument("--count", type=int, default=5, help="Prospects per criteria row (default: 5)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output")
+    parser.add_argument("--unique", action="store_true", help="Never repeat a profile URL within a criteria row")
+    parser.add_argument("--vocabulary", help="Directory of weighted .corpus files (see corpus.py)")
+    parser.add_argument("--format", dest="fmt", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Prospects encoded per write")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1, 0 for one per CPU)")
+    parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Largest number of prospects per task"
+    )
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.criteria_file:
+        criteria_rows = read_criteria_file(args.criteria_file)
+    elif args.location and args.demographic and args.industry:
+        criteria_rows = [{field: getattr(args, field) for field in CRITERIA_FIELDS}]
+    else:
+        parser.error("provide --location, --demographic and --industry, or --criteria-file")
+    if args.count < 0 or args.chunk_size <= 0 or args.shard_size <= 0 or args.workers < 0:
+        parser.error("--count and --workers must be non-negative, --chunk-size and --shard-size positive")
+
+    shards = _Counter(iter_shards(
+        criteria_rows, args.count, args.seed, args.workers or None, args.shard_size, args.unique, args.vocabulary
+    ))
+    prospects = ProspectBatches(shards)
+    start = time.perf_counter()
+    if args.output == "-":
+        write_export(prospects, sys.stdout.buffer, args.fmt, args.gzip, args.chunk_size)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.output, "wb") as stream:
+            write_export(prospects, stream, args.fmt, args.gzip, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    rate = shards.count / elapsed if elapsed > 0 else float("inf")
+    peak = peak_memory_bytes()
+    peak_text = f"{peak / (1024 * 1024):.1f} MiB" if peak is not None else "n/a"
+    print(
+        f"Wrote {shards.count:,} prospects in {elapsed:.2f}s "
+        f"({rate:,.0f} rows/sec, peak memory {peak_text})",
+        file=sys.stderr
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Frequency-weighted vocabularies stored in a compact, memory-mapped binary format.
+
+A corpus file holds a fixed header, the precomputed alias table (prob, alias),
+string offsets and a UTF-8 blob. Loading memory-maps the file instead of
+parsing it, so a 100k+ entry corpus opens instantly and strings are only
+decoded when drawn.
+
+Build a corpus from a CSV of value,weight rows with:
+    python corpus.py first_names.csv first_names.corpus
+"""
+import csv
+import os
+import struct
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from catalog import FIRST_NAMES, LAST_NAMES
+from sampling import AliasTable
+
+MAGIC = b"PRSPCRP1"
+# magic, number of entries, blob size in bytes
+HEADER = struct.Struct("<8sQQ")
+
+# File names looked up by load_vocabulary
+VOCABULARY_FILES = {
+    "first_names": "first_names.corpus",
+    "last_names": "last_names.corpus",
+    "company_stems": "company_stems.corpus",
+}
+
+class Corpus:
+    """
+    A weighted list of strings with an alias table for O(1) vectorized draws.
+
+    Parameters:
+    - offsets: uint64 array of len(corpus) + 1 byte offsets into `blob`
+    - blob: uint8 array of UTF-8 encoded strings
+    - table: AliasTable over the entries
+    """
+
+    __slots__ = ("offsets", "blob", "table")
+
+    def __init__(self, offsets, blob, table):
+        self.offsets = offsets
+        self.blob = blob
+        self.table = table
+
+    @classmethod
+    def from_items(cls, items, weights=None):
+        """Build an in-memory corpus; weights default to uniform"""
+        encoded = [item.encode("utf-8") for item in items]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        table = AliasTable.uniform(len(encoded)) if weights is None else AliasTable.build(weights)
+        return cls(offsets, blob, table)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    def take(self, indices):
+        """Return the strings at an array of indices"""
+        return [self[i] for i in np.asarray(indices).tolist()]
+
+    def sample(self, rng, size):
+        """Draw `size` weighted indices from a numpy Generator"""
+        return self.table.sample(rng, size)
+
+    def save(self, path):
+        """Write the corpus in the memory-mappable binary format"""
+        blob = self.blob.tobytes()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self), len(blob)))
+            f.write(np.ascontiguousarray(self.table.prob, dtype="<f8").tobytes())
+            f.write(np.ascontiguousarray(self.table.alias, dtype="<i8").tobytes())
+            f.write(np.ascontiguousarray(self.offsets, dtype="<u8").tobytes())
+            f.write(blob)
+
+def load_corpus(path):
+    """Memory-map a corpus file written by Corpus.save"""
+    with open(path, "rb") as f:
+        magic, count, blob_size = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a prospect corpus file")
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    expected = HEADER.size + count * 24 + 8 + blob_size
+    if len(data) != expected:
+        raise ValueError(f"{path} is truncated or corrupt ({len(data)} bytes, expected {expected})")
+
+    # Every section starts on an 8-byte boundary, so the arrays are zero-copy views
+    position = HEADER.size
+    prob = data[position:position + count * 8].view("<f8")
+    position += count * 8
+    alias = data[position:position + count * 8].view("<i8")
+    position += count * 8
+    offsets = data[position:position + (count + 1) * 8].view("<u8")
+    position += (count + 1) * 8
+    blob = data[position:position + blob_size]
+    return Corpus(offsets, blob, AliasTable(prob, alias))
+
+def read_weighted_csv(path):
+    """Read value,weight rows (weight defaults to 1) from a CSV file"""
+    items, weights = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip():
+                continue
+            items.append(row[0].strip())
+            weights.append(float(row[1]) if len(row) > 1 and row[1].strip() else 1.0)
+    return items, weights
+
+class Vocabulary:
+    """
+    Name and company-stem corpora used by the generator.
+
+    Missing corpora fall back to the built-in catalog lists (uniform weights);
+    company_stems may be None to keep the catalog's industry prefixes.
+    """
+
+    __slots__ = ("first_names", "last_names", "company_stems")
+
+    def __init__(self, first_names=None, last_names=None, company_stems=None):
+        self.first_names = first_names if first_names is not None else Corpus.from_items(FIRST_NAMES)
+        self.last_names = last_names if last_names is not None else Corpus.from_items(LAST_NAMES)
+        self.company_stems = company_stems
+
+@lru_cache(maxsize=8)
+def load_vocabulary(directory):
+    """
+    Load the corpora found in `directory` (see VOCABULARY_FILES).
+
+    Cached per directory, so worker processes and repeated calls map each file once.
+    """
+    corpora = {}
+    for field, filename in VOCABULARY_FILES.items():
+        path = os.path.join(directory, filename)
+        corpora[field] = load_corpus(path) if os.path.exists(path) else None
+    return Vocabulary(**corpora)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python corpus.py INPUT.csv OUTPUT.corpus")
+    items, weights = read_weighted_csv(sys.argv[1])
+    Corpus.from_items(items, weights).save(sys.argv[2])
+    print(f"Wrote {len(items):,} entries to {sys.argv[2]}", file=sys.stderr)
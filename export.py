@@ -0,0 +1,206 @@
+"""
+Chunked export of prospect result sets to CSV, JSONL or Parquet.
+
+Rows are flattened (one column per follow-up scenario) and encoded a chunk at a
+time, so a large result set is never held as a DataFrame plus a full string
+copy. Exports of shared result sets are built on demand and cached per
+result set, format and compression.
+"""
+import csv
+import gzip
+import io
+import itertools
+import json
+
+from cache import ProspectCache
+from metrics import metrics
+from prospects import SCORE_FIELD, ProspectBatch
+
+# Flattened export columns, with one column per follow-up scenario
+FOLLOW_UP_SCENARIOS = ("positive", "negative", "no_response")
+EXPORT_COLUMNS = (
+    "name", "title", "company", "location", "profile_url", "email_template",
+) + tuple(f"follow_up_{scenario}" for scenario in FOLLOW_UP_SCENARIOS)
+# Columns of scored (oversampled and ranked) result sets
+SCORED_EXPORT_COLUMNS = EXPORT_COLUMNS + (SCORE_FIELD,)
+
+# Supported formats: file extension and MIME type
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "jsonl": ("jsonl", "application/x-ndjson"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# Number of prospects encoded per chunk
+EXPORT_CHUNK_SIZE = 5_000
+
+# Encoded exports, keyed by (result set key, format, compress)
+export_cache = ProspectCache(max_entries=32, max_bytes=256 * 1024 * 1024, ttl=None)
+
+def flatten_prospect(prospect, scored=False):
+    """Return a prospect as a flat tuple of EXPORT_COLUMNS values, or SCORED_EXPORT_COLUMNS if `scored`"""
+    follow_ups = prospect.get("follow_up_templates") or {}
+    row = (
+        prospect["name"], prospect["title"], prospect["company"], prospect["location"],
+        prospect["profile_url"], prospect["email_template"],
+    ) + tuple(follow_ups.get(scenario, "") for scenario in FOLLOW_UP_SCENARIOS)
+    return row + (prospect.get(SCORE_FIELD),) if scored else row
+
+class ProspectBatches:
+    """
+    A stream of ProspectBatch shards exported as one result set.
+
+    Iterates like the chained prospects, but write_export pages each shard by
+    row range instead of flattening it prospect by prospect.
+    """
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def __iter__(self):
+        for batch in self.batches:
+            yield from batch
+
+def _batch_chunks(batch, chunk_size, scored):
+    """Yield lists of flattened rows from a ProspectBatch, gathering each page's columns at once"""
+    for start in range(0, len(batch), chunk_size):
+        page = batch[start:start + chunk_size]
+        emails, follow_ups = page.rendered_templates()
+        columns = [
+            page.column("name"), page.column("title"), page.column("company"), page.column("location"),
+            page.column("profile_url"), emails,
+            *([templates.get(scenario, "") for templates in follow_ups] for scenario in FOLLOW_UP_SCENARIOS)
+        ]
+        if scored:
+            columns.append(page.column(SCORE_FIELD) or [None] * len(page))
+        yield list(zip(*columns))
+
+def _scored(prospects):
+    """
+    Return (scored, prospects): whether the prospects carry relevance scores, and prospects to export.
+
+    Scores are all-or-nothing within a result set, so only the first prospect (or
+    shard) is looked at; iterators get it put back in front.
+    """
+    if isinstance(prospects, ProspectBatch):
+        return prospects.relevance_scores is not None, prospects
+    if isinstance(prospects, ProspectBatches):
+        batches = iter(prospects.batches)
+        first = next(batches, None)
+        if first is None:
+            return False, ProspectBatches([])
+        return first.relevance_scores is not None, ProspectBatches(itertools.chain([first], batches))
+    rows = iter(prospects)
+    first = next(rows, None)
+    if first is None:
+        return False, []
+    return first.get(SCORE_FIELD) is not None, itertools.chain([first], rows)
+
+def _chunks(prospects, chunk_size, scored):
+    """Yield lists of flattened rows from any iterable of prospects"""
+    if isinstance(prospects, ProspectBatch):
+        # Columnar and memory-mapped result sets are paged by row range
+        yield from _batch_chunks(prospects, chunk_size, scored)
+        return
+    if isinstance(prospects, ProspectBatches):
+        for batch in prospects.batches:
+            yield from _batch_chunks(batch, chunk_size, scored)
+        return
+    chunk = []
+    for prospect in prospects:
+        chunk.append(flatten_prospect(prospect, scored))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _write_csv(prospects, stream, chunk_size, scored):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SCORED_EXPORT_COLUMNS if scored else EXPORT_COLUMNS)
+    for chunk in _chunks(prospects, chunk_size, scored):
+        writer.writerows(chunk)
+        stream.write(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for empty result sets
+    stream.write(buffer.getvalue().encode("utf-8"))
+
+def _write_jsonl(prospects, stream, chunk_size, scored):
+    columns = SCORED_EXPORT_COLUMNS if scored else EXPORT_COLUMNS
+    for chunk in _chunks(prospects, chunk_size, scored):
+        stream.writelines(
+            (json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n").encode("utf-8")
+            for row in chunk
+        )
+
+def _write_parquet(prospects, stream, chunk_size, compress, scored):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = [(column, pa.string()) for column in EXPORT_COLUMNS]
+    if scored:
+        fields.append((SCORE_FIELD, pa.float64()))
+    schema = pa.schema(fields)
+    # Parquet compresses internally, so gzip becomes the column codec
+    with pq.ParquetWriter(stream, schema, compression="gzip" if compress else "snappy") as writer:
+        for chunk in _chunks(prospects, chunk_size, scored):
+            columns = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+def write_export(prospects, stream, fmt="csv", compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Encode prospects to a binary stream, one chunk at a time.
+
+    Scored result sets (oversampled and ranked searches) get a trailing
+    relevance_score column.
+
+    Parameters:
+    - prospects: Any iterable of prospect mappings (lists, generators, lazy records), a ProspectBatch or
+      ProspectBatches
+    - stream: Writable binary file object
+    - fmt: One of EXPORT_FORMATS ("csv", "jsonl", "parquet")
+    - compress: Gzip the output (Parquet uses gzip as its internal codec instead)
+    - chunk_size: Number of prospects encoded per write
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+    scored, prospects = _scored(prospects)
+    if fmt == "parquet":
+        _write_parquet(prospects, stream, chunk_size, compress, scored)
+        return
+    target = gzip.GzipFile(fileobj=stream, mode="wb") if compress else stream
+    try:
+        if fmt == "csv":
+            _write_csv(prospects, target, chunk_size, scored)
+        else:
+            _write_jsonl(prospects, target, chunk_size, scored)
+    finally:
+        if compress:
+            target.close()
+
+def export_filename(base, fmt="csv", compress=False):
+    """Return a download file name such as 'linkedin_prospects.csv.gz'"""
+    extension = EXPORT_FORMATS[fmt][0]
+    return f"{base}.{extension}.gz" if compress and fmt != "parquet" else f"{base}.{extension}"
+
+def export_mime(fmt="csv", compress=False):
+    """Return the MIME type of an export"""
+    return "application/gzip" if compress and fmt != "parquet" else EXPORT_FORMATS[fmt][1]
+
+def export_bytes(prospects, fmt="csv", compress=False):
+    """Encode prospects and return the bytes"""
+    stream = io.BytesIO()
+    write_export(prospects, stream, fmt, compress)
+    return stream.getvalue()
+
+def cached_export(result_set, fmt="csv", compress=False):
+    """Return the encoded export of a shared result set, building it only once"""
+    key = (result_set.key, fmt, compress)
+    data = export_cache.get(key)
+    if data is None:
+        with metrics.stage(f"export.{fmt}"):
+            data = export_bytes(result_set.prospects, fmt, compress)
+        export_cache.put(key, data, len(data))
+    return data
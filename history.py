@@ -0,0 +1,387 @@
+"""
+Persistent search history backed by SQLite.
+
+Every saved search keeps its criteria, seed and prospects, so past searches can
+be reopened after a restart without regenerating them. Searches belong to an
+owner (a session id) and are only listed, found and loaded for that owner.
+Prospects are stored as their text fields plus the index of their email
+opening; templates are rendered again from the search criteria as rows are
+read. Rows are inserted with executemany, a chunk at a time, in one
+transaction per search, and a loaded search reads them back a page at a time.
+
+Indexes on the criteria and on prospect company and title serve the history
+list and cross-search lookups.
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Sequence
+
+from prospects import SCORE_FIELD, ProspectBatch
+from templates import email_template_ids, follow_up_template_ids, render
+from utils import LazyProspect
+
+# Default database location, overridable with the PROSPECT_HISTORY_DB environment variable
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".prospect_finder", "history.sqlite3")
+
+# Prospects inserted per executemany call
+INSERT_CHUNK_SIZE = 10_000
+
+# Prospects a loaded search reads from the database at a time
+LOAD_PAGE_ROWS = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    location TEXT,
+    demographic TEXT,
+    industry TEXT,
+    industry_focus TEXT,
+    target_role TEXT,
+    count INTEGER NOT NULL,
+    seed INTEGER,
+    oversample INTEGER,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS searches_criteria
+    ON searches (industry, industry_focus, target_role, location);
+CREATE INDEX IF NOT EXISTS searches_created ON searches (created_at);
+
+CREATE TABLE IF NOT EXISTS prospects (
+    search_id INTEGER NOT NULL REFERENCES searches (id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT,
+    profile_url TEXT,
+    email_code INTEGER,
+    email_template TEXT,
+    relevance_score REAL,
+    PRIMARY KEY (search_id, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prospects_company ON prospects (company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS prospects_title ON prospects (title COLLATE NOCASE);
+"""
+
+# Created after MIGRATIONS, since older databases lack the columns they cover
+OWNER_INDEX = "CREATE INDEX IF NOT EXISTS searches_owner ON searches (owner, created_at)"
+
+# Columns added to searches since the first schema, with their definitions
+MIGRATIONS = (("owner", "TEXT"),)
+
+SEARCH_COLUMNS = (
+    "id", "created_at", "location", "demographic", "industry", "industry_focus", "target_role",
+    "count", "seed", "oversample"
+)
+
+# Criteria a seeded search is deduplicated on, besides its owner, count and seed
+_CRITERIA_COLUMNS = ("location", "demographic", "industry", "industry_focus", "target_role", "oversample")
+
+# Prospect columns SavedProspects.columns can read
+_TEXT_COLUMNS = ("name", "title", "company", "location", "profile_url")
+
+_PROSPECT_QUERY = (
+    "SELECT name, title, company, location, profile_url, email_code, email_template, relevance_score"
+    " FROM prospects WHERE search_id = ?"
+)
+
+def _batch_rows(batch, search_id, chunk_size):
+    """Yield chunks of insert rows from a ProspectBatch, gathering columns a page at a time"""
+    for start in range(0, len(batch), chunk_size):
+        page = batch[start:start + chunk_size]
+        scores = page.column(SCORE_FIELD) or [None] * len(page)
+        yield list(zip(
+            [search_id] * len(page), range(start, start + len(page)), page.column("name"),
+            page.column("title"), page.column("company"), page.column("location"), page.column("profile_url"),
+            page.email_codes.tolist(), [None] * len(page), scores
+        ))
+
+def _mapping_rows(prospects, search_id, email_ids, chunk_size):
+    """Yield chunks of insert rows from prospect mappings"""
+    chunk = []
+    for row, prospect in enumerate(prospects):
+        template_id = getattr(prospect, "email_template_id", None)
+        if template_id in email_ids:
+            email_code, email_template = email_ids.index(template_id), None
+        else:
+            email_code, email_template = None, prospect["email_template"]
+        chunk.append((
+            search_id, row, prospect["name"], prospect["title"], prospect["company"], prospect["location"],
+            prospect["profile_url"], email_code, email_template, prospect.get(SCORE_FIELD)
+        ))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class SavedProspects(Sequence):
+    """
+    The prospects of a saved search, read from the database a page at a time.
+
+    Rows saved with an email opening index come back as LazyProspect records;
+    rows saved with rendered text come back as dicts.
+
+    Parameters:
+    - history: SearchHistory the search is stored in
+    - search: The search's dict, as returned by SearchHistory.get_search
+    """
+
+    def __init__(self, history, search):
+        self.history = history
+        self.search_id = search["id"]
+        self.count = search["count"]
+        criteria = search["industry"], search["industry_focus"], search["target_role"]
+        self.email_ids = email_template_ids(*criteria)
+        self.follow_up_ids = follow_up_template_ids(*criteria)
+        self._page = (0, ())  # (first row, rows): the page last read, replaced as a whole
+
+    def __len__(self):
+        return self.count
+
+    def _prospect(self, name, title, company, location, url, email_code, email_template, score):
+        if email_code is not None:
+            return LazyProspect(
+                name, title, company, location, url, self.email_ids[email_code], self.follow_up_ids, score
+            )
+        values = {"first_name": name.split()[0], "company": company, "title": title}
+        prospect = {
+            "name": name,
+            "title": title,
+            "company": company,
+            "location": location,
+            "profile_url": url,
+            "email_template": email_template,
+            "follow_up_templates": {
+                scenario: render(template_id, values) for scenario, template_id in self.follow_up_ids.items()
+            },
+        }
+        if score is not None:
+            prospect[SCORE_FIELD] = score
+        return prospect
+
+    def _rows(self, start, stop):
+        connection = self.history._connect()
+        try:
+            return connection.execute(
+                _PROSPECT_QUERY + " AND row >= ? AND row < ? ORDER BY row", (self.search_id, start, stop)
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            start, stop, step = row.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return [self._prospect(*values) for values in self._rows(start, stop)]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("prospect index out of range")
+        first, rows = self._page
+        if not first <= row < first + len(rows):
+            first = row - row % LOAD_PAGE_ROWS
+            rows = self._rows(first, first + LOAD_PAGE_ROWS)
+            self._page = (first, rows)
+        return self._prospect(*rows[row - first])
+
+    def __iter__(self):
+        # One query streams every row, without going through the page
+        connection = self.history._connect()
+        try:
+            for values in connection.execute(_PROSPECT_QUERY + " ORDER BY row", (self.search_id,)):
+                yield self._prospect(*values)
+        finally:
+            connection.close()
+
+    def columns(self, fields):
+        """Return {field: list of values} for text fields of every row, without building the prospects"""
+        for field in fields:
+            if field not in _TEXT_COLUMNS:
+                raise KeyError(field)
+        connection = self.history._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT {', '.join(fields)} FROM prospects WHERE search_id = ? ORDER BY row", (self.search_id,)
+            ).fetchall()
+        finally:
+            connection.close()
+        return {field: [values[i] for values in rows] for i, field in enumerate(fields)}
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held in memory: the page last read"""
+        _, rows = self._page
+        return sum(sys.getsizeof(values) + sum(map(sys.getsizeof, values)) for values in rows)
+
+class SearchHistory:
+    """
+    SQLite store of past searches and their prospects.
+
+    Each call opens its own connection, so one instance can be shared by every
+    Streamlit session thread; writes are serialized by a lock. Every search has
+    an `owner`: searches are only visible to calls passing the same owner (None
+    is an owner of its own, e.g. for scripts).
+
+    Parameters:
+    - path: Database file (defaults to PROSPECT_HISTORY_DB or DEFAULT_HISTORY_PATH)
+    - chunk_size: Prospects inserted per executemany call
+    """
+
+    def __init__(self, path=None, chunk_size=INSERT_CHUNK_SIZE):
+        self.path = path or os.environ.get("PROSPECT_HISTORY_DB") or DEFAULT_HISTORY_PATH
+        self.chunk_size = chunk_size
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+            with connection:
+                existing = {row["name"] for row in connection.execute("PRAGMA table_info(searches)")}
+                for column, definition in MIGRATIONS:
+                    if column not in existing:
+                        # Searches saved before the column existed keep NULL, i.e. belong to no session
+                        connection.execute(f"ALTER TABLE searches ADD COLUMN {column} {definition}")
+                connection.execute(OWNER_INDEX)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        # WAL lets sessions read the history while another one is saving
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    def save(self, prospects, location, demographic, industry, industry_focus=None, target_role=None, seed=None,
+             oversample=None, owner=None):
+        """
+        Store a search and its prospects in one transaction and return the search id.
+
+        A seeded search reproduces its prospects, so saving one the owner has
+        already saved (same criteria, count and seed) only moves the existing
+        search to the top of the history and returns its id.
+
+        Parameters:
+        - prospects: ProspectBatch or sequence of prospect mappings
+        - location, demographic, industry, industry_focus, target_role, seed, oversample: The search criteria
+        - owner: Id of the session the search belongs to
+        """
+        email_ids = email_template_ids(industry, industry_focus, target_role)
+        criteria = (location, demographic, industry, industry_focus, target_role, oversample)
+        with self._write_lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    if seed is not None:
+                        existing = connection.execute(
+                            "SELECT id FROM searches WHERE owner IS ? AND count = ? AND seed = ? AND "
+                            + " AND ".join(f"{column} IS ?" for column in _CRITERIA_COLUMNS),
+                            (owner, len(prospects), seed, *criteria)
+                        ).fetchone()
+                        if existing is not None:
+                            connection.execute(
+                                "UPDATE searches SET created_at = ? WHERE id = ?", (time.time(), existing["id"])
+                            )
+                            return existing["id"]
+                    cursor = connection.execute(
+                        "INSERT INTO searches (created_at, location, demographic, industry, industry_focus,"
+                        " target_role, count, seed, oversample, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (time.time(), location, demographic, industry, industry_focus, target_role,
+                         len(prospects), seed, oversample, owner)
+                    )
+                    search_id = cursor.lastrowid
+                    if isinstance(prospects, ProspectBatch):
+                        chunks = _batch_rows(prospects, search_id, self.chunk_size)
+                    else:
+                        chunks = _mapping_rows(prospects, search_id, email_ids, self.chunk_size)
+                    for chunk in chunks:
+                        connection.executemany(
+                            "INSERT INTO prospects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", chunk
+                        )
+            finally:
+                connection.close()
+        return search_id
+
+    def searches(self, limit=20, industry=None, owner=None):
+        """Return an owner's most recent searches as dicts, optionally for one industry"""
+        query = f"SELECT {', '.join(SEARCH_COLUMNS)} FROM searches WHERE owner IS ?"
+        parameters = [owner]
+        if industry is not None:
+            query += " AND industry = ?"
+            parameters.append(industry)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        parameters.append(limit)
+        connection = self._connect()
+        try:
+            return [dict(row) for row in connection.execute(query, parameters)]
+        finally:
+            connection.close()
+
+    def get_search(self, search_id, owner=None):
+        """Return one of an owner's searches as a dict, or None if the owner has no such search"""
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                f"SELECT {', '.join(SEARCH_COLUMNS)} FROM searches WHERE id = ? AND owner IS ?", (search_id, owner)
+            ).fetchone()
+        finally:
+            connection.close()
+        return dict(row) if row is not None else None
+
+    def load(self, search_id, owner=None):
+        """
+        Return the prospects of one of an owner's saved searches, in their original order.
+
+        The returned SavedProspects reads rows from the database as they are
+        accessed. Raises KeyError if the owner has no such search.
+        """
+        search = self.get_search(search_id, owner)
+        if search is None:
+            raise KeyError(search_id)
+        return SavedProspects(self, search)
+
+    def find(self, company=None, title=None, limit=100, owner=None):
+        """
+        Find prospects across an owner's saved searches by company and/or title prefix (case-insensitive).
+
+        Returns dicts with the prospect's text fields plus the search id, industry and time.
+        """
+        conditions, parameters = [], []
+        for column, prefix in (("company", company), ("title", title)):
+            if prefix:
+                # Prefix LIKE on a NOCASE index is answered from the index
+                escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conditions.append(f"p.{column} LIKE ? ESCAPE '\\'")
+                parameters.append(f"{escaped}%")
+        if not conditions:
+            return []
+        conditions.append("s.owner IS ?")
+        parameters.extend((owner, limit))
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT p.search_id, s.industry, s.created_at, p.name, p.title, p.company, p.location,"
+                " p.profile_url FROM prospects p JOIN searches s ON s.id = p.search_id"
+                f" WHERE {' AND '.join(conditions)} ORDER BY s.created_at DESC LIMIT ?", parameters
+            )
+            return [dict(row) for row in rows]
+        finally:
+            connection.close()
+
+    def delete(self, search_id, owner=None):
+        """Remove one of an owner's saved searches and its prospects"""
+        with self._write_lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute("DELETE FROM searches WHERE id = ? AND owner IS ?", (search_id, owner))
+            finally:
+                connection.close()
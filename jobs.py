@@ -0,0 +1,336 @@
+"""
+Server-wide background job queue.
+
+Long searches run as jobs on a bounded pool of worker threads instead of the
+Streamlit script thread. Each job belongs to an owner (a session); workers
+take jobs from owners in turn, so one session queueing several searches
+cannot starve the others. Submitting returns a Job at once; sessions then
+poll its snapshot() for status, progress and a preview of the first
+prospects, and may cancel it.
+
+A job's task is a function(job) returning the job's result. Tasks report
+progress with job.report(), which is also where a cancelled job stops.
+"""
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = frozenset((DONE, FAILED, CANCELLED))
+
+# Seconds between sweeps for finished jobs nobody has collected
+PRUNE_INTERVAL = 5
+
+# Prospects kept as a job's preview of partial results
+PREVIEW_ROWS = 25
+PREVIEW_FIELDS = ("name", "title", "company", "location")
+
+class QueueFull(RuntimeError):
+    """The queue, or the owner's share of it, has no room for another job"""
+
+class JobCancelled(Exception):
+    """Raised inside a task when its job has been cancelled"""
+
+class Job:
+    """
+    One queued unit of work and its progress.
+
+    Parameters:
+    - owner: Id of the session that submitted the job
+    - task: Function(job) returning the job's result
+    - total: Amount of work, in the units the task reports progress in
+    - description: Short label shown with the job
+    """
+
+    def __init__(self, owner, task, total=None, description=""):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.task = task
+        self.total = total
+        self.description = description
+        self.status = QUEUED
+        self.done = 0
+        self.preview = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        """True once cancel() has been called"""
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; a running task stops at its next report()"""
+        self._cancel.set()
+
+    def report(self, prospects, done):
+        """
+        Record progress from inside the task.
+
+        Parameters:
+        - prospects: Prospects produced since the last report, previewed until PREVIEW_ROWS are kept
+        - done: Work done so far
+
+        Raises JobCancelled if the job has been cancelled.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+        with self._lock:
+            self.done = done
+            missing = PREVIEW_ROWS - len(self.preview)
+            if missing > 0 and prospects is not None:
+                for prospect in itertools.islice(prospects, missing):
+                    self.preview.append({field: prospect[field] for field in PREVIEW_FIELDS})
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            # The task's closure is no longer needed
+            self.task = None
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            if status == DONE and self.total is not None:
+                self.done = self.total
+
+    def snapshot(self):
+        """Return the job's state as a dict (safe to read while the job runs)"""
+        with self._lock:
+            return {
+                "id": self.id,
+                "owner": self.owner,
+                "description": self.description,
+                "status": self.status,
+                "done": self.done,
+                "total": self.total,
+                "progress": min(1.0, self.done / self.total) if self.total else None,
+                "preview": list(self.preview),
+                "error": self.error,
+                "cancel_requested": self._cancel.is_set(),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+class JobQueue:
+    """
+    Bounded pool of worker threads serving owners' jobs in round-robin order.
+
+    Parameters:
+    - workers: Worker threads, i.e. jobs running at once
+    - max_queued: Jobs waiting across all owners before submit() raises QueueFull
+    - max_per_owner: Jobs one owner may have queued or running at once
+    - keep_finished: Seconds a finished job nobody has pop()ped stays available to get(); its result
+      (e.g. a result store handle) is dropped when it expires, so keep this short
+    """
+
+    def __init__(self, workers=2, max_queued=32, max_per_owner=2, keep_finished=60):
+        if workers <= 0 or max_queued <= 0 or max_per_owner <= 0:
+            raise ValueError("workers, max_queued and max_per_owner must be positive")
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_per_owner = max_per_owner
+        self.keep_finished = keep_finished
+        self._pending = OrderedDict()  # owner -> deque of queued jobs, in serving order
+        self._jobs = {}  # id -> Job
+        self._active = {}  # owner -> number of queued or running jobs
+        self._queued = 0
+        self._running = 0
+        self._condition = threading.Condition()
+        self._threads = []
+        self._closed = False
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def submit(self, owner, task, total=None, description=""):
+        """
+        Queue a job and return it.
+
+        Raises QueueFull if the queue is full or the owner already has
+        `max_per_owner` jobs queued or running.
+        """
+        job = Job(owner, task, total, description)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the job queue has been shut down")
+            self._prune()
+            if self._active.get(owner, 0) >= self.max_per_owner:
+                raise QueueFull(f"at most {self.max_per_owner} searches can run at once per session")
+            if self._queued >= self.max_queued:
+                raise QueueFull("the server is busy; try again shortly")
+            self._pending.setdefault(owner, deque()).append(job)
+            self._jobs[job.id] = job
+            self._active[owner] = self._active.get(owner, 0) + 1
+            self._queued += 1
+            self._start_workers()
+            self._condition.notify()
+        return job
+
+    def get(self, job_id):
+        """Return a job by id, or None if it is unknown or has expired"""
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def pop(self, job_id):
+        """Remove a finished job and return it, handing its result over to the caller; returns None otherwise"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in FINISHED_STATES:
+                return None
+            return self._jobs.pop(job_id)
+
+    def jobs(self, owner=None):
+        """Return the known jobs, optionally only one owner's, oldest first"""
+        with self._condition:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def position(self, job_id):
+        """Return how many jobs will start before a queued job (0 if it is next), or None if it is not queued"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return None
+            # Owners are served one job per turn, in _pending order: owners ahead of this
+            # one start up to rounds + 1 jobs first, owners behind it up to `rounds`
+            rounds = self._pending[job.owner].index(job)
+            ahead, behind = 0, False
+            for owner, queued in self._pending.items():
+                if owner == job.owner:
+                    ahead += rounds
+                    behind = True
+                else:
+                    ahead += min(len(queued), rounds if behind else rounds + 1)
+            return ahead
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. A queued job is dropped at once; a running one stops at its next progress report.
+
+        Returns False if the job is unknown or already finished.
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return False
+            job.cancel()
+            if job.status == QUEUED:
+                queued = self._pending[job.owner]
+                queued.remove(job)
+                if not queued:
+                    del self._pending[job.owner]
+                self._queued -= 1
+                self._release(job.owner)
+                self.cancelled += 1
+                job._finish(CANCELLED)
+            return True
+
+    def _start_workers(self):
+        # Replace workers a BaseException escaping a task has stopped
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job(self):
+        """Take the first job of the next owner in turn (called with the lock held)"""
+        owner, queued = self._pending.popitem(last=False)
+        job = queued.popleft()
+        if queued:
+            # The owner goes to the back of the line for its next job
+            self._pending[owner] = queued
+        self._queued -= 1
+        return job
+
+    def _release(self, owner):
+        remaining = self._active[owner] - 1
+        if remaining:
+            self._active[owner] = remaining
+        else:
+            del self._active[owner]
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    # Idle workers also expire finished jobs, so uncollected results are released
+                    # even when nothing new is submitted
+                    self._prune()
+                    self._condition.wait(PRUNE_INTERVAL)
+                if self._closed:
+                    return
+                job = self._next_job()
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._running += 1
+
+            # Anything escaping the task, even a BaseException, still fails the job and frees its slot
+            status, result, error = FAILED, None, "the worker stopped"
+            try:
+                if job.cancelled:
+                    raise JobCancelled(job.id)
+                result = job.task(job)
+                status = DONE
+            except JobCancelled:
+                status = CANCELLED
+            except Exception as exception:
+                error = f"{type(exception).__name__}: {exception}"
+            finally:
+                with self._condition:
+                    job._finish(status, result, None if status == DONE else error)
+                    self._running -= 1
+                    self._release(job.owner)
+                    if status == DONE:
+                        self.completed += 1
+                    elif status == FAILED:
+                        self.failed += 1
+                    else:
+                        self.cancelled += 1
+
+    def _prune(self):
+        """Forget jobs that finished more than keep_finished seconds ago (called with the lock held)"""
+        expired = time.time() - self.keep_finished
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished_at is not None and job.finished_at < expired]:
+            # Drop the result too, in case something still holds the job
+            self._jobs.pop(job_id).result = None
+
+    def shutdown(self, cancel=True):
+        """Stop the workers, cancelling running jobs unless `cancel` is False, and wait for them"""
+        with self._condition:
+            self._closed = True
+            for job in self._jobs.values():
+                if cancel and job.status == RUNNING:
+                    job.cancel()
+            self._condition.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    def stats(self):
+        """Return a snapshot of the queue counters"""
+        with self._condition:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "owners": len(self._active),
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+            }
+
+# Process-wide queue shared by every session
+job_queue = JobQueue()
@@ -0,0 +1,352 @@
+"""
+Headless concurrent-session load test for the Streamlit app.
+
+Each simulated session drives main.py through Streamlit's AppTest, with no
+browser: the industry form, industry_questions_form, reruns until the
+background search finishes, the results page, a few navigation reruns (next
+page, filter, follow-up scenario, carousel) and an export download.
+
+AppTest swaps process-wide runtime state on every run, so two runs cannot
+overlap in one process. Concurrent sessions therefore run in worker
+processes, one at a time per worker; sessions in the same worker share its
+result store and caches. A real server runs every session as a thread of one
+process, so treat throughput here as an upper bound.
+
+Examples:
+    python loadtest.py --sessions 20 --concurrency 8 --count 1000
+    python loadtest.py --sessions 50 --locations 5 --json report.json
+
+Reported figures: p50/p95/p99 rerun latency (overall and per step, with the
+wait for the background search as its own "search" step), reruns and
+sessions per second, each session's retained session-state bytes (shared
+result sets excluded) and the workers' resident memory growth per session.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from catalog import INDUSTRIES, INDUSTRY_QUESTIONS
+from cli import peak_memory_bytes
+from export import cached_export
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+# Seconds a single rerun may take before AppTest gives up
+DEFAULT_TIMEOUT = 120
+
+# Seconds between reruns while a session waits for its background search
+SEARCH_POLL_SECONDS = 0.05
+
+PERCENTILES = (50, 95, 99)
+
+# Timed steps that are not a single rerun: the direct export call, and the whole wait for a
+# background search (its search_poll reruns are counted one by one)
+NON_RERUN_STEPS = ("download", "search")
+
+def resident_memory_bytes():
+    """Return the current resident set size of this process, falling back to the peak"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peak_memory_bytes()
+
+def deep_size(value, seen=None):
+    """
+    Approximate the bytes retained by a session-state value.
+
+    Containers are walked; other objects count their own size only, so a
+    ResultHandle counts the handle and not the shared result set behind it.
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    return size
+
+def _button(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"no {label!r} button on the page")
+
+class Session:
+    """
+    One simulated user, recording the latency of every rerun it triggers.
+
+    Parameters:
+    - number: Session number, used to vary the search criteria
+    - count: Prospects requested by the search
+    - locations: Number of distinct locations searched across sessions (sessions sharing criteria share results)
+    - timeout: Seconds a rerun may take
+    """
+
+    def __init__(self, number, count, locations, timeout=DEFAULT_TIMEOUT):
+        self.number = number
+        self.count = count
+        self.location = f"City {number % locations}"
+        self.industry = INDUSTRIES[number % len(INDUSTRIES)]
+        self.timeout = timeout
+        self.timings = []  # (step, seconds)
+        self.state_bytes = None
+        self.error = None
+
+    def _step(self, step, action):
+        start = time.perf_counter()
+        result = action()
+        self.timings.append((step, time.perf_counter() - start))
+        return result
+
+    def _rerun(self, at, step, widget=None):
+        """Rerun the app (through a widget interaction if given) and fail on any app exception"""
+        self._step(step, widget.run if widget is not None else at.run)
+        if at.exception:
+            raise RuntimeError(f"{step}: {at.exception[0].message}")
+
+    def _wait_for_search(self, at):
+        """Rerun the app, as the progress panel's polling would, until the background search has finished"""
+        start = time.perf_counter()
+        while "job_id" in at.session_state:
+            if time.perf_counter() - start > self.timeout:
+                raise TimeoutError(f"search did not finish within {self.timeout}s")
+            time.sleep(SEARCH_POLL_SECONDS)
+            self._rerun(at, "search_poll")
+        self.timings.append(("search", time.perf_counter() - start))
+        if at.session_state["results"] is None:
+            raise RuntimeError("search: no results")
+
+    def run(self):
+        try:
+            at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+            self._rerun(at, "load")
+
+            at.text_input[0].input(self.location)
+            at.text_input[1].input("Decision Makers")
+            at.selectbox(key="industry_dropdown").select(self.industry)
+            self._rerun(at, "industry_form", _button(at, "Next").click())
+
+            questions = INDUSTRY_QUESTIONS[self.industry]
+            roles = questions["role_options"]
+            at.selectbox(key="target_role_select").select(roles[self.number % len(roles)])
+            at.number_input(key="prospect_count_input").set_value(self.count)
+            # Saving is opt-in; measure searches with their history save, as before
+            at.checkbox(key="save_history_input").check()
+            self._rerun(at, "industry_questions_form", _button(at, "Find Prospects").click())
+            self._wait_for_search(at)
+
+            if at.number_input(key="page_number").max > 1:
+                self._rerun(at, "next_page", at.number_input(key="page_number").increment())
+            self._rerun(at, "filter", at.text_input(key="prospect_filter").input(f"title:{roles[0].split()[0]}"))
+            self._rerun(at, "filter_clear", at.text_input(key="prospect_filter").input(""))
+            self._rerun(at, "follow_up_scenario", at.radio(key="response_type").set_value("No Response"))
+            self._rerun(at, "carousel", at.toggle(key="carousel_mode").set_value(True))
+
+            # The download button serves its data from a callable; call the same export directly
+            result_set = at.session_state["results"].result_set
+            self._step("download", lambda: cached_export(result_set, "csv", False))
+
+            self.state_bytes = sum(deep_size(key) + deep_size(value) for key, value in at.session_state.items())
+        except Exception as error:
+            self.error = f"{type(error).__name__}: {error}"
+        return self
+
+    def result(self):
+        """Return what the session measured as a plain dict (AppTest replaces __main__, so Session can't be pickled)"""
+        return {
+            "number": self.number,
+            "timings": self.timings,
+            "state_bytes": self.state_bytes,
+            "error": self.error,
+        }
+
+def summarize(latencies):
+    """Return count, mean and percentile latencies (ms) of a list of seconds"""
+    values = np.asarray(latencies) * 1000
+    summary = {"count": len(values), "mean_ms": float(values.mean()) if len(values) else None}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = float(np.percentile(values, p)) if len(values) else None
+    return summary
+
+def _quiet_streamlit():
+    # Sessions run outside a Streamlit server, which Streamlit warns about on every thread. Streamlit
+    # resets its loggers' levels when it configures them, so the warning is filtered out instead
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: record.levelno >= logging.ERROR
+    )
+
+def _run_worker(numbers, count, locations, timeout, warmup):
+    """
+    Run sessions one after another in a worker process.
+
+    Returns the finished sessions' results, the seconds they took and the worker's
+    resident memory before and after them (all measured after its warm-up sessions).
+    """
+    _quiet_streamlit()
+    for number in range(warmup):
+        # Warm-up sessions search a location of their own, so nothing they cache is reused
+        session = Session(-1 - number, count, 1, timeout)
+        session.location = f"Warm-up {os.getpid()} {number}"
+        session.run()
+        if session.error is not None:
+            raise RuntimeError(f"warm-up session failed: {session.error}")
+    resident_before = resident_memory_bytes()
+    start = time.perf_counter()
+    finished = [Session(number, count, locations, timeout).run().result() for number in numbers]
+    return finished, time.perf_counter() - start, resident_before, resident_memory_bytes()
+
+def run_load_test(sessions, concurrency, count, locations=None, timeout=DEFAULT_TIMEOUT, warmup=1, report=None):
+    """
+    Run `sessions` simulated sessions, `concurrency` at a time, and return the report dict.
+
+    Each of the `concurrency` worker processes first runs `warmup` sessions
+    that are left out of the report, so one-off costs (importing the app,
+    compiling templates) don't count as load.
+
+    Parameters:
+    - sessions: Number of simulated sessions
+    - concurrency: Sessions running at once (one worker process each)
+    - count: Prospects requested per search
+    - locations: Distinct locations searched (defaults to one per session, so no results are shared)
+    - timeout: Seconds a rerun may take
+    - warmup: Unmeasured sessions each worker runs first
+    - report: Optional function(session result dict) called as sessions finish
+    """
+    locations = locations or sessions
+    workers = min(concurrency, sessions)
+    finished, resident = [], []
+    elapsed = 0.0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_worker, list(range(worker, sessions, workers)), count, locations, timeout, warmup)
+            for worker in range(workers)
+        ]
+        for future in as_completed(futures):
+            worker_sessions, seconds, resident_before, resident_after = future.result()
+            finished.extend(worker_sessions)
+            # Workers start together, so the slowest one's measured time is the run's duration
+            elapsed = max(elapsed, seconds)
+            resident.append((resident_before, resident_after))
+            if report is not None:
+                for session in worker_sessions:
+                    report(session)
+
+    completed = [session for session in finished if session["error"] is None]
+    reruns = [seconds for session in completed for step, seconds in session["timings"] if step not in NON_RERUN_STEPS]
+    steps = {}
+    for session in completed:
+        for step, seconds in session["timings"]:
+            steps.setdefault(step, []).append(seconds)
+    state_bytes = [session["state_bytes"] for session in completed]
+    growth = None
+    if resident and all(before is not None and after is not None for before, after in resident):
+        growth = sum(after - before for before, after in resident)
+
+    return {
+        "sessions": sessions,
+        "concurrency": workers,
+        "count": count,
+        "locations": locations,
+        "completed": len(completed),
+        "errors": sorted(session["error"] for session in finished if session["error"] is not None),
+        "elapsed_seconds": elapsed,
+        "reruns_per_second": len(reruns) / elapsed if elapsed > 0 else None,
+        "sessions_per_second": len(completed) / elapsed if elapsed > 0 else None,
+        "rerun_latency": summarize(reruns),
+        "steps": {step: summarize(latencies) for step, latencies in steps.items()},
+        "session_state_bytes": {
+            "mean": float(np.mean(state_bytes)) if state_bytes else None,
+            "max": max(state_bytes) if state_bytes else None,
+        },
+        "resident_bytes": {
+            "workers": [{"before": before, "after": after} for before, after in resident],
+            "per_session": growth / sessions if growth is not None else None,
+        },
+    }
+
+def _format_latency(summary):
+    if not summary["count"]:
+        return "n/a"
+    return "  ".join(f"p{p} {summary[f'p{p}_ms']:8.1f} ms" for p in PERCENTILES) + f"  (n={summary['count']})"
+
+def print_report(report, stream=sys.stdout):
+    mib = 1024 * 1024
+    print(
+        f"{report['completed']}/{report['sessions']} sessions completed in {report['elapsed_seconds']:.2f}s "
+        f"({report['concurrency']} at a time, {report['count']:,} prospects each)", file=stream
+    )
+    print(
+        f"Throughput: {report['reruns_per_second'] or 0:.1f} reruns/s, "
+        f"{report['sessions_per_second'] or 0:.2f} sessions/s", file=stream
+    )
+    print(f"Rerun latency: {_format_latency(report['rerun_latency'])}", file=stream)
+    for step, summary in report["steps"].items():
+        print(f"  {step:<24} {_format_latency(summary)}", file=stream)
+    state = report["session_state_bytes"]
+    if state["mean"] is not None:
+        print(f"Session state: mean {state['mean'] / 1024:.1f} KiB, max {state['max'] / 1024:.1f} KiB", file=stream)
+    resident = report["resident_bytes"]
+    if resident["per_session"] is not None:
+        before = sum(worker["before"] for worker in resident["workers"])
+        after = sum(worker["after"] for worker in resident["workers"])
+        print(
+            f"Resident memory of {len(resident['workers'])} worker(s): {before / mib:.1f} -> {after / mib:.1f} MiB "
+            f"({resident['per_session'] / mib:.2f} MiB per session)", file=stream
+        )
+    for error in report["errors"]:
+        print(f"ERROR {error}", file=stream)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with simulated concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=10, help="Simulated sessions (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sessions running at once (default: 4)")
+    parser.add_argument("--count", type=int, default=100, help="Prospects requested per search (default: 100)")
+    parser.add_argument(
+        "--locations", type=int, help="Distinct locations searched; fewer than --sessions makes sessions share results"
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured sessions run first (default: 1)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds a single rerun may take")
+    parser.add_argument("--history", help="Search history database (default: a temporary one)")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.sessions <= 0 or args.concurrency <= 0 or args.count <= 0 or (args.locations or 1) <= 0:
+        parser.error("--sessions, --concurrency, --count and --locations must be positive")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    _quiet_streamlit()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep simulated searches out of the real search history
+        os.environ["PROSPECT_HISTORY_DB"] = args.history or os.path.join(directory, "history.sqlite3")
+        report = run_load_test(
+            args.sessions, args.concurrency, args.count, args.locations, args.timeout, args.warmup,
+            report=lambda session: print(f"session {session['number']}: {session['error'] or 'ok'}", file=sys.stderr)
+        )
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,379 @@
+import html
+import sqlite3
+import uuid
+from datetime import datetime
+
 import streamlit as st
-import pandas as pd
-from utils import generate_linkedin_prospects
+from history import SearchHistory
+from jobs import CANCELLED, DONE, FAILED, QUEUED, QueueFull, job_queue
+from result_store import result_store
+from catalog import INDUSTRIES, INDUSTRY_QUESTIONS
+from export import EXPORT_FORMATS, cached_export, export_cache, export_filename, export_mime
+from metrics import metrics
+from pipeline import prospect_pipeline
 from styles import apply_styles
-import time
+from carousel import copy_button, render_carousel
+
+# Candidates scored per shown prospect; only the most relevant are kept
+SEARCH_OVERSAMPLE = 50
+
+# Rows per page offered by the results browser
+PAGE_SIZES = (10, 25, 50, 100)
+
+# Seconds between progress updates while a search runs in the background
+JOB_POLL_SECONDS = 0.5
+
+def template_area(label, value, key, source):
+    """
+    Render an editable template under a fixed widget key.
+
+    The text is only replaced when `source` (the prospect and scenario it came
+    from) changes, so edits survive reruns but never leak to another prospect.
+    """
+    if st.session_state.get(f"{key}_source") != source:
+        st.session_state[key] = value
+        st.session_state[f"{key}_source"] = source
+    st.text_area(label, height=200, key=key)
+
+def prospect_detail(prospect, row):
+    """
+    Render the card and templates of the selected prospect.
+
+    Widget keys are fixed, so session state holds one set of detail widgets
+    however many prospects have been viewed.
+    """
+    relevance = prospect.get('relevance_score')
+    match = f"<p>Match: {relevance:.0%}</p>" if relevance is not None else ""
+    # The location is user input and the rest may come from an external source, so escape everything
+    name, title, company, location, url = (
+        html.escape(str(prospect[field])) for field in ("name", "title", "company", "location", "profile_url")
+    )
+
+    # Card container
+    with st.container():
+        # Profile section
+        st.markdown(f"""
+            <div class="prospect-card">
+                <h3>{name}</h3>
+                <p class="title">{title} at {company}</p>
+                <div class="prospect-details">
+                    <p>{location}</p>
+                    {match}
+                    <p><a href="{url}" target="_blank">View Profile ↗</a></p>
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # Email templates section
+        tab1, tab2 = st.tabs(["Initial Outreach", "Follow-up Templates"])
+
+        with tab1:
+            email_col1, email_col2 = st.columns([4, 1])
+            with email_col1:
+                template_area("Initial Email Template", prospect['email_template'], "email_template", row)
+            with email_col2:
+                # Copies in the browser, including any edits, without a rerun
+                copy_button(st.session_state.email_template)
+
+        with tab2:
+            # Create columns for better layout
+            select_col, _ = st.columns([2, 2])
+            with select_col:
+                response_type = st.radio(
+                    "Select response scenario:",
+                    ["Positive Response", "Negative Response", "No Response"],
+                    horizontal=True,
+                    key="response_type"
+                )
+
+            template_key = {
+                "Positive Response": "positive",
+                "Negative Response": "negative",
+                "No Response": "no_response"
+            }[response_type]
+
+            # Follow-up template with copy button
+            template_col1, template_col2 = st.columns([4, 1])
+            with template_col1:
+                if 'follow_up_templates' in prospect and template_key in prospect['follow_up_templates']:
+                    follow_up_value = prospect['follow_up_templates'][template_key]
+                else:
+                    # Provide a default template if the key is missing
+                    follow_up_value = f"[Default follow-up template for {template_key} scenario]"
+
+                template_area("Follow-up Template", follow_up_value, "followup_template", (row, template_key))
+            with template_col2:
+                copy_button(st.session_state.followup_template)
+
+@st.fragment
+def prospect_browser(result_set):
+    """
+    Render the search box, one page of matching prospects and the selected prospect's details.
+
+    Only the visible page is read from the result set, and every widget has a
+    fixed key, so render time and session state do not grow with the number of
+    prospects. Runs as a fragment, so filtering, paging or selecting a row only
+    reruns this function instead of the whole app.
+    """
+    # Filter through the result set's inverted index instead of scanning every prospect
+    query = st.text_input(
+        "Filter prospects",
+        placeholder="e.g. cfo, company:fintech, title:cfo OR ceo",
+        key="prospect_filter"
+    )
+    with metrics.stage("app.filter"):
+        rows = result_set.index.search(query)
+    if not len(rows):
+        st.info("No prospects match your filter.")
+        return
+
+    size_col, page_col, count_col = st.columns([1, 1, 2])
+    with size_col:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key="page_size")
+    page_count = -(-len(rows) // page_size)
+    # Keep the page in range when the filter or page size shrinks the result
+    if st.session_state.get("page_number", 1) > page_count:
+        st.session_state.page_number = page_count
+    with page_col:
+        page_number = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="page_number")
+    start = (page_number - 1) * page_size
+    page_rows = rows[start:start + page_size].tolist()
+    with count_col:
+        st.caption(
+            f"Prospects {start + 1}-{start + len(page_rows)} of {len(rows)}"
+            + (f" (filtered from {len(result_set.prospects)})" if query.strip() else "")
+        )
+
+    # Fetch only the visible page
+    with metrics.stage("app.page"):
+        page = [result_set.prospects[row] for row in page_rows]
+
+    # The carousel ships the page to the browser once; paging through it needs no reruns
+    if st.toggle("Card carousel", key="carousel_mode"):
+        render_carousel(page)
+        return
+
+    table = {
+        "Name": [prospect['name'] for prospect in page],
+        "Title": [prospect['title'] for prospect in page],
+        "Company": [prospect['company'] for prospect in page],
+        "Location": [prospect['location'] for prospect in page],
+    }
+    if page[0].get('relevance_score') is not None:
+        table["Match"] = [prospect['relevance_score'] for prospect in page]
+    event = st.dataframe(
+        table,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="prospect_table"
+    )
+
+    # Show the selected row's details, defaulting to the first row of the page
+    selected = event.selection.rows
+    position = selected[0] if selected and selected[0] < len(page) else 0
+    prospect_detail(page[position], page_rows[position])
+
+@st.fragment
+def export_panel(result_set):
+    """
+    Render the export format options and download button.
+
+    The file is only encoded when the button is clicked, and encoded exports are
+    cached per result set.
+    """
+    fmt = st.selectbox(
+        "Export format",
+        options=list(EXPORT_FORMATS),
+        format_func=str.upper,
+        key="export_format"
+    )
+    compress = st.checkbox("Gzip", key="export_gzip")
+    st.download_button(
+        label=f"Download as {fmt.upper()}",
+        data=lambda: cached_export(result_set, fmt, compress),
+        file_name=export_filename("linkedin_prospects", fmt, compress),
+        mime=export_mime(fmt, compress),
+        on_click="ignore"
+    )
+
+def option_index(options, value):
+    """Return the position of `value` in a selectbox's options, or 0 if it isn't one"""
+    return options.index(value) if value in options else 0
+
+@st.cache_resource
+def search_history():
+    """Return the shared search history, or None if its database can't be opened"""
+    try:
+        return SearchHistory()
+    except (OSError, sqlite3.Error):
+        return None
+
+def open_saved_search(history, search):
+    """Show a saved search's prospects as the current results, without regenerating them"""
+    search_id, owner = search["id"], st.session_state.session_id
+    st.session_state.results = result_store.load(
+        ("history", owner, search_id), lambda: history.load(search_id, owner=owner)
+    )
+    st.session_state.location = search["location"]
+    st.session_state.demographic = search["demographic"]
+    st.session_state.industry_selected = search["industry"]
+    st.session_state.industry_focus = search["industry_focus"]
+    st.session_state.target_role = search["target_role"]
+    st.session_state.show_industry_questions = True
+    st.session_state.form_submitted = True
+
+def history_sidebar(history):
+    """Render recent saved searches and a lookup of saved prospects across searches"""
+    with st.sidebar:
+        st.subheader("Search History")
+        searches = history.searches(limit=10, owner=st.session_state.session_id)
+        if not searches:
+            st.caption("Saved searches will appear here.")
+        for search in searches:
+            created = datetime.fromtimestamp(search["created_at"]).strftime("%b %d, %H:%M")
+            label = f"{search['industry']} · {search['target_role'] or 'Any role'} ({search['count']:,})"
+            if st.button(label, key=f"history_open_{search['id']}", help=f"{search['location']} · {created}",
+                         use_container_width=True):
+                open_saved_search(history, search)
+                st.rerun()
+
+        company = st.text_input("Find saved prospects by company", key="history_company")
+        title = st.text_input("...or by title", key="history_title")
+        if company.strip() or title.strip():
+            matches = history.find(
+                company=company.strip(), title=title.strip(), limit=50, owner=st.session_state.session_id
+            )
+            if matches:
+                st.dataframe(
+                    {column: [match[column] for match in matches] for column in ("name", "title", "company", "industry")},
+                    hide_index=True
+                )
+            else:
+                st.caption("No saved prospects match.")
+
+def search_task(location, demographic, industry, industry_focus, target_role, count, history, owner):
+    """
+    Return a job task that generates a search's prospects and optionally saves them to the history.
+
+    The task runs on a job queue worker, so it takes every input as an argument
+    instead of reading session state.
+    """
+    def search(job):
+        with metrics.stage("app.search"):
+            results = result_store.acquire(
+                location, demographic, industry, industry_focus, target_role,
+                count=count, oversample=SEARCH_OVERSAMPLE, progress=job.report
+            )
+        if history is not None:
+            with metrics.stage("app.save_history"):
+                history.save(
+                    results.prospects, location, demographic, industry, industry_focus, target_role,
+                    oversample=SEARCH_OVERSAMPLE, owner=owner
+                )
+        return results
+    return search
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(job_id):
+    """
+    Render the progress of the session's background search, with a preview of its first prospects.
+
+    Polls the job as a fragment, so only this panel reruns while the search is
+    generated; once the job finishes, the whole app reruns to show the results.
+    """
+    job = job_queue.get(job_id)
+    state = job.snapshot() if job is not None else {"status": FAILED, "error": "The search expired."}
+    if state["status"] == DONE:
+        st.session_state.results = job.result
+        st.session_state.form_submitted = True
+    elif state["status"] in (FAILED, CANCELLED):
+        st.session_state.job_message = (
+            "Search cancelled." if state["status"] == CANCELLED else f"Search failed: {state['error']}"
+        )
+    if state["status"] in (DONE, FAILED, CANCELLED):
+        # The session now holds the results, so the queue can forget the job
+        job_queue.pop(job_id)
+        del st.session_state.job_id
+        st.rerun()
+
+    if state["status"] == QUEUED:
+        ahead = job_queue.position(job_id)
+        st.info(f"Waiting for a free worker ({ahead or 0} search{'' if ahead == 1 else 'es'} ahead)...")
+    elif state["cancel_requested"]:
+        st.info("Cancelling...")
+    elif state["done"] < state["total"]:
+        st.progress(
+            state["progress"] or 0.0,
+            text=f"Searching for relevant prospects... {state['done']:,} of {state['total']:,}"
+        )
+    else:
+        # Generated; the result set is being indexed (and saved to the history)
+        st.progress(1.0, text=f"Preparing {state['total']:,} prospects...")
+    if state["preview"]:
+        st.caption("First prospects found")
+        st.dataframe(state["preview"], hide_index=True)
+    # Cancelled in a callback, so the rerun it triggers already shows the job as cancelling
+    st.button(
+        "Cancel search", key="job_cancel", disabled=state["cancel_requested"],
+        on_click=job_queue.cancel, args=(job_id,)
+    )
+
+def diagnostics_panel():
+    """Render per-stage timings and allocations, and the shared caches' counters"""
+    with st.expander("Diagnostics"):
+        record_col, allocations_col, reset_col = st.columns(3)
+        with record_col:
+            record = st.toggle("Record stage metrics", value=metrics.enabled, key="diagnostics_record")
+        with allocations_col:
+            allocations = st.toggle(
+                "Track allocations", value=metrics.allocations, disabled=not record, key="diagnostics_allocations"
+            )
+        # Metrics are process-wide, so this turns recording on or off for every session
+        if not record and metrics.enabled:
+            metrics.disable()
+        elif record and (not metrics.enabled or allocations != metrics.allocations):
+            metrics.enable(allocations)
+        with reset_col:
+            if st.button("Reset metrics", key="diagnostics_reset"):
+                metrics.reset()
+
+        snapshot = metrics.snapshot()
+        if snapshot:
+            st.dataframe(
+                {
+                    "Stage": list(snapshot),
+                    "Calls": [stage["calls"] for stage in snapshot.values()],
+                    "Total (ms)": [stage["seconds"] * 1000 for stage in snapshot.values()],
+                    "Mean (ms)": [stage["mean_seconds"] * 1000 for stage in snapshot.values()],
+                    "Max (ms)": [stage["max_seconds"] * 1000 for stage in snapshot.values()],
+                    "Allocated (KiB)": [
+                        None if stage["allocated_bytes"] is None else stage["allocated_bytes"] / 1024
+                        for stage in snapshot.values()
+                    ],
+                },
+                hide_index=True
+            )
+        else:
+            st.caption("No stages recorded yet. Turn on recording and run a search.")
+        st.json(
+            {
+                "result_store": result_store.stats(),
+                "pipeline_cache": prospect_pipeline.cache.stats(),
+                "export_cache": export_cache.stats(),
+                "job_queue": job_queue.stats(),
+            },
+            expanded=False
+        )
 
 def main():
     # Apply custom styles
-    apply_styles()
+    with metrics.stage("app.styles"):
+        apply_styles()
 
     # Initialize session state
-    if 'prospects' not in st.session_state:
-        st.session_state.prospects = None
+    if 'results' not in st.session_state:
+        st.session_state.results = None
     if 'form_submitted' not in st.session_state:
         st.session_state.form_submitted = False
     if 'show_industry_questions' not in st.session_state:
@@ -21,82 +384,23 @@ def main():
         st.session_state.industry_focus = ""
     if 'target_role' not in st.session_state:
         st.session_state.target_role = ""
+    # Owner of the session's background searches in the shared job queue and of its saved searches
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
 
     st.title("LinkedIn Prospect Finder")
     st.markdown("""
     Find potential LinkedIn prospects based on your target criteria and get customized outreach templates.
     """)
 
-    # Define industry list
-    industry_list = [
-        "Technology & Software",
-        "Finance & Banking",
-        "Healthcare & Pharmaceuticals",
-        "Manufacturing & Industrial",
-        "Retail & E-commerce",
-        "Education & Training",
-        "Professional Services",
-        "Media & Entertainment",
-        "Energy & Utilities"
-    ]
-    
-    # Industry-specific questions
-    industry_questions = {
-        "Technology & Software": {
-            "focus_question": "What market segment are you targeting?",
-            "focus_options": ["B2B", "B2C", "Enterprise", "SMB", "Startups"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["CTO/CIO", "Software Engineers", "Product Managers", "IT Directors", "DevOps"]
-        },
-        "Finance & Banking": {
-            "focus_question": "What financial segment are you targeting?",
-            "focus_options": ["Retail Banking", "Investment Banking", "Wealth Management", "Insurance", "Fintech"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["CFO", "Financial Advisors", "Risk Managers", "Investment Analysts", "Banking Executives"]
-        },
-        "Healthcare & Pharmaceuticals": {
-            "focus_question": "What healthcare segment are you targeting?",
-            "focus_options": ["Hospitals", "Clinics", "Research", "Pharmaceuticals", "Medical Devices"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["Physicians", "Hospital Administrators", "Research Directors", "Medical Staff", "Healthcare IT"]
-        },
-        "Manufacturing & Industrial": {
-            "focus_question": "What manufacturing segment are you targeting?",
-            "focus_options": ["Automotive", "Electronics", "Chemical", "Aerospace", "Consumer Goods"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["Plant Managers", "Operations Directors", "Supply Chain Managers", "Quality Control", "Engineers"]
-        },
-        "Retail & E-commerce": {
-            "focus_question": "What retail segment are you targeting?",
-            "focus_options": ["Brick & Mortar", "Online-only", "Omnichannel", "Luxury", "Mass Market"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["Merchandisers", "Digital Marketing Managers", "Store Managers", "E-commerce Directors", "Retail Buyers"]
-        },
-        "Education & Training": {
-            "focus_question": "What education segment are you targeting?",
-            "focus_options": ["K-12", "Higher Education", "Corporate Training", "Online Learning", "EdTech"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["School Administrators", "Faculty", "Educational Directors", "Training Managers", "EdTech Buyers"]
-        },
-        "Professional Services": {
-            "focus_question": "What professional service segment are you targeting?",
-            "focus_options": ["Consulting", "Legal", "Accounting", "HR", "Marketing Agencies"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["Partners", "Practice Leaders", "Associates", "Consultants", "Department Heads"]
-        },
-        "Media & Entertainment": {
-            "focus_question": "What media segment are you targeting?",
-            "focus_options": ["Film & TV", "Music", "Digital Media", "Publishing", "Gaming"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["Content Creators", "Producers", "Studio Executives", "Media Buyers", "Creative Directors"]
-        },
-        "Energy & Utilities": {
-            "focus_question": "What energy segment are you targeting?",
-            "focus_options": ["Oil & Gas", "Renewable Energy", "Utilities", "Power Generation", "Energy Services"],
-            "role_question": "What is your ideal target role?",
-            "role_options": ["Operations Managers", "Project Engineers", "Sustainability Directors", "Plant Supervisors", "Business Development"]
-        }
-    }
+    history = search_history()
+    if history is not None:
+        with metrics.stage("app.history"):
+            history_sidebar(history)
+
+    # Industry list and industry-specific questions come from the shared catalog
+    industry_list = INDUSTRIES
+    industry_questions = INDUSTRY_QUESTIONS
 
     # Input Form - Step 1
     if not st.session_state.show_industry_questions:
@@ -130,9 +434,14 @@ def main():
                 # Use st.rerun() instead of st.experimental_rerun()
                 st.rerun()
 
+    # Search in progress: the progress panel replaces step 2 until the job finishes
+    if 'job_id' in st.session_state:
+        job_progress(st.session_state.job_id)
     # Input Form - Step 2 (Industry-specific questions)
-    if st.session_state.show_industry_questions and not st.session_state.form_submitted:
+    elif st.session_state.show_industry_questions and not st.session_state.form_submitted:
         industry = st.session_state.industry_selected
+        if 'job_message' in st.session_state:
+            st.warning(st.session_state.pop('job_message'))
         
         with st.form("industry_questions_form"):
             st.subheader(f"Tell us more about your {industry} prospects")
@@ -142,9 +451,11 @@ def main():
                 focus_q = industry_questions[industry]["focus_question"]
                 focus_options = industry_questions[industry]["focus_options"]
                 
+                # Refining a search starts from the previous answers
                 industry_focus = st.selectbox(
                     focus_q,
                     options=focus_options,
+                    index=option_index(focus_options, st.session_state.industry_focus),
                     key="industry_focus_select"
                 )
                 
@@ -154,32 +465,58 @@ def main():
                 target_role = st.selectbox(
                     role_q,
                     options=role_options,
+                    index=option_index(role_options, st.session_state.target_role),
                     key="target_role_select"
                 )
+
+            prospect_count = st.number_input(
+                "Number of prospects",
+                min_value=1,
+                max_value=1_000_000,
+                value=st.session_state.get("prospect_count", 25),
+                step=5,
+                key="prospect_count_input"
+            )
+            save_search = st.checkbox(
+                "Save to search history",
+                value=False,
+                disabled=history is None,
+                key="save_history_input"
+            )
             
             submitted_step2 = st.form_submit_button("Find Prospects")
         
         if submitted_step2:
             st.session_state.industry_focus = industry_focus
             st.session_state.target_role = target_role
+            st.session_state.prospect_count = int(prospect_count)
             
-            with st.spinner("Searching for relevant prospects..."):
-                time.sleep(1)
-                # Pass additional parameters to the prospect generator
-                st.session_state.prospects = generate_linkedin_prospects(
-                    st.session_state.location, 
-                    st.session_state.demographic, 
-                    st.session_state.industry_selected,
-                    st.session_state.industry_focus,
-                    st.session_state.target_role
+            # Generate in the background; job_progress polls the job until its results are ready
+            try:
+                job = job_queue.submit(
+                    st.session_state.session_id,
+                    search_task(
+                        st.session_state.location,
+                        st.session_state.demographic,
+                        st.session_state.industry_selected,
+                        st.session_state.industry_focus,
+                        st.session_state.target_role,
+                        int(prospect_count),
+                        history if save_search else None,
+                        st.session_state.session_id
+                    ),
+                    total=int(prospect_count),
+                    description=f"{st.session_state.industry_selected} · {st.session_state.target_role}"
                 )
-                st.session_state.form_submitted = True
-                # Use st.rerun() instead of st.experimental_rerun()
+            except QueueFull as error:
+                st.error(str(error))
+            else:
+                st.session_state.job_id = job.id
                 st.rerun()
-    
+
     # Display Results
-    if st.session_state.form_submitted and st.session_state.prospects:
-        prospects = st.session_state.prospects
+    if st.session_state.form_submitted and st.session_state.results:
+        prospects = st.session_state.results.prospects
 
         # Display the refined criteria
         with st.container():
@@ -191,103 +528,17 @@ def main():
             with col3:
                 st.info(f"**Target Role:** {st.session_state.target_role}")
 
-        # Progress indicator
-        current_tab = st.radio(
-            "Navigate Prospects",
-            options=range(len(prospects)),
-            format_func=lambda x: f"Prospect {x+1} of {len(prospects)}",
-            horizontal=True,
-            label_visibility="collapsed"
-        )
-
-        # Display current prospect card
-        prospect = prospects[current_tab]
+        # Navigation, card and templates rerun on their own when clicked
+        with metrics.stage("app.results"):
+            prospect_browser(st.session_state.results.result_set)
 
-        # Card container
         with st.container():
-            # Profile section
-            st.markdown(f"""
-                <div class="prospect-card">
-                    <h3>{prospect['name']}</h3>
-                    <p class="title">{prospect['title']} at {prospect['company']}</p>
-                    <div class="prospect-details">
-                        <p>{prospect['location']}</p>
-                        <p><a href="{prospect['profile_url']}" target="_blank">View Profile ↗</a></p>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-
-            # Email templates section
-            tab1, tab2 = st.tabs(["Initial Outreach", "Follow-up Templates"])
-
-            with tab1:
-                email_col1, email_col2 = st.columns([4, 1])
-                with email_col1:
-                    st.text_area(
-                        "Initial Email Template",
-                        value=prospect['email_template'],
-                        height=200,
-                        key=f"email_{current_tab}"
-                    )
-                with email_col2:
-                    st.button(
-                        "Copy Template",
-                        key=f"copy_initial_{current_tab}",
-                        type="primary",
-                        use_container_width=True
-                    )
-
-            with tab2:
-                # Create columns for better layout
-                select_col, _ = st.columns([2, 2])
-                with select_col:
-                    response_type = st.radio(
-                        "Select response scenario:",
-                        ["Positive Response", "Negative Response", "No Response"],
-                        horizontal=True,
-                        key=f"response_type_{current_tab}"
-                    )
-
-                template_key = {
-                    "Positive Response": "positive",
-                    "Negative Response": "negative",
-                    "No Response": "no_response"
-                }[response_type]
-
-                # Follow-up template with copy button
-                template_col1, template_col2 = st.columns([4, 1])
-                with template_col1:
-                    if 'follow_up_templates' in prospect and template_key in prospect['follow_up_templates']:
-                        follow_up_value = prospect['follow_up_templates'][template_key]
-                    else:
-                        # Provide a default template if the key is missing
-                        follow_up_value = f"[Default follow-up template for {template_key} scenario]"
-
-                    st.text_area(
-                        "Follow-up Template",
-                        value=follow_up_value,
-                        height=200,
-                        key=f"followup_{current_tab}"
-                    )
-                with template_col2:
-                    st.button(
-                        "Copy Template",
-                        key=f"copy_followup_{current_tab}",
-                        type="primary",
-                        use_container_width=True
-                    )
-
             # Export and stats section
             with st.expander("Export & Statistics"):
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric("Total Prospects", len(prospects))
-                    st.download_button(
-                        label="Download as CSV",
-                        data=pd.DataFrame(prospects).to_csv(index=False).encode('utf-8'),
-                        file_name='linkedin_prospects.csv',
-                        mime='text/csv',
-                    )
+                    export_panel(st.session_state.results.result_set)
                 with col2:
                     st.metric("Industry", st.session_state.industry_selected)
                     st.metric("Focus", st.session_state.industry_focus)
@@ -295,12 +546,25 @@ def main():
                     st.metric("Location", st.session_state.location)
                     st.metric("Target Role", st.session_state.target_role)
             
-            # Reset button to start a new search
-            if st.button("Start New Search", type="secondary"):
-                for key in st.session_state.keys():
-                    del st.session_state[key]
-                # Use st.rerun() instead of st.experimental_rerun()
-                st.rerun()
+            refine_col, reset_col = st.columns(2)
+            with refine_col:
+                # Back to step 2 with the current answers; stages whose criteria are unchanged are reused
+                if st.button("Refine Search", type="secondary"):
+                    st.session_state.form_submitted = False
+                    st.rerun()
+            with reset_col:
+                # Reset button to start a new search
+                if st.button("Start New Search", type="secondary"):
+                    # The session keeps its id, and with it its saved searches and queued jobs
+                    for key in list(st.session_state.keys()):
+                        if key != "session_id":
+                            del st.session_state[key]
+                    # Use st.rerun() instead of st.experimental_rerun()
+                    st.rerun()
+
+    # Hidden unless the app is opened with ?diagnostics=1
+    if st.query_params.get("diagnostics"):
+        diagnostics_panel()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
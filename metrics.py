@@ -0,0 +1,131 @@
+"""
+Opt-in timing and allocation instrumentation.
+
+Code marks a stage with `with metrics.stage("name"):`. While recording is off,
+stage() hands back one shared no-op context manager, so an instrumented call
+costs an attribute check. While it is on, every stage records its call count
+and wall time, plus the net bytes it allocated when allocation tracking
+(tracemalloc) is on as well. Stages may nest; each records its own totals.
+
+Recording starts off unless the PROSPECT_METRICS environment variable is set
+("alloc" also tracks allocations). Metrics are process-wide, so with several
+sessions running at once, allocation figures include other threads' work.
+"""
+import contextlib
+import os
+import threading
+import time
+import tracemalloc
+
+_DISABLED = contextlib.nullcontext()
+
+class _Stage:
+    """Context manager recording one run of a stage"""
+
+    __slots__ = ("metrics", "name", "start", "allocated")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.allocated = tracemalloc.get_traced_memory()[0] if self.metrics.allocations else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        allocated = None
+        if self.allocated is not None and tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0] - self.allocated
+        self.metrics.record(self.name, elapsed, allocated)
+        return False
+
+class Metrics:
+    """
+    Thread-safe per-stage counters of calls, wall time and allocated bytes.
+
+    Parameters:
+    - enabled: Start recording immediately
+    - allocations: Also track allocated bytes (starts tracemalloc, which slows allocation-heavy code)
+    """
+
+    def __init__(self, enabled=False, allocations=False):
+        self._lock = threading.Lock()
+        self._stages = {}  # name -> [calls, seconds, max seconds, allocated bytes]
+        self.enabled = False
+        self.allocations = False
+        self._started_tracing = False
+        if enabled:
+            self.enable(allocations)
+
+    def enable(self, allocations=False):
+        """Start recording, optionally tracking allocations too"""
+        if allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not allocations and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.allocations = allocations
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording; counters are kept until reset()"""
+        self.enabled = False
+        self.allocations = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def stage(self, name):
+        """Return a context manager that records one run of stage `name` (a no-op while disabled)"""
+        if not self.enabled:
+            return _DISABLED
+        return _Stage(self, name)
+
+    def record(self, name, seconds, allocated=None):
+        """Add one run of a stage to its counters"""
+        with self._lock:
+            counters = self._stages.get(name)
+            if counters is None:
+                counters = self._stages[name] = [0, 0.0, 0.0, None]
+            counters[0] += 1
+            counters[1] += seconds
+            counters[2] = max(counters[2], seconds)
+            if allocated is not None:
+                counters[3] = (counters[3] or 0) + allocated
+
+    def snapshot(self):
+        """
+        Return the counters of every recorded stage.
+
+        Maps stage name -> dict of calls, seconds (total), mean_seconds,
+        max_seconds and allocated_bytes (None unless allocations were tracked).
+        """
+        with self._lock:
+            stages = {name: list(counters) for name, counters in self._stages.items()}
+        return {
+            name: {
+                "calls": calls,
+                "seconds": seconds,
+                "mean_seconds": seconds / calls,
+                "max_seconds": max_seconds,
+                "allocated_bytes": allocated,
+            }
+            for name, (calls, seconds, max_seconds, allocated) in sorted(stages.items())
+        }
+
+    def reset(self):
+        """Clear every stage's counters"""
+        with self._lock:
+            self._stages.clear()
+
+def _from_environment():
+    setting = os.environ.get("PROSPECT_METRICS", "").strip().lower()
+    if setting in ("", "0", "false", "no", "off"):
+        return Metrics()
+    return Metrics(enabled=True, allocations=setting in ("alloc", "allocations"))
+
+# Process-wide metrics shared by every instrumented module
+metrics = _from_environment()
@@ -0,0 +1,225 @@
+"""
+Local stand-in for the prospect enrichment backend.
+
+Serves the protocol described in sources.py from the built-in generator, with
+optional injected latency and failures, so HTTPProspectSource can be tested
+and benchmarked offline.
+
+Examples:
+    python mock_server.py --port 8765 --delay 0.05 --jitter 0.02 --error-rate 0.05
+
+    python mock_server.py --bench --count 100000 --batch-size 500 --concurrency 16 \\
+        --rate 200 --delay 0.05 --error-rate 0.02
+
+--bench starts the server in the background, fetches --count prospects
+through HTTPProspectSource and reports throughput and request latency.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from sources import SEARCH_PATH, HTTPProspectSource
+from utils import generate_linkedin_prospects
+
+CRITERIA_FIELDS = ("location", "demographic", "industry", "industry_focus", "target_role")
+
+def batch_seed(seed, offset):
+    """Derive the generator seed of the batch at `offset`, so repeating a seeded request repeats its prospects"""
+    if seed is None:
+        return None
+    # SeedSequence rejects negative entropy, so negative seeds wrap to their 64-bit two's complement
+    entropy = seed if seed >= 0 else seed & (2**64 - 1)
+    return int(np.random.SeedSequence([entropy, offset]).generate_state(1, dtype=np.uint64)[0])
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can pool connections
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are dropped after this many seconds
+    timeout = 30
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        server.count_request()
+
+        if self.path.rstrip("/") != server.prefix + SEARCH_PATH:
+            return self._send(404, {"error": "not found"})
+        delay = server.delay + (random.uniform(0, server.jitter) if server.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            server.count_error()
+            headers = {"Retry-After": server.retry_after} if server.retry_after is not None else {}
+            return self._send(server.error_status, {"error": "injected failure"}, headers)
+
+        try:
+            request = json.loads(body)
+            criteria = [request.get(field) for field in CRITERIA_FIELDS]
+            offset, count = int(request.get("offset", 0)), int(request["count"])
+        except (ValueError, KeyError, TypeError) as error:
+            return self._send(400, {"error": f"invalid request: {error}"})
+        if not criteria[2] or count < 0 or count > server.max_count:
+            return self._send(400, {"error": f"industry is required and count must be 0-{server.max_count}"})
+
+        prospects = generate_linkedin_prospects(*criteria, count=count, seed=batch_seed(request.get("seed"), offset))
+        self._send(200, {"prospects": prospects})
+
+    def _send(self, status, payload, headers=None):
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class MockProspectServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering prospect searches from the mock generator.
+
+    Usable as a context manager, which serves from a background thread.
+
+    Parameters:
+    - host, port: Address to listen on (port 0 picks a free one; see `url`)
+    - delay: Seconds added to every response
+    - jitter: Up to this many extra seconds, drawn uniformly per response
+    - error_rate: Fraction of requests answered with `error_status` instead
+    - error_status: Status of injected failures (e.g. 503, or 429 for rate limiting)
+    - retry_after: Retry-After header sent with injected failures (None to omit it)
+    - max_count: Largest batch a request may ask for
+    - prefix: Path prefix the endpoint is served under
+    - verbose: Log every request
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 retry_after=None, max_count=10_000, prefix="", verbose=False):
+        super().__init__((host, port), _Handler)
+        self.delay = delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.max_count = max_count
+        self.prefix = prefix.rstrip("/")
+        self.verbose = verbose
+        self.requests = 0
+        self.errors = 0
+        self._counter_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+    def count_request(self):
+        with self._counter_lock:
+            self.requests += 1
+
+    def count_error(self):
+        with self._counter_lock:
+            self.errors += 1
+
+    def start(self):
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-prospect-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+def run_bench(server, count, batch_size, concurrency, rate, retries, seed):
+    """Fetch `count` prospects from a running server and return a report dict"""
+    source = HTTPProspectSource(
+        server.url, batch_size=batch_size, max_concurrency=concurrency, rate=rate, retries=retries
+    )
+    try:
+        start = time.perf_counter()
+        prospects = source.fetch_sync(
+            "San Francisco", "Decision Makers", "Technology & Software", count=count, seed=seed
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        source.close()
+    return {
+        "prospects": len(prospects),
+        "seconds": elapsed,
+        "prospects_per_second": len(prospects) / elapsed if elapsed > 0 else None,
+        "requests_per_second": source.requests / elapsed if elapsed > 0 else None,
+        "server_requests": server.requests,
+        "server_errors": server.errors,
+        **source.stats(),
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve mock prospects over HTTP, or benchmark a source against it.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765, 0 for any)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed on purpose")
+    parser.add_argument("--error-status", type=int, default=503, help="Status of injected failures (default: 503)")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with injected failures")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    parser.add_argument("--bench", action="store_true", help="Benchmark HTTPProspectSource against the server")
+    parser.add_argument("--count", type=int, default=10_000, help="Prospects fetched by --bench")
+    parser.add_argument("--batch-size", type=int, default=500, help="Prospects per request in --bench")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight in --bench")
+    parser.add_argument("--rate", type=float, help="Requests per second allowed in --bench")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per request in --bench")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible --bench output")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not 0 <= args.error_rate <= 1 or args.delay < 0 or args.jitter < 0:
+        parser.error("--error-rate must be between 0 and 1, --delay and --jitter non-negative")
+
+    server = MockProspectServer(
+        args.host, 0 if args.bench else args.port, args.delay, args.jitter, args.error_rate, args.error_status,
+        args.retry_after, verbose=args.verbose
+    )
+    if args.bench:
+        with server:
+            report = run_bench(server, args.count, args.batch_size, args.concurrency, args.rate, args.retries,
+                               args.seed)
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Serving mock prospects at {server.url}{SEARCH_PATH}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Incremental prospect generation as a graph of memoized stages.
+
+Each stage declares the criteria it reads and the stages it builds on, and
+draws from its own random stream derived from the base seed and its name. A
+stage's result is cached under its criteria and the cache keys of its inputs,
+so changing one criterion only recomputes the stages downstream of it:
+
+    names        <- count, seed, unique
+    companies    <- industry, industry_focus, seed
+    titles       <- industry, target_role
+    templates    <- industry, industry_focus, target_role
+    assignments  <- companies, titles, count, seed, oversample (scored against the criteria)
+    openings     <- templates, count, seed
+    batch        <- every stage above, location
+
+Refining only the target role, for example, reuses the names and companies.
+The batch stage only assembles the others and is not memoized: the batches it
+returns belong to the caller (the result store), which accounts for and evicts
+them, so the pipeline's cache holds stage inputs only.
+The stream layout differs from generate_linkedin_prospects, so a seed gives
+different (but equally reproducible) prospects here.
+"""
+import random
+import sys
+
+import numpy as np
+
+from cache import ProspectCache
+from catalog import FIRST_NAMES, LAST_NAMES
+from metrics import metrics
+from prospects import ProspectBatch
+from sampling import UniqueNameSampler
+from scoring import score_candidates, top_k
+from templates import email_template_ids, follow_up_template_ids
+from utils import generate_companies_for_industry, generate_job_titles
+
+class Stage:
+    """
+    One memoized step of the pipeline.
+
+    Parameters:
+    - name: Stage name, also used to derive its random stream
+    - criteria: Criteria the stage reads
+    - inputs: Names of the stages it builds on
+    - compute: Function(criteria dict, inputs dict, stage seed) returning the stage value
+    - memoize: Keep the stage's results in the pipeline cache
+    """
+
+    __slots__ = ("name", "criteria", "inputs", "compute", "memoize")
+
+    def __init__(self, name, criteria, inputs, compute, memoize=True):
+        self.name = name
+        self.criteria = criteria
+        self.inputs = inputs
+        self.compute = compute
+        self.memoize = memoize
+
+def _stage_seed(seed, name):
+    """Derive a stage's seed from the base seed and the stage name"""
+    # SeedSequence rejects negative entropy, so negative seeds wrap to their 64-bit two's complement
+    entropy = seed if seed >= 0 else seed & (2**64 - 1)
+    return np.random.SeedSequence([entropy, *name.encode("utf-8")]).generate_state(2, dtype=np.uint64)
+
+def _names(criteria, inputs, seed):
+    count = criteria["count"]
+    if criteria["unique"]:
+        sampler = UniqueNameSampler(len(FIRST_NAMES), len(LAST_NAMES), seed=int(seed[0]))
+        return sampler.draw(count)
+    rng = np.random.default_rng(seed)
+    return rng.integers(len(FIRST_NAMES), size=count), rng.integers(len(LAST_NAMES), size=count), None
+
+def _companies(criteria, inputs, seed):
+    rng = random.Random(int(seed[0]))
+    return tuple(generate_companies_for_industry(criteria["industry"], criteria["industry_focus"], rng))
+
+def _titles(criteria, inputs, seed):
+    return tuple(generate_job_titles(criteria["industry"], criteria["target_role"]))
+
+def _templates(criteria, inputs, seed):
+    industry, focus, role = criteria["industry"], criteria["industry_focus"], criteria["target_role"]
+    return email_template_ids(industry, focus, role), follow_up_template_ids(industry, focus, role)
+
+def _assignments(criteria, inputs, seed):
+    companies, titles = inputs["companies"], inputs["titles"]
+    count, oversample = criteria["count"], criteria["oversample"]
+    rng = np.random.default_rng(seed)
+    if not oversample:
+        return rng.integers(len(companies), size=count), rng.integers(len(titles), size=count), None
+    company_idx = rng.integers(len(companies), size=count * oversample)
+    title_idx = rng.integers(len(titles), size=count * oversample)
+    scores = score_candidates(
+        company_idx, title_idx, companies, titles,
+        criteria["industry"], criteria["industry_focus"], criteria["target_role"]
+    )
+    best = top_k(scores, count)
+    return company_idx[best], title_idx[best], np.round(scores[best], 4)
+
+def _openings(criteria, inputs, seed):
+    email_ids, _ = inputs["templates"]
+    return np.random.default_rng(seed).integers(len(email_ids), size=criteria["count"])
+
+def _batch(criteria, inputs, seed):
+    first_idx, last_idx, suffixes = inputs["names"]
+    company_idx, title_idx, scores = inputs["assignments"]
+    email_ids, follow_up_ids = inputs["templates"]
+    return ProspectBatch.from_draws(
+        criteria["location"], FIRST_NAMES, LAST_NAMES, first_idx, last_idx, suffixes,
+        inputs["companies"], company_idx, inputs["titles"], title_idx, email_ids, inputs["openings"],
+        follow_up_ids, scores
+    )
+
+STAGES = {
+    stage.name: stage for stage in (
+        Stage("names", ("count", "seed", "unique"), (), _names),
+        Stage("companies", ("industry", "industry_focus", "seed"), (), _companies),
+        Stage("titles", ("industry", "target_role"), (), _titles),
+        Stage("templates", ("industry", "industry_focus", "target_role"), (), _templates),
+        Stage(
+            "assignments", ("industry", "industry_focus", "target_role", "count", "seed", "oversample"),
+            ("companies", "titles"), _assignments
+        ),
+        Stage("openings", ("count", "seed"), ("templates",), _openings),
+        Stage(
+            "batch", ("location",), ("names", "companies", "titles", "templates", "assignments", "openings"),
+            _batch, memoize=False
+        ),
+    )
+}
+
+def _value_size(value):
+    """Approximate bytes of a stage value (arrays, tuples of arrays, or small objects)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_value_size(item) for item in value)
+    return sys.getsizeof(value)
+
+_MISSING = object()
+
+class ProspectPipeline:
+    """
+    Runs the stage graph, memoizing each stage's result.
+
+    Parameters:
+    - cache: ProspectCache holding stage results (defaults to a private one)
+    - seed: Base seed used by runs without a seed of their own (random if omitted)
+    """
+
+    def __init__(self, cache=None, seed=None):
+        self.cache = cache if cache is not None else ProspectCache(
+            max_entries=512, max_bytes=256 * 1024 * 1024, ttl=None
+        )
+        self.seed = seed if seed is not None else random.getrandbits(64)
+
+    def run(self, location, demographic, industry, industry_focus=None, target_role=None, count=5, seed=None,
+            unique=False, oversample=None, computed=None):
+        """
+        Return a ProspectBatch for these criteria, recomputing only the stages whose inputs changed.
+
+        Parameters:
+        - location, demographic, industry, industry_focus, target_role, count, oversample: Same as
+          generate_linkedin_prospects
+        - seed: Base seed for every stage (defaults to the pipeline's seed)
+        - unique: Never repeat a profile URL
+        - computed: Optional list that receives the names of the stages that were recomputed
+        """
+        criteria = {
+            "location": location,
+            "demographic": demographic,
+            "industry": industry,
+            "industry_focus": industry_focus or None,
+            "target_role": target_role or None,
+            "count": int(count),
+            "seed": self.seed if seed is None else seed,
+            "unique": bool(unique),
+            "oversample": oversample or None,
+        }
+        value, _ = self._resolve("batch", criteria, {}, computed)
+        return value
+
+    def _resolve(self, name, criteria, resolved, computed):
+        """Return (value, cache key) of a stage, resolving its inputs first"""
+        if name in resolved:
+            return resolved[name]
+        stage = STAGES[name]
+        inputs, input_keys = {}, []
+        for input_name in stage.inputs:
+            inputs[input_name], input_key = self._resolve(input_name, criteria, resolved, computed)
+            input_keys.append(input_key)
+        key = (name, tuple(criteria[c] for c in stage.criteria), tuple(input_keys))
+
+        value = self.cache.get(key, _MISSING) if stage.memoize else _MISSING
+        if value is _MISSING:
+            with metrics.stage(f"pipeline.{name}"):
+                value = stage.compute(
+                    {c: criteria[c] for c in stage.criteria}, inputs, _stage_seed(criteria["seed"], name)
+                )
+            if stage.memoize:
+                self.cache.put(key, value, _value_size(value))
+            if computed is not None:
+                computed.append(name)
+        resolved[name] = value, key
+        return resolved[name]
+
+# Process-wide pipeline shared by every session
+prospect_pipeline = ProspectPipeline()
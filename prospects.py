@@ -0,0 +1,388 @@
+"""
+Columnar storage for generated prospects.
+
+A ProspectBatch keeps every categorical field as a small-int code column into a
+shared, interned pool (names, companies, titles, email openings), the location
+once per batch, and the follow-up template ids once per batch. A row costs a
+handful of bytes; Prospect is a two-slot view that assembles names and URLs
+and renders templates only when a field is read.
+"""
+import sys
+from collections.abc import Mapping
+
+import numpy as np
+
+from templates import render
+
+# Keys of every prospect record, in output order
+PROSPECT_FIELDS = (
+    "name", "title", "company", "location", "profile_url", "email_template", "follow_up_templates"
+)
+# Extra key present on prospects selected by relevance (see `oversample`)
+SCORE_FIELD = "relevance_score"
+
+# Fields ProspectBatch.column can gather for every row at once
+TEXT_COLUMNS = ("first_name", "last_name", "name", "title", "company", "location", "profile_url")
+
+def _slug(text):
+    """Lower-case a name and join its words with hyphens for a profile URL"""
+    return "-".join(text.lower().split())
+
+def profile_url(first_name, last_name, suffix=0):
+    """Return the profile URL of a name, with a disambiguating suffix for repeated names"""
+    url = f"https://linkedin.com/in/{_slug(first_name)}-{_slug(last_name)}"
+    return f"{url}-{suffix}" if suffix else url
+
+def _code_dtype(size):
+    """Return the smallest unsigned integer type that can index a pool of `size` values"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+def _categorical(pool, codes):
+    """Deduplicate and intern a pool of strings, remapping `codes` into the new pool"""
+    interned = {}
+    remap = np.array([interned.setdefault(sys.intern(value), len(interned)) for value in pool], dtype=np.int64)
+    return tuple(interned), remap[codes].astype(_code_dtype(len(interned)))
+
+def _gather(pool, codes):
+    """Return the pool values at an array of codes"""
+    if hasattr(pool, "take"):
+        # Memory-mapped corpora decode only the drawn entries
+        return pool.take(codes)
+    return np.asarray(pool, dtype=object)[codes].tolist()
+
+class ProspectBatch:
+    """
+    A batch of prospects stored as code columns into shared pools.
+
+    Parameters:
+    - location: Location shared by every row
+    - first_names, last_names: Name pools (tuples or corpus.Corpus)
+    - first_codes, last_codes: Name codes of every row
+    - suffixes: Profile URL suffix of every row, or None when no name repeats
+    - companies, titles: Interned company and title pools
+    - company_codes, title_codes: Company and title codes of every row
+    - email_ids: Compiled email template ids, one per opening line
+    - email_codes: Email template code of every row
+    - follow_up_ids: Mapping of scenario -> follow-up template id, shared by every row
+    - relevance_scores: Relevance score of every row, or None when not scored
+    """
+
+    __slots__ = (
+        "location", "first_names", "last_names", "first_codes", "last_codes", "suffixes",
+        "companies", "company_codes", "titles", "title_codes", "email_ids", "email_codes",
+        "follow_up_ids", "relevance_scores"
+    )
+
+    def __init__(self, location, first_names, last_names, first_codes, last_codes, suffixes, companies,
+                 company_codes, titles, title_codes, email_ids, email_codes, follow_up_ids,
+                 relevance_scores=None):
+        self.location = location
+        self.first_names = first_names
+        self.last_names = last_names
+        self.first_codes = first_codes
+        self.last_codes = last_codes
+        self.suffixes = suffixes
+        self.companies = companies
+        self.company_codes = company_codes
+        self.titles = titles
+        self.title_codes = title_codes
+        self.email_ids = email_ids
+        self.email_codes = email_codes
+        self.follow_up_ids = follow_up_ids
+        self.relevance_scores = relevance_scores
+
+    @classmethod
+    def from_draws(cls, location, first_names, last_names, first_idx, last_idx, suffixes, companies, company_idx,
+                   titles, title_idx, email_ids, opening_idx, follow_up_ids, relevance_scores=None):
+        """Build a batch from drawn index arrays, narrowing codes and interning the pools"""
+        companies, company_codes = _categorical(companies, company_idx)
+        titles, title_codes = _categorical(titles, title_idx)
+        if suffixes is not None and not suffixes.any():
+            suffixes = None
+        return cls(
+            sys.intern(location) if isinstance(location, str) else location,
+            first_names, last_names,
+            np.asarray(first_idx).astype(_code_dtype(len(first_names))),
+            np.asarray(last_idx).astype(_code_dtype(len(last_names))),
+            None if suffixes is None else suffixes.astype(np.uint32),
+            companies, company_codes, titles, title_codes,
+            tuple(email_ids), np.asarray(opening_idx).astype(_code_dtype(len(email_ids))), follow_up_ids,
+            None if relevance_scores is None else np.asarray(relevance_scores, dtype=np.float64)
+        )
+
+    @classmethod
+    def concat(cls, batches):
+        """Join batches that share their pools (e.g. the chunks of one generation run) into one batch"""
+        first = batches[0]
+        pools = ("first_names", "last_names", "companies", "titles", "email_ids", "follow_up_ids", "location")
+        for batch in batches[1:]:
+            for name in pools:
+                mine, theirs = getattr(first, name), getattr(batch, name)
+                # Tuples and dicts are compared by value; corpora must be the same object
+                if mine is not theirs and not (isinstance(mine, (tuple, dict, str)) and mine == theirs):
+                    raise ValueError(f"batches do not share their {name}")
+        if len({batch.relevance_scores is None for batch in batches}) > 1:
+            raise ValueError("cannot join scored and unscored batches")
+
+        def joined(name):
+            return np.concatenate([getattr(batch, name) for batch in batches])
+
+        suffixes = None
+        if any(batch.suffixes is not None for batch in batches):
+            # Chunks without repeated names carry no suffix column
+            suffixes = np.concatenate([
+                np.zeros(len(batch), dtype=np.uint32) if batch.suffixes is None else batch.suffixes
+                for batch in batches
+            ])
+        return cls(
+            first.location, first.first_names, first.last_names, joined("first_codes"), joined("last_codes"),
+            suffixes, first.companies, joined("company_codes"), first.titles, joined("title_codes"),
+            first.email_ids, joined("email_codes"), first.follow_up_ids,
+            None if first.relevance_scores is None else joined("relevance_scores")
+        )
+
+    def __len__(self):
+        return len(self.first_codes)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return self.take(np.arange(*row.indices(len(self))))
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("prospect index out of range")
+        return Prospect(self, row)
+
+    def __iter__(self):
+        return (Prospect(self, row) for row in range(len(self)))
+
+    def take(self, rows):
+        """Return a new batch holding the given rows; pools are shared, not copied"""
+        rows = np.asarray(rows, dtype=np.int64)
+        return ProspectBatch(
+            self.location, self.first_names, self.last_names, self.first_codes[rows], self.last_codes[rows],
+            None if self.suffixes is None else self.suffixes[rows],
+            self.companies, self.company_codes[rows], self.titles, self.title_codes[rows],
+            self.email_ids, self.email_codes[rows], self.follow_up_ids,
+            None if self.relevance_scores is None else self.relevance_scores[rows]
+        )
+
+    def column(self, field):
+        """Return one of TEXT_COLUMNS (or relevance_score) for every row as a list"""
+        if field == "title":
+            return _gather(self.titles, self.title_codes)
+        if field == "company":
+            return _gather(self.companies, self.company_codes)
+        if field == "location":
+            return [self.location] * len(self)
+        if field == SCORE_FIELD:
+            return None if self.relevance_scores is None else self.relevance_scores.tolist()
+        firsts = _gather(self.first_names, self.first_codes)
+        if field == "first_name":
+            return firsts
+        lasts = _gather(self.last_names, self.last_codes)
+        if field == "last_name":
+            return lasts
+        if field == "name":
+            return [f"{f} {l}" for f, l in zip(firsts, lasts)]
+        if field == "profile_url":
+            suffixes = [0] * len(self) if self.suffixes is None else self.suffixes.tolist()
+            return [profile_url(f, l, s) for f, l, s in zip(firsts, lasts, suffixes)]
+        raise KeyError(field)
+
+    def factorize(self, field):
+        """
+        Return (inverse, values) for one of "name", "title", "company" or "location".
+
+        Row r holds values[inverse[r]]; values are read from the pools only for the
+        distinct codes (or first/last name code pairs) present in the batch.
+        """
+        if field == "location":
+            return np.zeros(len(self), dtype=np.int64), [self.location]
+        if field == "name":
+            n_last = len(self.last_names)
+            keys = self.first_codes.astype(np.int64) * n_last + self.last_codes
+            unique, inverse = np.unique(keys, return_inverse=True)
+            firsts = _gather(self.first_names, unique // n_last)
+            lasts = _gather(self.last_names, unique % n_last)
+            return inverse.reshape(-1), [f"{f} {l}" for f, l in zip(firsts, lasts)]
+        if field == "title":
+            pool, codes = self.titles, self.title_codes
+        elif field == "company":
+            pool, codes = self.companies, self.company_codes
+        else:
+            raise KeyError(field)
+        unique, inverse = np.unique(codes, return_inverse=True)
+        return inverse.reshape(-1), _gather(pool, unique)
+
+    def rendered_templates(self):
+        """
+        Return (email templates, follow-up template dicts) for every row.
+
+        Emails depend on (opening, first name, company, title) and follow-ups on
+        (first name, company), so each distinct combination is rendered once.
+        """
+        if not len(self):
+            return [], []
+        first_names = _gather(self.first_names, self.first_codes)
+        first_codes = np.unique(self.first_codes.astype(np.int64), return_inverse=True)[1].reshape(-1)
+        n_first, n_companies, n_titles = int(first_codes.max()) + 1, len(self.companies), len(self.titles)
+        company_codes = self.company_codes.astype(np.int64)
+
+        email_key = ((self.email_codes.astype(np.int64) * n_titles + self.title_codes) * n_companies
+                     + company_codes) * n_first + first_codes
+        unique_keys, rows, inverse = np.unique(email_key, return_index=True, return_inverse=True)
+        emails = [
+            render(self.email_ids[self.email_codes[row]], {
+                "first_name": first_names[row].split()[0],
+                "company": self.companies[self.company_codes[row]],
+                "title": self.titles[self.title_codes[row]],
+            })
+            for row in rows.tolist()
+        ]
+        emails = np.array(emails, dtype=object)[inverse.reshape(-1)].tolist()
+
+        unique_keys, rows, inverse = np.unique(company_codes * n_first + first_codes, return_index=True,
+                                               return_inverse=True)
+        follow_ups = []
+        for row in rows.tolist():
+            values = {"first_name": first_names[row].split()[0], "company": self.companies[self.company_codes[row]]}
+            follow_ups.append({
+                scenario: render(template_id, values) for scenario, template_id in self.follow_up_ids.items()
+            })
+        follow_ups = np.array(follow_ups, dtype=object)[inverse.reshape(-1)].tolist()
+        return emails, follow_ups
+
+    def to_dicts(self):
+        """Return the batch as the classic list of fully rendered prospect dicts"""
+        return [prospect.to_dict() for prospect in self]
+
+    def to_dataframe(self, rendered=False):
+        """
+        Return the batch as a pandas DataFrame.
+
+        Coded fields become Categorical columns built from the code arrays and the
+        shared pools, so no per-row strings are created. With `rendered`, the
+        name, profile URL and template columns are added as strings.
+        """
+        import pandas as pd
+
+        def categorical(pool, codes):
+            if hasattr(pool, "take"):
+                return pd.Categorical(pool.take(codes))
+            return pd.Categorical.from_codes(codes, categories=pd.Index(pool, dtype=object))
+
+        data = {
+            "first_name": categorical(self.first_names, self.first_codes),
+            "last_name": categorical(self.last_names, self.last_codes),
+            "title": categorical(self.titles, self.title_codes),
+            "company": categorical(self.companies, self.company_codes),
+            "location": pd.Categorical.from_codes(
+                np.zeros(len(self), dtype=np.int8), categories=pd.Index([self.location], dtype=object)
+            ),
+        }
+        if self.suffixes is not None:
+            data["suffix"] = self.suffixes
+        if self.relevance_scores is not None:
+            data[SCORE_FIELD] = self.relevance_scores
+        if rendered:
+            data["name"] = self.column("name")
+            data["profile_url"] = self.column("profile_url")
+            data["email_template"] = [prospect["email_template"] for prospect in self]
+            follow_ups = [prospect["follow_up_templates"] for prospect in self]
+            for scenario in self.follow_up_ids:
+                data[f"follow_up_{scenario}"] = [templates[scenario] for templates in follow_ups]
+        return pd.DataFrame(data, copy=False)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the code columns (pools are shared and excluded)"""
+        columns = (
+            self.first_codes, self.last_codes, self.suffixes, self.company_codes, self.title_codes,
+            self.email_codes, self.relevance_scores
+        )
+        return sum(column.nbytes for column in columns if column is not None)
+
+class Prospect(Mapping):
+    """
+    A read-only view of one row of a ProspectBatch.
+
+    Reads like the usual prospect dict; every field is assembled from the
+    batch's columns when it is accessed.
+    """
+
+    __slots__ = ("batch", "row")
+
+    def __init__(self, batch, row):
+        self.batch = batch
+        self.row = row
+
+    @property
+    def first_name(self):
+        return self.batch.first_names[int(self.batch.first_codes[self.row])]
+
+    @property
+    def last_name(self):
+        return self.batch.last_names[int(self.batch.last_codes[self.row])]
+
+    @property
+    def name(self):
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def title(self):
+        return self.batch.titles[self.batch.title_codes[self.row]]
+
+    @property
+    def company(self):
+        return self.batch.companies[self.batch.company_codes[self.row]]
+
+    @property
+    def location(self):
+        return self.batch.location
+
+    @property
+    def profile_url(self):
+        suffixes = self.batch.suffixes
+        return profile_url(self.first_name, self.last_name, 0 if suffixes is None else int(suffixes[self.row]))
+
+    @property
+    def relevance_score(self):
+        scores = self.batch.relevance_scores
+        return None if scores is None else float(scores[self.row])
+
+    def _slot_values(self):
+        return {"first_name": self.first_name.split()[0], "company": self.company, "title": self.title}
+
+    @property
+    def email_template(self):
+        return render(self.batch.email_ids[self.batch.email_codes[self.row]], self._slot_values())
+
+    @property
+    def follow_up_templates(self):
+        values = self._slot_values()
+        return {
+            scenario: render(template_id, values)
+            for scenario, template_id in self.batch.follow_up_ids.items()
+        }
+
+    def _fields(self):
+        return PROSPECT_FIELDS if self.batch.relevance_scores is None else PROSPECT_FIELDS + (SCORE_FIELD,)
+
+    def __getitem__(self, key):
+        if key in self._fields():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._fields())
+
+    def __len__(self):
+        return len(self._fields())
+
+    def to_dict(self):
+        """Return a plain prospect dict with all templates rendered"""
+        return {key: self[key] for key in self._fields()}
@@ -0,0 +1,241 @@
+"""
+Memory-mapped, on-disk result sets.
+
+A result file holds a fixed header, a JSON metadata block, the string pools
+(offsets plus a UTF-8 blob, as in corpus files) and one fixed-width column per
+ProspectBatch code array, every section aligned to 8 bytes. Generation writes
+chunk by chunk straight into the mapped file, and opening one only maps it:
+the returned ProspectBatch's columns are zero-copy views, so a page of rows is
+read from disk only when it is accessed.
+
+Prospects from a ProspectSource carry their own text, so they cannot be coded
+against the template catalog; a record file stores them one JSON object per
+line instead, and a RecordFile decodes each row only when it is read.
+"""
+import itertools
+import json
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+
+import numpy as np
+
+from corpus import Corpus
+from prospects import ProspectBatch
+from templates import email_template_ids, follow_up_template_ids
+from utils import DEFAULT_CHUNK_SIZE, iter_linkedin_prospects
+
+MAGIC = b"PRSPRES1"
+# magic, number of rows, metadata size in bytes
+HEADER = struct.Struct("<8sQQ")
+
+# Pools stored as string tables, and the code columns that index them
+STRING_POOLS = ("first_names", "last_names", "companies", "titles")
+CODE_COLUMNS = ("first_codes", "last_codes", "company_codes", "title_codes", "email_codes")
+
+# Pools up to this size are decoded into tuples on open; larger ones stay mapped
+DECODE_POOL_LIMIT = 65_536
+
+def _aligned(position):
+    return (position + 7) // 8 * 8
+
+def _string_table(pool):
+    """Return the (offsets, blob) arrays of a pool of strings"""
+    corpus = pool if isinstance(pool, Corpus) else Corpus.from_items(pool)
+    return np.asarray(corpus.offsets, dtype="<u8"), np.asarray(corpus.blob, dtype=np.uint8)
+
+def write_result_file(path, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                      seed=None, unique=False, vocabulary=None, oversample=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                      progress=None):
+    """
+    Generate prospects straight into a memory-mapped result file and open it.
+
+    Rows are generated `chunk_size` at a time and copied into the mapped
+    columns, so memory stays flat however large `count` is. The file is written
+    next to `path` and moved into place once complete.
+
+    Parameters:
+    - path: Destination file
+    - location, demographic, industry, industry_focus, target_role, count, seed, unique, vocabulary,
+      oversample: Same as generate_linkedin_prospects
+    - chunk_size: Number of prospects generated per step
+    - progress: Optional function(chunk, rows written) called after each chunk; an exception raised
+      from it aborts the write and removes the partial file
+    """
+    if count <= 0:
+        raise ValueError("count must be a positive integer")
+    chunks = iter_linkedin_prospects(
+        location, demographic, industry, industry_focus, target_role, count=count, chunk_size=chunk_size,
+        seed=seed, unique=unique, vocabulary=vocabulary, oversample=oversample, columnar=True
+    )
+    first = next(chunks)
+
+    # Code widths only depend on pool sizes, so the first chunk fixes the layout for every row
+    columns = {name: getattr(first, name).dtype.newbyteorder("<").str for name in CODE_COLUMNS}
+    if unique:
+        columns["suffixes"] = "<u4"
+    if oversample:
+        columns["relevance_scores"] = "<f8"
+    tables = {name: _string_table(getattr(first, name)) for name in STRING_POOLS}
+
+    metadata = {
+        "location": location,
+        "industry": industry,
+        "industry_focus": industry_focus,
+        "target_role": target_role,
+        "email_templates": len(first.email_ids),
+        "strings": {},
+        "columns": {},
+    }
+    # Metadata holds the offsets of every section, so lay them out before encoding it
+    position = 0
+    for name, (offsets, blob) in tables.items():
+        metadata["strings"][name] = [len(offsets) - 1, position, position + offsets.nbytes, blob.nbytes]
+        position = _aligned(position + offsets.nbytes + blob.nbytes)
+    for name, dtype in columns.items():
+        metadata["columns"][name] = [dtype, position]
+        position = _aligned(position + count * np.dtype(dtype).itemsize)
+    metadata["size"] = position
+    encoded = json.dumps(metadata).encode("utf-8")
+    data_start = _aligned(HEADER.size + len(encoded))
+
+    descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(descriptor, "wb") as f:
+        f.write(HEADER.pack(MAGIC, count, len(encoded)))
+        f.write(encoded)
+        f.truncate(data_start + position)
+
+    try:
+        data = np.memmap(temporary, dtype=np.uint8, mode="r+")
+        for name, (offsets, blob) in tables.items():
+            _, offsets_at, blob_at, _ = metadata["strings"][name]
+            data[data_start + offsets_at:data_start + blob_at] = offsets.view(np.uint8)
+            data[data_start + blob_at:data_start + blob_at + blob.nbytes] = blob
+        targets = {
+            name: data[data_start + at:data_start + at + count * np.dtype(dtype).itemsize].view(dtype)
+            for name, (dtype, at) in metadata["columns"].items()
+        }
+
+        start = 0
+        for chunk in itertools.chain([first], chunks):
+            end = start + len(chunk)
+            for name, target in targets.items():
+                values = getattr(chunk, name)
+                # Chunks without repeated names carry no suffix column
+                target[start:end] = 0 if values is None else values
+            start = end
+            if progress is not None:
+                progress(chunk, end)
+        data.flush()
+        del data, targets
+    except BaseException:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+    return open_result_file(path)
+
+def open_result_file(path):
+    """
+    Map a result file written by write_result_file as a ProspectBatch.
+
+    Code columns are read-only views into the mapping; nothing is read until
+    rows are accessed.
+    """
+    with open(path, "rb") as f:
+        magic, count, metadata_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a prospect result file")
+        metadata = json.loads(f.read(metadata_size))
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    data_start = _aligned(HEADER.size + metadata_size)
+    if len(data) != data_start + metadata["size"]:
+        raise ValueError(f"{path} is truncated or corrupt")
+
+    pools = {}
+    for name, (size, offsets_at, blob_at, blob_size) in metadata["strings"].items():
+        offsets = data[data_start + offsets_at:data_start + blob_at].view("<u8")
+        corpus = Corpus(offsets, data[data_start + blob_at:data_start + blob_at + blob_size], None)
+        pools[name] = tuple(corpus.take(np.arange(size))) if size <= DECODE_POOL_LIMIT else corpus
+    columns = {}
+    for name, (dtype, at) in metadata["columns"].items():
+        columns[name] = data[data_start + at:data_start + at + count * np.dtype(dtype).itemsize].view(dtype)
+
+    # Template ids are assigned per process, so they are looked up again from the criteria
+    criteria = metadata["industry"], metadata["industry_focus"], metadata["target_role"]
+    email_ids = email_template_ids(*criteria)
+    if len(email_ids) != metadata["email_templates"]:
+        raise ValueError(f"{path} was written with a different template catalog")
+    return ProspectBatch(
+        metadata["location"], pools["first_names"], pools["last_names"], columns["first_codes"],
+        columns["last_codes"], columns.get("suffixes"), pools["companies"], columns["company_codes"],
+        pools["titles"], columns["title_codes"], email_ids, columns["email_codes"],
+        follow_up_template_ids(*criteria), columns.get("relevance_scores")
+    )
+
+class RecordFile(Sequence):
+    """
+    Prospect records stored one JSON object per line, decoded when accessed.
+
+    Parameters:
+    - path: File written by write_record_file
+    - offsets: uint64 array of len(records) + 1 line start offsets
+    """
+
+    def __init__(self, path, offsets):
+        self.path = path
+        self.offsets = offsets
+        self._data = np.memmap(path, dtype=np.uint8, mode="r") if offsets[-1] else np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _decode(self, row):
+        return json.loads(self._data[self.offsets[row]:self.offsets[row + 1]].tobytes())
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self._decode(i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("prospect index out of range")
+        return self._decode(row)
+
+    def __iter__(self):
+        return (self._decode(row) for row in range(len(self)))
+
+    def columns(self, fields):
+        """Return {field: list of values} for every row, decoding each row once"""
+        values = {field: [] for field in fields}
+        for record in self:
+            for field, column in values.items():
+                column.append(record[field])
+        return values
+
+    @property
+    def nbytes(self):
+        """Bytes held in memory (the records themselves stay on disk)"""
+        return self.offsets.nbytes
+
+def write_record_file(path, records):
+    """
+    Write prospect records to a record file and open it.
+
+    The file is written next to `path` and moved into place once complete.
+    """
+    offsets = np.zeros(len(records) + 1, dtype=np.uint64)
+    descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            position = 0
+            for row, record in enumerate(records):
+                line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+                f.write(line)
+                position += len(line)
+                offsets[row + 1] = position
+    except BaseException:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+    return RecordFile(path, offsets)
@@ -0,0 +1,257 @@
+"""
+Process-wide store of immutable prospect result sets.
+
+Result sets are deduplicated by criteria, count, seed and oversampling and shared by every
+Streamlit session. A session only keeps a small ResultHandle; the store tracks
+live handles through weak references, so an entry is only evicted once no
+session holds a handle to it, and every handle keeps its result set alive.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from cache import cache_key, estimate_size
+from history import SavedProspects
+from metrics import metrics
+from pipeline import prospect_pipeline
+from prospects import ProspectBatch
+from result_file import RecordFile, open_result_file, write_record_file, write_result_file
+from search import ProspectIndex
+from sources import source_from_environment
+
+class ResultSet:
+    """An immutable, shared set of generated prospects, its search index and the key it was generated for"""
+
+    __slots__ = ("key", "prospects", "size", "index", "path", "expires_at")
+
+    def __init__(self, key, prospects, size, index=None, path=None, expires_at=None):
+        self.key = key
+        # Columnar batches, record files and saved searches are shared as they are; lists are frozen into tuples
+        shared = isinstance(prospects, (ProspectBatch, RecordFile, SavedProspects))
+        self.prospects = prospects if shared else tuple(prospects)
+        self.size = size
+        self.index = index
+        self.path = path
+        self.expires_at = expires_at
+
+    def __len__(self):
+        return len(self.prospects)
+
+class ResultHandle:
+    """A lightweight reference to a shared ResultSet, held in a session"""
+
+    __slots__ = ("result_set", "__weakref__")
+
+    def __init__(self, result_set):
+        self.result_set = result_set
+
+    @property
+    def key(self):
+        return self.result_set.key
+
+    @property
+    def prospects(self):
+        return self.result_set.prospects
+
+    @property
+    def index(self):
+        return self.result_set.index
+
+class ResultStore:
+    """
+    Thread-safe store of shared result sets with a memory cap and a time-to-live.
+
+    When the cap is exceeded, least recently used result sets with no live
+    handles are evicted; result sets still shown by a session are never dropped,
+    so the cap can be exceeded while every entry is in use. Likewise, an expired
+    result set is regenerated on the next request once no handle to it is left.
+
+    Result sets of at least `spill_rows` prospects are generated into a
+    memory-mapped result file instead of memory; only their search index counts
+    toward the cap, and the file is deleted when the set is evicted.
+
+    With a `source`, prospects are fetched from it instead of being generated
+    (the source ranks its own results, so `oversample` is not applied). Fetched
+    sets of at least `spill_rows` prospects are moved into a record file.
+
+    Parameters:
+    - max_bytes: Approximate memory cap for unreferenced result sets
+    - spill_rows: Smallest result set written to disk (None to keep everything in memory)
+    - spill_dir: Directory for result files (defaults to a folder in the system temp directory)
+    - source: sources.ProspectSource to fetch prospects from (None to generate them)
+    - ttl: Seconds a result set stays valid after it is stored (None for no expiry)
+    - clock: Time source, monotonic by default
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, spill_rows=200_000, spill_dir=None, source=None, ttl=3600,
+                 clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.spill_rows = spill_rows
+        self.spill_dir = spill_dir or os.path.join(tempfile.gettempdir(), "prospect-results")
+        self.source = source
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> ResultSet
+        self._handles = {}  # key -> WeakSet of live ResultHandles
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def acquire(self, location, demographic, industry, industry_focus=None, target_role=None, count=5, seed=None,
+                oversample=None, progress=None):
+        """
+        Return a handle to the result set for these criteria, generating it on first use.
+
+        Parameters:
+        - location, demographic, industry, industry_focus, target_role, count, seed, oversample: Same as
+          generate_linkedin_prospects
+        - progress: Optional function(prospects, prospects so far) called as chunks are generated; an
+          exception raised from it aborts generation. Sets below `spill_rows` are generated by the stage
+          pipeline in one step and reported once; larger sets are written to a result file chunk by chunk
+          with iter_linkedin_prospects, whose streams differ from the pipeline's, so a seed's prospects are
+          reproducible for a given count but not shared between the two sides of `spill_rows`
+        """
+        key = cache_key(location, demographic, industry, industry_focus, target_role, count, seed, True) + (oversample,)
+        return self._get_or_build(key, lambda: self._generate(key, count, seed, oversample, progress))
+
+    def load(self, key, loader):
+        """
+        Return a handle to the result set stored under `key`, loading it on first use.
+
+        Parameters:
+        - key: Hashable key of the result set, distinct from generated criteria keys
+        - loader: Callable returning its prospects (e.g. a saved search from the history)
+        """
+        return self._get_or_build(key, lambda: (loader(), None))
+
+    def _get_or_build(self, key, build):
+        with self._lock:
+            result_set = self._entries.get(key)
+            if result_set is not None and not self._handles[key] and self._expired(result_set, self.clock()):
+                self._remove(key)
+                self.expirations += 1
+                result_set = None
+            if result_set is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._new_handle(result_set)
+            self.misses += 1
+
+        # Build outside the lock; if another session raced us, adopt its result set
+        with metrics.stage("store.build"):
+            prospects, path = build()
+        with metrics.stage("store.index"):
+            index = ProspectIndex.build(prospects)
+        # Mapped columns live in the page cache, not in the store's memory
+        size = index.nbytes + (0 if path else estimate_size(prospects))
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        result_set = ResultSet(key, prospects, size, index, path, expires_at)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return self._new_handle(existing)
+            self._entries[key] = result_set
+            self._handles[key] = weakref.WeakSet()
+            self._bytes += result_set.size
+            handle = self._new_handle(result_set)
+            self._evict()
+            return handle
+
+    def _generate(self, key, count, seed, oversample, progress=None):
+        """Generate the prospects of a criteria key, in memory or into a result file; returns (prospects, path)"""
+        if self.source is not None:
+            prospects = self.source.fetch_sync(*key[:5], count=count, seed=seed, progress=progress)
+            if self.spill_rows is None or len(prospects) < self.spill_rows:
+                return prospects, None
+            # Fetched records carry their own text, so they are spilled as JSON lines rather than code columns
+            path = self._spill_path(key)
+            os.makedirs(self.spill_dir, exist_ok=True)
+            return write_record_file(path, prospects), path
+        in_memory = self.spill_rows is None or count < self.spill_rows
+        # The path depends only on the key's count, never on `progress`, so a seeded key always gives the
+        # same prospects whichever caller generated it first
+        if in_memory:
+            # The stage pipeline reuses names, companies and titles across searches that share criteria
+            prospects = prospect_pipeline.run(*key[:5], count=count, seed=seed, oversample=oversample)
+            if progress is not None:
+                progress(prospects, len(prospects))
+            return prospects, None
+        path = self._spill_path(key)
+        if seed is not None and os.path.exists(path):
+            return open_result_file(path), path
+        os.makedirs(self.spill_dir, exist_ok=True)
+        return write_result_file(
+            path, *key[:5], count=count, seed=seed, oversample=oversample, progress=progress
+        ), path
+
+    def _spill_path(self, key):
+        # Seeded result sets are reproducible, so an existing file can be reopened instead of regenerated
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.prospects")
+
+    def _new_handle(self, result_set):
+        handle = ResultHandle(result_set)
+        self._handles[result_set.key].add(handle)
+        return handle
+
+    @staticmethod
+    def _expired(result_set, now):
+        return result_set.expires_at is not None and result_set.expires_at <= now
+
+    def _remove(self, key):
+        result_set = self._entries.pop(key)
+        self._bytes -= result_set.size
+        del self._handles[key]
+        if result_set.path:
+            try:
+                os.remove(result_set.path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        # Drop expired result sets first, then walk from least to most recently used, skipping those still in use
+        now = self.clock()
+        for key in [key for key, result_set in self._entries.items()
+                    if not self._handles[key] and self._expired(result_set, now)]:
+            self._remove(key)
+            self.expirations += 1
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if not self._handles[key]:
+                self._remove(key)
+                self.evictions += 1
+
+    def release(self, handle):
+        """Stop tracking a handle early, making its result set evictable once no others remain"""
+        with self._lock:
+            handles = self._handles.get(handle.key)
+            if handles is not None:
+                handles.discard(handle)
+            self._evict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return a snapshot of the store counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "in_use": sum(1 for handles in self._handles.values() if handles),
+                "bytes": self._bytes,
+            }
+
+# Process-wide store shared by every session, fetching from PROSPECT_SOURCE_URL if it is set
+result_store = ResultStore(source=source_from_environment())
@@ -0,0 +1,132 @@
+"""
+Samplers for drawing prospect names.
+
+UniqueNameSampler walks the (first name x last name) space through a keyed
+bijection, so every draw is a new name without any rejection retries.
+AliasTable draws from frequency-weighted vocabularies in O(1) per draw.
+"""
+import numpy as np
+
+# Number of Feistel rounds used to permute each block of names
+FEISTEL_ROUNDS = 6
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+def _mix(values):
+    """SplitMix64 finalizer applied elementwise to a uint64 array"""
+    z = values ^ (values >> np.uint64(30))
+    z = z * _MIX_1
+    z = z ^ (z >> np.uint64(27))
+    z = z * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+class UniqueNameSampler:
+    """
+    Draw (first, last, suffix) name indices that never repeat, in O(1) per draw.
+
+    Draw number p falls in block p // (n_first * n_last). Within a block, a keyed
+    mixed-radix Feistel network maps the position to a (first, last) pair; each
+    round adds a keyed hash of one half to the other modulo its own size, so the
+    mapping is a bijection without cycle-walking. The first block yields every
+    name once; later blocks repeat names with a disambiguating suffix (the block
+    number), so (name, suffix) pairs - and profile URLs - stay unique.
+
+    Parameters:
+    - n_first, n_last: Sizes of the first and last name pools
+    - seed: Seed for the permutation keys
+    - position: Number of draws to skip, to continue an earlier sampler
+    """
+
+    def __init__(self, n_first, n_last, seed=None, position=0):
+        self.n_first = n_first
+        self.n_last = n_last
+        self.seed = seed
+        self.position = position
+        self._keys = np.random.default_rng(seed).integers(
+            0, np.iinfo(np.uint64).max, size=FEISTEL_ROUNDS, dtype=np.uint64, endpoint=True
+        )
+
+    @property
+    def block_size(self):
+        return self.n_first * self.n_last
+
+    def permute(self, positions):
+        """Map an array of draw positions to (first_idx, last_idx, suffix) arrays"""
+        positions = np.asarray(positions, dtype=np.int64)
+        block, slot = np.divmod(positions, self.block_size)
+        first, last = np.divmod(slot, self.n_last)
+        first = first.astype(np.uint64)
+        last = last.astype(np.uint64)
+        n_first, n_last = np.uint64(self.n_first), np.uint64(self.n_last)
+
+        # Each block gets its own permutation by folding the block number into the keys
+        block_key = _mix(block.astype(np.uint64) * _GOLDEN)
+        for i, key in enumerate(self._keys):
+            if i % 2 == 0:
+                first = (first + _mix(last ^ key ^ block_key) % n_first) % n_first
+            else:
+                last = (last + _mix(first ^ key ^ block_key) % n_last) % n_last
+        return first.astype(np.int64), last.astype(np.int64), block
+
+    def draw(self, count):
+        """Draw the next `count` unique names as (first_idx, last_idx, suffix) arrays"""
+        positions = np.arange(self.position, self.position + count, dtype=np.int64)
+        self.position += count
+        return self.permute(positions)
+
+class AliasTable:
+    """
+    Walker/Vose alias table for O(1) weighted draws.
+
+    Each column i keeps itself with probability prob[i] and otherwise falls
+    through to alias[i], so a draw is one uniform index plus one coin flip.
+    """
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, prob, alias):
+        self.prob = prob
+        self.alias = alias
+
+    @classmethod
+    def build(cls, weights):
+        """Build the table from non-negative weights (Vose's method, O(n))"""
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        total = weights.sum()
+        if n == 0 or total <= 0 or (weights < 0).any():
+            raise ValueError("weights must be non-negative with a positive sum")
+        scaled = (weights * (n / total)).tolist()
+        prob = np.ones(n, dtype=np.float64)
+        alias = np.arange(n, dtype=np.int64)
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to rounding error
+        return cls(prob, alias)
+
+    @classmethod
+    def uniform(cls, n):
+        """Return a table that draws 0..n-1 with equal probability"""
+        return cls(np.ones(n, dtype=np.float64), np.arange(n, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng, size):
+        """Draw `size` indices at once from a numpy Generator"""
+        columns = rng.integers(len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+    def sample_one(self, rng):
+        """Draw a single index using a `random.Random`-like source"""
+        column = rng.randrange(len(self.prob))
+        return column if rng.random() < self.prob[column] else int(self.alias[column])
@@ -0,0 +1,86 @@
+"""
+Relevance scoring of prospect candidates against the selected criteria.
+
+Titles and companies are scored once per pool; a candidate's score is the sum of
+its title and company scores, so scoring a large over-generated candidate pool
+is a pair of array gathers. The best `k` are then picked with a partial
+selection (numpy.argpartition) instead of a full sort.
+"""
+import re
+
+import numpy as np
+
+from catalog import TITLES, industry_id
+
+# Weights of each component; they sum to 1 so scores fall in [0, 1]
+ROLE_WEIGHT = 0.6
+INDUSTRY_WEIGHT = 0.25
+FOCUS_WEIGHT = 0.15
+
+# Industry score of the generic titles shared by every industry
+GENERIC_TITLE_SCORE = 0.3
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Lower-case word tokens with simple plural stripping ("Managers" -> "manager")"""
+    tokens = set()
+    for token in _TOKEN.findall((text or "").lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return tokens
+
+def title_scores(titles, industry, target_role=None):
+    """
+    Score each title in a pool against the industry and target role.
+
+    The role component is the share of role tokens found in the title, plus a
+    bonus when the whole role appears in it; the industry component rewards
+    industry-specific titles over generic ones.
+    """
+    role_tokens = tokenize(target_role)
+    ind = industry_id(industry)
+    industry_titles = set(TITLES[ind]) if ind is not None else set()
+    role_weight = ROLE_WEIGHT if role_tokens else 0.0
+    industry_weight = INDUSTRY_WEIGHT + (ROLE_WEIGHT - role_weight)
+
+    scores = np.empty(len(titles), dtype=np.float64)
+    for i, title in enumerate(titles):
+        title_tokens = tokenize(title)
+        role = 0.0
+        if role_tokens:
+            role = 0.8 * len(role_tokens & title_tokens) / len(role_tokens)
+            if role_tokens <= title_tokens:
+                role += 0.2
+        if title in industry_titles or (role_tokens and role_tokens <= title_tokens):
+            industry_score = 1.0
+        else:
+            industry_score = GENERIC_TITLE_SCORE
+        scores[i] = role_weight * role + industry_weight * industry_score
+    return scores
+
+def company_scores(companies, industry_focus=None):
+    """Score each company in a pool by whether its name reflects the industry focus"""
+    focus_tokens = tokenize(industry_focus)
+    scores = np.zeros(len(companies), dtype=np.float64)
+    if focus_tokens:
+        for i, company in enumerate(companies):
+            scores[i] = FOCUS_WEIGHT * len(focus_tokens & tokenize(company)) / len(focus_tokens)
+    return scores
+
+def score_candidates(company_idx, title_idx, companies, titles, industry, industry_focus=None, target_role=None):
+    """Return the relevance score of every (company, title) candidate row"""
+    return (
+        company_scores(companies, industry_focus)[company_idx]
+        + title_scores(titles, industry, target_role)[title_idx]
+    )
+
+def top_k(scores, k):
+    """Return the indices of the `k` highest scores, best first, without sorting the whole array"""
+    if k >= len(scores):
+        selected = np.arange(len(scores))
+    else:
+        selected = np.argpartition(-scores, k - 1)[:k]
+    # Only the selected rows are ordered; the sort is stable so ties keep their random draw order
+    return selected[np.argsort(-scores[selected], kind="stable")]
@@ -0,0 +1,233 @@
+"""
+Inverted index over the text fields of a generated result set.
+
+Every token of name, title, company and location maps to a sorted array of row
+ids (a posting list). Postings are stored per field plus once across all
+fields, so AND filters are intersections of sorted arrays and OR filters are
+unions, without scanning the prospects.
+
+Queries are whitespace-separated terms that must all match; `OR` separates
+alternatives and `field:term` restricts a term to one field, e.g.
+    "title:cfo company:fintech OR ceo"
+"""
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from prospects import ProspectBatch
+from scoring import tokenize
+from utils import LazyProspect
+
+# Prospect fields indexed for search
+INDEX_FIELDS = ("name", "title", "company", "location")
+
+_ROW_DTYPE = np.int32
+
+class Postings:
+    """
+    Posting lists of one field in compressed sparse row form.
+
+    Parameters:
+    - token_ids: Dict of token -> position in `offsets`
+    - offsets: int64 array; the rows of token t are rows[offsets[t]:offsets[t + 1]]
+    - rows: Row ids of every token, sorted within each token
+    """
+
+    __slots__ = ("token_ids", "offsets", "rows")
+
+    def __init__(self, token_ids, offsets, rows):
+        self.token_ids = token_ids
+        self.offsets = offsets
+        self.rows = rows
+
+    @classmethod
+    def from_pairs(cls, vocabulary, tokens, rows):
+        """Build postings from parallel (token id, row id) arrays with rows ascending"""
+        # A stable sort by token keeps each token's rows in ascending order
+        order = np.argsort(tokens, kind="stable")
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tokens, minlength=len(vocabulary)), out=offsets[1:])
+        return cls(dict(vocabulary), offsets, rows[order])
+
+    def get(self, token):
+        """Return the sorted row ids of a token (empty if unknown)"""
+        t = self.token_ids.get(token)
+        if t is None:
+            return self.rows[:0]
+        return self.rows[self.offsets[t]:self.offsets[t + 1]]
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.rows.nbytes
+
+def _column(prospects, field):
+    """Return one field of every prospect, reading lazy records' slots directly"""
+    if prospects and isinstance(prospects[0], LazyProspect):
+        return list(map(attrgetter(field), prospects))
+    return list(map(itemgetter(field), prospects))
+
+def _field_pairs(values, vocabulary):
+    """Return (token id, row id) arrays for one column of strings, tokenizing each distinct value once"""
+    value_ids = {value: i for i, value in enumerate(dict.fromkeys(values))}
+    inverse = np.fromiter(map(value_ids.__getitem__, values), dtype=np.int64, count=len(values))
+    return _value_pairs(inverse, value_ids, vocabulary)
+
+def _value_pairs(inverse, distinct, vocabulary):
+    """Return (token id, row id) arrays for rows holding distinct[inverse[row]], tokenizing each value once"""
+    # Tokens of every distinct value, as a flat array with per-value offsets
+    value_tokens = []
+    token_counts = np.empty(len(distinct), dtype=np.int64)
+    for i, value in enumerate(distinct):
+        tokens = [vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(value)]
+        value_tokens.extend(tokens)
+        token_counts[i] = len(tokens)
+    value_tokens = np.asarray(value_tokens, dtype=np.int64)
+    value_starts = np.cumsum(token_counts) - token_counts
+
+    # Expand to one pair per (row, token of the row's value)
+    counts = token_counts[inverse]
+    row_starts = np.cumsum(counts) - counts
+    rows = np.repeat(np.arange(len(inverse), dtype=_ROW_DTYPE), counts)
+    within = np.arange(len(rows), dtype=np.int64) - np.repeat(row_starts, counts)
+    tokens = value_tokens[np.repeat(value_starts[inverse], counts) + within]
+    return tokens, rows
+
+def _intersect(a, b, size):
+    """Intersect two sorted row id arrays over `size` rows"""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    if len(a) * 64 < size:
+        # Few candidates: binary-search each of them in the larger array
+        positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+        return a[b[positions] == a]
+    # Otherwise a bitmap over every row is linear and avoids the searches
+    mask = np.zeros(size, dtype=bool)
+    mask[b] = True
+    return a[mask[a]]
+
+class ProspectIndex:
+    """
+    Token -> row id postings for the text fields of a result set.
+
+    Build with ProspectIndex.build(prospects); row ids are positions in that sequence.
+    """
+
+    __slots__ = ("size", "fields", "any_field")
+
+    def __init__(self, size, fields, any_field):
+        self.size = size
+        self.fields = fields
+        self.any_field = any_field
+
+    @classmethod
+    def build(cls, prospects):
+        """Index the INDEX_FIELDS of a sequence of prospect mappings"""
+        vocabulary = {}
+        fields = {}
+        all_tokens, all_rows = [], []
+        # Record files and saved searches read every row once for all fields rather than once per field
+        columns = prospects.columns(INDEX_FIELDS) if hasattr(prospects, "columns") else None
+        for field in INDEX_FIELDS:
+            field_vocabulary = {}
+            if isinstance(prospects, ProspectBatch):
+                # Tokenize pool values straight from the code columns, without per-row strings
+                tokens, rows = _value_pairs(*prospects.factorize(field), field_vocabulary)
+            else:
+                values = columns[field] if columns is not None else _column(prospects, field)
+                tokens, rows = _field_pairs(values, field_vocabulary)
+            fields[field] = Postings.from_pairs(field_vocabulary, tokens, rows)
+
+            # Map field token ids to ids shared by every field
+            shared = np.array(
+                [vocabulary.setdefault(token, len(vocabulary)) for token in field_vocabulary], dtype=np.int64
+            )
+            all_tokens.append(shared[tokens])
+            all_rows.append(rows)
+
+        # A row matching a token in several fields is listed once across fields
+        n = max(len(prospects), 1)
+        keys = np.concatenate(all_tokens) * n + np.concatenate(all_rows)
+        keys.sort()
+        keys = keys[np.diff(keys, prepend=-1) != 0]
+        any_field = Postings.from_pairs(vocabulary, keys // n, (keys % n).astype(_ROW_DTYPE))
+        return cls(len(prospects), fields, any_field)
+
+    def lookup(self, token, field=None):
+        """Return the sorted row ids containing `token` (in `field`, or in any field)"""
+        postings = self.any_field if field is None else self.fields[field]
+        return postings.get(token)
+
+    def all_of(self, text, field=None):
+        """Return the rows matching every token of `text`"""
+        tokens = tokenize(text)
+        if not tokens:
+            return np.arange(self.size, dtype=_ROW_DTYPE)
+        # Intersect the shortest postings first, so later steps only search a few rows
+        postings = sorted((self.lookup(token, field) for token in tokens), key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            if not len(rows):
+                break
+            rows = _intersect(rows, other, self.size)
+        return rows
+
+    def any_of(self, row_sets):
+        """Return the union of several sorted row id arrays"""
+        row_sets = [rows for rows in row_sets if len(rows)]
+        if len(row_sets) <= 1:
+            return row_sets[0] if row_sets else np.empty(0, dtype=_ROW_DTYPE)
+        # A bitmap union is linear in the result set size, with no sorting
+        mask = np.zeros(self.size, dtype=bool)
+        for rows in row_sets:
+            mask[rows] = True
+        return np.flatnonzero(mask).astype(_ROW_DTYPE)
+
+    def filter(self, **criteria):
+        """
+        Return the rows matching every given field, e.g. filter(title="cfo", company="fintech").
+
+        Parameters:
+        - criteria: INDEX_FIELDS names mapped to text whose tokens must all appear in that field
+        """
+        rows = np.arange(self.size, dtype=_ROW_DTYPE)
+        for field, text in criteria.items():
+            if field not in self.fields:
+                raise ValueError(f"Unknown search field: {field!r}")
+            rows = _intersect(rows, self.all_of(text, field), self.size)
+        return rows
+
+    def search(self, query):
+        """
+        Return the sorted row ids matching a query string.
+
+        Terms are ANDed, `OR` separates alternative groups and `field:term`
+        limits a term to one of INDEX_FIELDS. An empty query matches every row.
+        """
+        groups = [[]]
+        for term in (query or "").split():
+            if term == "OR":
+                groups.append([])
+            else:
+                groups[-1].append(term)
+
+        matches = []
+        for terms in groups:
+            if not terms:
+                continue
+            rows = None
+            for term in terms:
+                field, _, text = term.rpartition(":")
+                field = field.lower() if field.lower() in self.fields else None
+                term_rows = self.all_of(text if field else term, field)
+                rows = term_rows if rows is None else _intersect(rows, term_rows, self.size)
+            matches.append(rows)
+        if not matches:
+            return np.arange(self.size, dtype=_ROW_DTYPE)
+        return self.any_of(matches)
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held by the posting arrays"""
+        return self.any_field.nbytes + sum(postings.nbytes for postings in self.fields.values())
@@ -0,0 +1,485 @@
+"""
+Pluggable sources of prospect records.
+
+A ProspectSource fills the usual prospect schema for a set of search criteria.
+MockProspectSource wraps the built-in generator; HTTPProspectSource fetches
+prospects from an enrichment backend over HTTP, split into batched requests
+that run concurrently on one asyncio event loop.
+
+The HTTP backend protocol is one JSON endpoint:
+
+    POST {base_url}/prospects/search
+    {"location": ..., "demographic": ..., "industry": ..., "industry_focus": ...,
+     "target_role": ..., "offset": 0, "count": 500, "seed": null}
+    -> 200 {"prospects": [<prospect dict>, ...]}
+
+`count` prospects starting at `offset` of the result are returned, so a
+search can be fetched in any number of batches. mock_server.py implements it
+locally for tests and benchmarks.
+"""
+import abc
+import asyncio
+import collections
+import json
+import os
+import random
+import ssl
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+from metrics import metrics
+from prospects import PROSPECT_FIELDS
+from utils import generate_linkedin_prospects
+
+SEARCH_PATH = "/prospects/search"
+
+# Responses worth retrying: rate limited, or a transient server failure
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Request latencies kept for HTTPProspectSource.stats()
+LATENCY_SAMPLES = 10_000
+
+class SourceError(RuntimeError):
+    """A source could not return the requested prospects"""
+
+class ProspectSource(abc.ABC):
+    """
+    Base class of prospect sources.
+
+    Subclasses implement the coroutine fetch(); fetch_sync() runs it to
+    completion for synchronous callers such as the Streamlit script thread.
+    """
+
+    @abc.abstractmethod
+    async def fetch(self, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                    seed=None, progress=None):
+        """
+        Return `count` prospects for the criteria.
+
+        Parameters:
+        - location, demographic, industry, industry_focus, target_role, count, seed: Same as
+          generate_linkedin_prospects
+        - progress: Optional function(prospects, prospects so far) called as prospects arrive; an
+          exception raised from it aborts the fetch
+        """
+
+    def fetch_sync(self, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                   seed=None, progress=None):
+        """Blocking version of fetch()"""
+        return asyncio.run(
+            self.fetch(location, demographic, industry, industry_focus, target_role, count, seed, progress)
+        )
+
+    def close(self):
+        """Release the source's connections and threads"""
+
+class MockProspectSource(ProspectSource):
+    """
+    The built-in mock generator as a source.
+
+    Parameters:
+    - lazy, unique, vocabulary, oversample, columnar: Passed to generate_linkedin_prospects
+    """
+
+    def __init__(self, lazy=False, unique=False, vocabulary=None, oversample=None, columnar=False):
+        self.options = {
+            "lazy": lazy, "unique": unique, "vocabulary": vocabulary, "oversample": oversample, "columnar": columnar
+        }
+
+    async def fetch(self, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                    seed=None, progress=None):
+        # Generation is CPU-bound, so it runs off the event loop
+        return await asyncio.to_thread(
+            self.fetch_sync, location, demographic, industry, industry_focus, target_role, count, seed, progress
+        )
+
+    def fetch_sync(self, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                   seed=None, progress=None):
+        prospects = generate_linkedin_prospects(
+            location, demographic, industry, industry_focus, target_role, count=count, seed=seed, **self.options
+        )
+        if progress is not None:
+            progress(prospects, len(prospects))
+        return prospects
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for coroutines.
+
+    Tokens refill at `rate` per second up to `capacity`. A caller that finds the
+    bucket empty reserves a future token and sleeps until it is due, so waiting
+    callers are served in order. Safe to share between event loops.
+
+    Parameters:
+    - rate: Tokens added per second
+    - capacity: Largest burst (defaults to `rate`, at least 1)
+    - clock: Time source, monotonic by default
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return the seconds to wait until it is available"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        """Wait for a token"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class HTTPResponseError(ConnectionError):
+    """The server sent something that is not a valid HTTP/1.1 response"""
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections to one server, for coroutines.
+
+    At most `max_connections` requests are in flight; finished connections are
+    kept for reuse. Connections belong to the event loop that opened them, so
+    the pool starts afresh when it is used from another loop.
+
+    Parameters:
+    - base_url: Server URL (http or https), optionally with a path prefix
+    - max_connections: Largest number of open connections
+    - timeout: Seconds allowed for connecting and for each request
+    """
+
+    def __init__(self, base_url, max_connections=8, timeout=30.0):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL: {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.prefix = parts.path.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.opened = 0
+        self._loop = None
+        self._idle = []
+        self._slots = None
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self.close()
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_connections)
+
+    async def request(self, method, path, body=b"", headers=None):
+        """Send a request and return (status, lower-cased headers, body)"""
+        self._bind()
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._open()
+            try:
+                status, response_headers, content, keep_alive = await asyncio.wait_for(
+                    self._exchange(connection, method, path, body, headers), self.timeout
+                )
+            except (ConnectionError, asyncio.IncompleteReadError) as error:
+                self._discard(connection)
+                if not reused:
+                    raise
+                # The server may have closed an idle connection; retry once on a new one
+                connection = await self._open()
+                try:
+                    status, response_headers, content, keep_alive = await asyncio.wait_for(
+                        self._exchange(connection, method, path, body, headers), self.timeout
+                    )
+                except BaseException:
+                    self._discard(connection)
+                    raise error
+            except BaseException:
+                self._discard(connection)
+                raise
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                self._discard(connection)
+            return status, response_headers, content
+
+    async def _open(self):
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+        )
+        self.opened += 1
+        return connection
+
+    @staticmethod
+    def _discard(connection):
+        connection[1].close()
+
+    async def _exchange(self, connection, method, path, body, headers):
+        reader, writer = connection
+        lines = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by the server")
+        try:
+            version, status = status_line.split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HTTPResponseError(f"invalid status line: {status_line!r}") from None
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Skip any trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b"".join(chunks)
+            keep_alive = True
+        elif "content-length" in response_headers:
+            content = await reader.readexactly(int(response_headers["content-length"]))
+            keep_alive = True
+        else:
+            content = await reader.read()
+            keep_alive = False
+        keep_alive = keep_alive and version == b"HTTP/1.1" and response_headers.get("connection") != "close"
+        return status, response_headers, content, keep_alive
+
+    def close(self):
+        """Close every idle connection (from any thread)"""
+        idle, self._idle = self._idle, []
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for connection in idle:
+            if self._loop is running:
+                self._discard(connection)
+                continue
+            try:
+                # Transports may only be closed from their own loop
+                self._loop.call_soon_threadsafe(self._discard, connection)
+            except RuntimeError:
+                # That loop is closed; the socket is released with its transport
+                pass
+
+class HTTPProspectSource(ProspectSource):
+    """
+    Prospects from an HTTP enrichment backend (see the module docstring).
+
+    A search is split into `batch_size` requests that run concurrently over a
+    pool of keep-alive connections, at most `max_concurrency` at a time and no
+    faster than the token bucket allows. Failed requests (connection errors,
+    timeouts, 429 and 5xx responses) are retried with exponential backoff and
+    jitter, honoring Retry-After. fetch_sync() runs searches on the source's
+    own event loop thread, so every caller shares one connection pool.
+
+    Parameters:
+    - base_url: Backend URL, e.g. http://localhost:8765
+    - batch_size: Prospects requested per call
+    - max_concurrency: Requests in flight at once (also the connection pool size)
+    - rate: Requests per second allowed (None for no limit)
+    - burst: Requests allowed at once before the rate applies (defaults to `rate`)
+    - retries: Retries per request before giving up
+    - backoff: Delay before the first retry in seconds, doubled on each retry
+    - max_backoff: Longest delay between retries
+    - timeout: Seconds allowed per request
+    - headers: Extra request headers, e.g. an Authorization header
+    """
+
+    def __init__(self, base_url, batch_size=500, max_concurrency=8, rate=None, burst=None, retries=3,
+                 backoff=0.2, max_backoff=5.0, timeout=30.0, headers=None):
+        if batch_size <= 0 or max_concurrency <= 0 or retries < 0:
+            raise ValueError("batch_size and max_concurrency must be positive, retries non-negative")
+        self.pool = ConnectionPool(base_url, max_concurrency, timeout)
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.limiter = TokenBucket(rate, burst) if rate else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = {"Content-Type": "application/json", "Accept": "application/json", **(headers or {})}
+        self._loop = None
+        self._thread = None
+        self._loop_lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    async def fetch(self, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                    seed=None, progress=None):
+        if count <= 0:
+            return []
+        criteria = {
+            "location": location,
+            "demographic": demographic,
+            "industry": industry,
+            "industry_focus": industry_focus,
+            "target_role": target_role,
+            "seed": seed,
+        }
+        slots = asyncio.Semaphore(self.max_concurrency)
+        fetched = 0
+
+        async def fetch_batch(offset, size):
+            nonlocal fetched
+            async with slots:
+                batch = await self._fetch_batch({**criteria, "offset": offset, "count": size})
+            fetched += len(batch)
+            if progress is not None:
+                # Batches finish in any order, so partial results are not in result order
+                progress(batch, fetched)
+            return batch
+
+        tasks = [
+            asyncio.ensure_future(fetch_batch(offset, min(self.batch_size, count - offset)))
+            for offset in range(0, count, self.batch_size)
+        ]
+        try:
+            batches = await asyncio.gather(*tasks)
+        except BaseException:
+            # One batch failed for good; don't leave the others running
+            for task in tasks:
+                task.cancel()
+            raise
+        return [prospect for batch in batches for prospect in batch]
+
+    async def _fetch_batch(self, payload):
+        """Request one batch, retrying transient failures, and return its validated prospects"""
+        body = json.dumps(payload).encode("utf-8")
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            response_headers = {}
+            start = time.perf_counter()
+            try:
+                with metrics.stage("source.request"):
+                    status, response_headers, content = await self.pool.request(
+                        "POST", SEARCH_PATH, body, self.headers
+                    )
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+                failure = f"{type(error).__name__}: {error}"
+            else:
+                self.requests += 1
+                self._latencies.append(time.perf_counter() - start)
+                if status == 200:
+                    return self._validate(content, payload["count"])
+                if status not in RETRY_STATUSES:
+                    self.failures += 1
+                    raise SourceError(f"backend returned HTTP {status}: {content[:200]!r}")
+                failure = f"HTTP {status}"
+
+            if attempt == self.retries:
+                self.failures += 1
+                raise SourceError(f"batch at offset {payload['offset']} failed after {attempt + 1} attempts: {failure}")
+            self.retried += 1
+            await asyncio.sleep(self._retry_delay(attempt, response_headers.get("retry-after")))
+
+    def _retry_delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry `attempt` (0-based): Retry-After if given, else jittered backoff"""
+        if retry_after is not None:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _validate(content, count):
+        try:
+            prospects = json.loads(content)["prospects"]
+        except (ValueError, KeyError, TypeError) as error:
+            raise SourceError(f"malformed backend response: {error}") from None
+        if len(prospects) != count:
+            raise SourceError(f"backend returned {len(prospects)} prospects, expected {count}")
+        for prospect in prospects:
+            if not isinstance(prospect, dict) or any(field not in prospect for field in PROSPECT_FIELDS):
+                raise SourceError("backend returned a prospect without the expected fields")
+        return prospects
+
+    def fetch_sync(self, location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                   seed=None, progress=None):
+        coroutine = self.fetch(location, demographic, industry, industry_focus, target_role, count, seed, progress)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop()).result()
+
+    def _event_loop(self):
+        """Return the source's event loop, starting its thread on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="prospect-source", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def close(self):
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            self.pool.close()
+            return
+        loop.call_soon_threadsafe(self.pool.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def stats(self):
+        """Return request counters and latency percentiles (ms) of recent requests"""
+        latencies = np.asarray(self._latencies) * 1000
+        stats = {
+            "requests": self.requests,
+            "retries": self.retried,
+            "failures": self.failures,
+            "connections_opened": self.pool.opened,
+        }
+        for p in (50, 95, 99):
+            stats[f"p{p}_ms"] = float(np.percentile(latencies, p)) if len(latencies) else None
+        return stats
+
+def source_from_environment():
+    """
+    Return the HTTPProspectSource configured by the environment, or None to use the mock generator.
+
+    PROSPECT_SOURCE_URL sets the backend URL; PROSPECT_SOURCE_RATE optionally
+    limits requests per second and PROSPECT_SOURCE_TOKEN adds a bearer token.
+    """
+    url = os.environ.get("PROSPECT_SOURCE_URL")
+    if not url:
+        return None
+    rate = os.environ.get("PROSPECT_SOURCE_RATE")
+    token = os.environ.get("PROSPECT_SOURCE_TOKEN")
+    return HTTPProspectSource(
+        url, rate=float(rate) if rate else None, headers={"Authorization": f"Bearer {token}"} if token else None
+    )
@@ -0,0 +1,231 @@
+"""
+Compiled, slot-based outreach templates.
+
+Each template is parsed once into static fragments and named slots. Criteria-level
+values (industry, focus, role, value proposition, resource) are bound at compile
+time, leaving only the per-prospect slots (first_name, company, title) to fill
+when a template is rendered. Compiled templates are registered under integer ids
+so prospects can carry an id instead of the rendered text.
+"""
+import threading
+from functools import lru_cache
+from string import Formatter
+from types import MappingProxyType
+
+from catalog import email_openings, follow_up_resource
+
+# Slots that vary per prospect; everything else is bound per set of criteria
+ROW_SLOTS = ("first_name", "company", "title")
+
+EMAIL_TEMPLATE = """Subject: Quick question about {company}'s {subject_focus} initiatives
+
+Hi {first_name},
+
+{opening}
+
+{value_prop} I'd love to share some specific ideas I have for {company}.
+
+Would you be open to a brief 15-minute chat this week to discuss how we might be able to help?
+
+Best regards,
+[Your name]"""
+
+FOLLOW_UP_TEMPLATES = {
+    "positive": """Subject: Excited to Connect – Next Steps
+
+Hi {first_name},
+
+Thanks for your response! I'm glad to hear you're open to discussing {value_prop}.
+
+Let's schedule a time that works best for you. Are you available [provide two or three time slots], or would you prefer to suggest a time? I'll send over a calendar invite once we confirm.
+
+In the meantime, if there are any specific challenges or goals you'd like me to focus on during our call, feel free to share—I want to make the most of our time.
+
+Looking forward to our conversation!
+
+Best regards,
+[Your Name]""",
+
+    "negative": """Subject: Appreciate Your Time – Happy to Stay in Touch
+
+Hi {first_name},
+
+I appreciate you getting back to me. I completely understand that now might not be the right time.
+
+If things change or if you'd like to revisit this conversation down the road, I'd be happy to connect when it makes sense for you. In the meantime, I'll stay in touch and share {resource} that might be valuable for {company}.
+
+Wishing you continued success, and feel free to reach out anytime!
+
+Best regards,
+[Your Name]""",
+
+    "no_response": """Subject: Following Up on {subject_focus} Discussion
+
+Hi {first_name},
+
+I hope you're doing well! I wanted to follow up on my previous email to see if you had a chance to review it. I understand things get busy, and I completely respect your time.
+
+I'd still love the opportunity to connect and share some ideas on {value_prop}. Would you be open to a quick 15-minute chat this week? Let me know if there's a time that works for you.
+
+Best regards,
+[Your Name]"""
+}
+
+class Template:
+    """A template parsed into static fragments interleaved with named slots"""
+
+    __slots__ = ("fragments", "slots")
+
+    def __init__(self, fragments, slots):
+        self.fragments = tuple(fragments)
+        self.slots = tuple(slots)
+
+    @classmethod
+    def parse(cls, text):
+        """Parse a str.format-style string into a Template"""
+        fragments, slots = [""], []
+        for literal, field, _, _ in Formatter().parse(text):
+            fragments[-1] += literal
+            if field is not None:
+                slots.append(field)
+                fragments.append("")
+        return cls(fragments, slots)
+
+    def bind(self, **values):
+        """
+        Return a new Template with some slots filled in.
+
+        String values become static text; Template values are spliced in place,
+        bringing their own slots with them.
+        """
+        fragments, slots = [self.fragments[0]], []
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            value = values.get(slot)
+            if value is None:
+                slots.append(slot)
+                fragments.append(fragment)
+            elif isinstance(value, Template):
+                fragments[-1] += value.fragments[0]
+                fragments.extend(value.fragments[1:])
+                slots.extend(value.slots)
+                fragments[-1] += fragment
+            else:
+                fragments[-1] += value + fragment
+        return Template(fragments, slots)
+
+    def render(self, values):
+        """Fill the remaining slots from a mapping and return the text"""
+        parts = [self.fragments[0]]
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            parts.append(values[slot])
+            parts.append(fragment)
+        return "".join(parts)
+
+    def render_many(self, columns, count):
+        """Render `count` rows at once from a mapping of slot name -> column of values"""
+        slot_columns = [columns[slot] for slot in self.slots]
+        fragments = self.fragments
+        first, rest = fragments[0], fragments[1:]
+        rendered = []
+        for row in zip(*slot_columns) if slot_columns else ((),) * count:
+            parts = [first]
+            for value, fragment in zip(row, rest):
+                parts.append(value)
+                parts.append(fragment)
+            rendered.append("".join(parts))
+        return rendered
+
+# Registry of compiled templates, addressed by integer id. Templates are keyed by content, so
+# criteria compiled again after falling out of the lru_caches below get their old ids back and
+# the registry only grows with the number of distinct templates
+_templates = []
+_template_ids = {}
+# Script threads and job queue workers register templates concurrently
+_registry_lock = threading.Lock()
+
+def register(template):
+    """Register a compiled template and return its id, reusing the id of an identical one"""
+    key = (template.fragments, template.slots)
+    with _registry_lock:
+        template_id = _template_ids.get(key)
+        if template_id is None:
+            template_id = len(_templates)
+            _templates.append(template)
+            _template_ids[key] = template_id
+        return template_id
+
+def get_template(template_id):
+    """Return the compiled template registered under `template_id`"""
+    return _templates[template_id]
+
+def render(template_id, values):
+    """Render a registered template with the given slot values"""
+    return _templates[template_id].render(values)
+
+_EMAIL = Template.parse(EMAIL_TEMPLATE)
+_FOLLOW_UPS = {scenario: Template.parse(text) for scenario, text in FOLLOW_UP_TEMPLATES.items()}
+
+def _email_value_prop(industry, industry_focus, target_role):
+    """Return the value proposition sentence used in the initial email"""
+    if industry_focus and target_role:
+        return f"I'm reaching out because I've helped similar {industry_focus} companies improve their operations specifically for {target_role}s and drive growth."
+    elif industry_focus:
+        return f"I'm reaching out because I've helped similar companies in the {industry_focus} space streamline their operations and drive growth."
+    elif target_role:
+        return f"I'm reaching out because I've helped {target_role}s in {industry} companies streamline their operations and drive growth."
+    else:
+        return f"I'm reaching out because I've helped similar {industry} companies streamline their operations and drive growth."
+
+def _follow_up_value_prop(industry_focus, target_role):
+    """Return the value proposition phrase used in follow-ups, with {company} left as a slot"""
+    if industry_focus and target_role:
+        text = "how we can support {company}'s {industry_focus} initiatives, particularly for {target_role}s"
+    elif industry_focus:
+        text = "how we can support {company}'s {industry_focus} initiatives"
+    elif target_role:
+        text = "how we can support {company}'s {target_role}s"
+    else:
+        text = "how we can support {company}"
+    return Template.parse(text).bind(industry_focus=industry_focus, target_role=target_role)
+
+def _with_defaults(defaults, **values):
+    """Replace empty criteria values with catalog defaults"""
+    return {key: value or defaults.get(key) for key, value in values.items()}
+
+@lru_cache(maxsize=1024)
+def email_template_ids(industry, industry_focus=None, target_role=None):
+    """
+    Compile the outreach email for a set of criteria.
+
+    Returns one template id per opening line; each template only has the
+    per-prospect slots (first_name, company, title) left to fill.
+    """
+    email = _EMAIL.bind(
+        subject_focus=industry_focus or industry,
+        value_prop=_email_value_prop(industry, industry_focus, target_role)
+    )
+    template_ids = []
+    for text, defaults in email_openings(industry):
+        opening = Template.parse(text).bind(**_with_defaults(
+            defaults, industry=industry, industry_focus=industry_focus, target_role=target_role
+        ))
+        template_ids.append(register(email.bind(opening=opening)))
+    return tuple(template_ids)
+
+@lru_cache(maxsize=1024)
+def follow_up_template_ids(industry, industry_focus=None, target_role=None):
+    """
+    Compile the follow-up emails for a set of criteria.
+
+    Returns a read-only mapping of response scenario -> template id; each template
+    only has the per-prospect slots (first_name, company) left to fill.
+    """
+    text, defaults = follow_up_resource(industry)
+    resource = Template.parse(text).bind(**_with_defaults(defaults, industry_focus=industry_focus))
+    value_prop = _follow_up_value_prop(industry_focus, target_role)
+    return MappingProxyType({
+        scenario: register(template.bind(
+            subject_focus=industry_focus or industry, value_prop=value_prop, resource=resource
+        ))
+        for scenario, template in _FOLLOW_UPS.items()
+    })
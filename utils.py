@@ -1,6 +1,75 @@
 import random
+from collections.abc import Mapping
+from functools import lru_cache
 
-def generate_linkedin_prospects(location, demographic, industry, industry_focus=None, target_role=None):
+import numpy as np
+
+from catalog import FIRST_NAMES, LAST_NAMES, BASE_COMPANIES, company_candidates, title_pool
+from metrics import metrics
+from prospects import PROSPECT_FIELDS, SCORE_FIELD, ProspectBatch, profile_url
+from sampling import UniqueNameSampler
+from scoring import score_candidates, top_k
+from templates import email_template_ids, follow_up_template_ids, get_template, render
+
+# Number of prospects built per step when streaming single prospects
+DEFAULT_CHUNK_SIZE = 10_000
+
+class LazyProspect(Mapping):
+    """
+    A prospect that holds compiled template ids and slot values instead of text.
+
+    Reads like the usual prospect dict; `email_template` and `follow_up_templates`
+    are rendered each time they are accessed.
+    """
+
+    __slots__ = (
+        "name", "title", "company", "location", "profile_url",
+        "email_template_id", "follow_up_template_ids", "relevance_score"
+    )
+
+    def __init__(self, name, title, company, location, profile_url, email_template_id, follow_up_template_ids,
+                 relevance_score=None):
+        self.name = name
+        self.title = title
+        self.company = company
+        self.location = location
+        self.profile_url = profile_url
+        self.email_template_id = email_template_id
+        self.follow_up_template_ids = follow_up_template_ids
+        self.relevance_score = relevance_score
+
+    def _fields(self):
+        return PROSPECT_FIELDS if self.relevance_score is None else PROSPECT_FIELDS + (SCORE_FIELD,)
+
+    def _slot_values(self):
+        return {"first_name": self.name.split()[0], "company": self.company, "title": self.title}
+
+    def __getitem__(self, key):
+        if key == "email_template":
+            return render(self.email_template_id, self._slot_values())
+        if key == "follow_up_templates":
+            values = self._slot_values()
+            return {
+                scenario: render(template_id, values)
+                for scenario, template_id in self.follow_up_template_ids.items()
+            }
+        if key in self._fields():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._fields())
+
+    def __len__(self):
+        return len(self._fields())
+
+    def to_dict(self):
+        """Return a plain prospect dict with all templates rendered"""
+        return {key: self[key] for key in self._fields()}
+
+def generate_linkedin_prospects(location, demographic, industry, industry_focus=None, target_role=None, count=5,
+                                lazy=False, seed=None, unique=False, vocabulary=None, oversample=None,
+                                columnar=False):
     """
     Generate mock LinkedIn prospect suggestions for testing.
     
@@ -10,321 +79,326 @@ def generate_linkedin_prospects(location, demographic, industry, industry_focus=
     - industry: Target industry
     - industry_focus: Specific focus within the industry (optional)
     - target_role: Specific role being targeted (optional)
+    - count: Number of prospects to generate (defaults to 5)
+    - lazy: Return LazyProspect records that render their templates on access
+    - seed: Seed for reproducible output (optional, uses the module-level `random` if omitted)
+    - unique: Never repeat a profile URL (True, or a UniqueNameSampler to continue from)
+    - vocabulary: corpus.Vocabulary of weighted names and company stems (optional, built-in lists if omitted)
+    - oversample: Score `count * oversample` candidates against the criteria and keep the best `count`,
+      adding a relevance_score to each prospect (optional)
+    - columnar: Return a prospects.ProspectBatch of code columns instead of a list
+    """
+    with metrics.stage("generate"):
+        rng = _seeded_random(seed)
+
+        # Generate more industry-specific company names
+        with metrics.stage("generate.companies"):
+            companies = generate_companies_for_industry(industry, industry_focus, rng, vocabulary)
+
+        # Generate job titles, potentially informed by target_role
+        with metrics.stage("generate.titles"):
+            job_titles = generate_job_titles(industry, target_role)
+
+        # Generate mock prospects in one batch
+        batch_rng = np.random.default_rng(rng.getrandbits(64))
+        return generate_prospect_batch(
+            location, industry, industry_focus, target_role, companies, job_titles, count,
+            batch_rng, lazy, _name_sampler(unique, rng, vocabulary), vocabulary, oversample, columnar
+        )
+
+def iter_linkedin_prospects(location, demographic, industry, industry_focus=None, target_role=None,
+                            count=5, chunk_size=None, lazy=False, seed=None, unique=False, vocabulary=None,
+                            oversample=None, columnar=False):
+    """
+    Lazily generate mock LinkedIn prospects.
+
+    Prospects are built one chunk at a time, so memory stays flat no matter how
+    large `count` is and the first records are available immediately.
+
+    Parameters:
+    - location, demographic, industry, industry_focus, target_role: Same as generate_linkedin_prospects
+    - count: Total number of prospects to generate
+    - chunk_size: If set, yield lists of up to `chunk_size` prospects instead of single prospects
+    - lazy: Yield LazyProspect records that render their templates on access
+    - seed: Seed for reproducible output (optional, uses the module-level `random` if omitted)
+    - unique: Never repeat a profile URL (True, or a UniqueNameSampler to continue from)
+    - vocabulary: corpus.Vocabulary of weighted names and company stems (optional, built-in lists if omitted)
+    - oversample: Keep the best of `oversample` scored candidates per prospect, chunk by chunk (optional)
+    - columnar: Build each chunk as a prospects.ProspectBatch (yielded whole when chunk_size is set)
     """
-    # Mock data with realistic names
-    first_names = [
-        "Michael", "Sarah", "David", "Jennifer", "Robert",
-        "Emma", "James", "Lisa", "William", "Rachel",
-        "John", "Jessica", "Thomas", "Emily", "Daniel",
-        "Michelle", "Christopher", "Amanda", "Matthew", "Ashley"
-    ]
-    last_names = [
-        "Anderson", "Chen", "Patel", "Martinez", "Thompson",
-        "Rodriguez", "Smith", "Johnson", "Wilson", "Brown",
-        "Lee", "Garcia", "Miller", "Davis", "Lopez",
-        "Harris", "Clark", "Lewis", "Young", "Walker"
-    ]
-
-    # Generate more industry-specific company names
-    companies = generate_companies_for_industry(industry, industry_focus)
-
-    # Generate job titles, potentially informed by target_role
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+
+    # Company and title pools are fixed for the whole run
+    rng = _seeded_random(seed)
+    companies = generate_companies_for_industry(industry, industry_focus, rng, vocabulary)
     job_titles = generate_job_titles(industry, target_role)
+    batch_rng = np.random.default_rng(rng.getrandbits(64))
+    name_sampler = _name_sampler(unique, rng, vocabulary)
+
+    batch_size = chunk_size or DEFAULT_CHUNK_SIZE
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        chunk = generate_prospect_batch(
+            location, industry, industry_focus, target_role, companies, job_titles, size, batch_rng, lazy,
+            name_sampler, vocabulary, oversample, columnar
+        )
+        remaining -= size
+        if chunk_size:
+            yield chunk
+        else:
+            yield from chunk
 
-    # Generate mock prospects
-    mock_prospects = []
-    for i in range(5):
-        company = random.choice(companies)
-        title = random.choice(job_titles)
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
-        name = f"{first_name} {last_name}"
-        profile_url = f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}"
-
-        # Create more tailored email templates and follow-ups using all parameters
-        email_template = generate_email_template(name, title, company, industry, industry_focus, target_role)
-        follow_up_templates = generate_follow_up_templates(name, company, industry, industry_focus, target_role)
-
-        prospect = {
-            "name": name,
-            "title": title,
-            "company": company,
-            "location": location,
-            "profile_url": profile_url,
-            "email_template": email_template,
-            "follow_up_templates": follow_up_templates
-        }
-        mock_prospects.append(prospect)
-
-    return mock_prospects
-
-def generate_companies_for_industry(industry, industry_focus=None):
-    """Generate industry-specific company names"""
-    
-    # Base companies that could work for any industry
-    base_companies = [
-        "Global Solutions", "Advanced Systems", 
-        "Innovative Partners", "Strategic Ventures",
-        "Premier Group", "Elite Services"
-    ]
-    
-    # Industry-specific prefixes
-    industry_prefixes = {
-        "Technology & Software": ["Tech", "Software", "Digital", "Cyber", "Cloud", "Data", "AI"],
-        "Finance & Banking": ["Financial", "Capital", "Invest", "Asset", "Wealth", "Bank"],
-        "Healthcare & Pharmaceuticals": ["Health", "Care", "Medical", "Pharma", "Bio", "Life"],
-        "Manufacturing & Industrial": ["Industrial", "Manufacturing", "Production", "Factory", "Assembly"],
-        "Retail & E-commerce": ["Retail", "Shop", "Store", "Market", "Commerce", "Trade"],
-        "Education & Training": ["Edu", "Learn", "Training", "Academy", "Institute", "School"],
-        "Professional Services": ["Consult", "Advisory", "Service", "Solution", "Professional"],
-        "Media & Entertainment": ["Media", "Entertainment", "Creative", "Studio", "Production"],
-        "Energy & Utilities": ["Energy", "Power", "Utility", "Resource", "Grid"]
-    }
-    
-    # Industry-specific suffixes
-    industry_suffixes = {
-        "Technology & Software": ["Systems", "Solutions", "Technologies", "Software", "Networks", "Platforms", "Labs"],
-        "Finance & Banking": ["Group", "Partners", "Advisors", "Management", "Trust", "Securities"],
-        "Healthcare & Pharmaceuticals": ["Healthcare", "Medical", "Therapeutics", "Sciences", "Pharmaceuticals"],
-        "Manufacturing & Industrial": ["Manufacturing", "Industries", "Products", "Works", "Solutions"],
-        "Retail & E-commerce": ["Retailers", "Stores", "Marketplace", "Outlets", "Emporium"],
-        "Education & Training": ["Education", "Learning", "Academy", "Institute", "University"],
-        "Professional Services": ["Consultants", "Partners", "Associates", "Group", "Advisors"],
-        "Media & Entertainment": ["Studios", "Media", "Entertainment", "Productions", "Group"],
-        "Energy & Utilities": ["Energy", "Power", "Resources", "Utilities", "Group"]
-    }
-    
-    # Generate industry-specific companies
-    specialized_companies = []
+@lru_cache(maxsize=1)
+def _name_url_pools():
+    """
+    Return (names, profile URLs) for every built-in (first, last) pair, indexed by first * len(LAST_NAMES) + last.
+
+    Built once per process and shared by every call and chunk; the arrays must not be modified.
+    """
+    pairs = [(f, l) for f in FIRST_NAMES for l in LAST_NAMES]
+    return (
+        np.array([f"{f} {l}" for f, l in pairs], dtype=object),
+        np.array([f"https://linkedin.com/in/{f.lower()}-{l.lower()}" for f, l in pairs], dtype=object),
+    )
+
+def _empty_batch(location, industry, industry_focus, target_role, companies, job_titles, vocabulary, oversample):
+    """Return a ProspectBatch with no rows but the pools and template ids of a real one"""
+    none = np.zeros(0, dtype=np.int64)
+    return ProspectBatch.from_draws(
+        location, FIRST_NAMES if vocabulary is None else vocabulary.first_names,
+        LAST_NAMES if vocabulary is None else vocabulary.last_names, none, none, None, companies, none,
+        job_titles, none, email_template_ids(industry, industry_focus, target_role), none,
+        follow_up_template_ids(industry, industry_focus, target_role), [] if oversample else None
+    )
+
+def generate_prospect_batch(location, industry, industry_focus, target_role, companies, job_titles, count,
+                            rng=None, lazy=False, name_sampler=None, vocabulary=None, oversample=None,
+                            columnar=False):
+    """
+    Build `count` prospects from fixed company and title pools in one vectorized pass.
+
+    Every name, company, title and opening-line index is drawn up front. Lazy
+    prospects only keep the compiled template ids; otherwise each distinct
+    combination is rendered once and gathered into columns, so the per-row cost
+    is a lookup rather than a template render.
+
+    Parameters:
+    - location, industry, industry_focus, target_role: Search criteria
+    - companies: Company name pool to draw from
+    - job_titles: Job title pool to draw from
+    - count: Number of prospects to generate
+    - rng: numpy Generator to draw from (optional, derived from `random` if omitted)
+    - lazy: Return LazyProspect records instead of rendered dicts
+    - name_sampler: UniqueNameSampler to draw names from instead of drawing them independently
+    - vocabulary: corpus.Vocabulary to draw weighted names from (optional, built-in lists if omitted)
+    - oversample: Draw `count * oversample` (company, title) candidates and keep the `count` most relevant
+    - columnar: Return a prospects.ProspectBatch holding only the drawn codes
+    """
+    if count <= 0:
+        if columnar:
+            return _empty_batch(location, industry, industry_focus, target_role, companies, job_titles,
+                                vocabulary, oversample)
+        return []
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    with metrics.stage("generate.draw"):
+        email_ids = email_template_ids(industry, industry_focus, target_role)
+        follow_up_ids = follow_up_template_ids(industry, industry_focus, target_role)
+        first_pool = FIRST_NAMES if vocabulary is None else vocabulary.first_names
+        last_pool = LAST_NAMES if vocabulary is None else vocabulary.last_names
+        n_first, n_last, n_openings = len(first_pool), len(last_pool), len(email_ids)
+
+        # Draw every index column at once
+        if oversample:
+            # Over-generate candidates, score them all and keep the top `count`
+            pool_size = count * oversample
+            company_idx = rng.integers(len(companies), size=pool_size)
+            title_idx = rng.integers(len(job_titles), size=pool_size)
+            with metrics.stage("generate.score"):
+                scores = score_candidates(
+                    company_idx, title_idx, companies, job_titles, industry, industry_focus, target_role
+                )
+                best = top_k(scores, count)
+            company_idx, title_idx = company_idx[best], title_idx[best]
+            relevance_scores = np.round(scores[best], 4).tolist()
+        else:
+            company_idx = rng.integers(len(companies), size=count)
+            title_idx = rng.integers(len(job_titles), size=count)
+            relevance_scores = None
+        if name_sampler is None and vocabulary is None:
+            first_idx = rng.integers(n_first, size=count)
+            last_idx = rng.integers(n_last, size=count)
+            suffixes = None
+        elif name_sampler is None:
+            # Weighted O(1) draws through each corpus' alias table
+            first_idx = vocabulary.first_names.sample(rng, count)
+            last_idx = vocabulary.last_names.sample(rng, count)
+            suffixes = None
+        else:
+            first_idx, last_idx, suffixes = name_sampler.draw(count)
+        opening_idx = rng.integers(n_openings, size=count)
+
+    if columnar:
+        with metrics.stage("generate.columnar"):
+            return ProspectBatch.from_draws(
+                location, first_pool, last_pool, first_idx, last_idx, suffixes, companies, company_idx,
+                job_titles, title_idx, email_ids, opening_idx, follow_up_ids, relevance_scores
+            )
+
+    # Names and profile URLs only depend on the (first, last) pair
+    with metrics.stage("generate.columns"):
+        if vocabulary is None:
+            name_pool, url_pool = _name_url_pools()
+            name_idx = first_idx * n_last + last_idx
+            names = name_pool[name_idx].tolist()
+            profile_urls = url_pool[name_idx].tolist()
+        else:
+            # Large corpora are decoded per drawn row rather than expanded into every pair
+            firsts, lasts = first_pool.take(first_idx), last_pool.take(last_idx)
+            names = [f"{f} {l}" for f, l in zip(firsts, lasts)]
+            profile_urls = [profile_url(f, l) for f, l in zip(firsts, lasts)]
+        if suffixes is not None and suffixes.any():
+            # Repeated names get a disambiguating suffix on their profile URL
+            profile_urls = [
+                f"{url}-{suffix}" if suffix else url
+                for url, suffix in zip(profile_urls, suffixes.tolist())
+            ]
+        company_column = np.array(companies, dtype=object)[company_idx].tolist()
+        title_column = np.array(job_titles, dtype=object)[title_idx].tolist()
+
+    if lazy:
+        with metrics.stage("generate.lazy_records"):
+            email_column = np.array(email_ids, dtype=object)[opening_idx].tolist()
+            prospects = [
+                LazyProspect(name, title, company, location, profile_url, email_id, follow_up_ids)
+                for name, title, company, profile_url, email_id in zip(
+                    names, title_column, company_column, profile_urls, email_column
+                )
+            ]
+            if relevance_scores is not None:
+                for prospect, score in zip(prospects, relevance_scores):
+                    prospect.relevance_score = score
+        return prospects
+
+    # Emails depend on (company, title, opening, first name); render each combination once
+    with metrics.stage("generate.render_emails"):
+        email_key = ((company_idx * len(job_titles) + title_idx) * n_openings + opening_idx) * n_first + first_idx
+        unique_keys, email_inverse = np.unique(email_key, return_inverse=True)
+        rendered_emails = []
+        for key in unique_keys.tolist():
+            key, f = divmod(key, n_first)
+            key, o = divmod(key, n_openings)
+            c, t = divmod(key, len(job_titles))
+            rendered_emails.append(get_template(email_ids[o]).render(
+                {"first_name": first_pool[f].split()[0], "company": companies[c], "title": job_titles[t]}
+            ))
+        email_templates = np.array(rendered_emails, dtype=object)[email_inverse.reshape(-1)].tolist()
+
+    # Follow-ups depend only on (company, first name)
+    with metrics.stage("generate.render_follow_ups"):
+        follow_up_key = company_idx * n_first + first_idx
+        unique_keys, follow_up_inverse = np.unique(follow_up_key, return_inverse=True)
+        rendered_follow_ups = []
+        for key in unique_keys.tolist():
+            c, f = divmod(key, n_first)
+            values = {"first_name": first_pool[f].split()[0], "company": companies[c]}
+            rendered_follow_ups.append({
+                scenario: get_template(template_id).render(values)
+                for scenario, template_id in follow_up_ids.items()
+            })
+        follow_ups = np.array(rendered_follow_ups, dtype=object)[follow_up_inverse.reshape(-1)].tolist()
+
+    with metrics.stage("generate.assemble"):
+        prospects = [
+            {
+                "name": name,
+                "title": title,
+                "company": company,
+                "location": location,
+                "profile_url": profile_url,
+                "email_template": email_template,
+                "follow_up_templates": dict(follow_up_templates)
+            }
+            for name, title, company, profile_url, email_template, follow_up_templates in zip(
+                names, title_column, company_column, profile_urls, email_templates, follow_ups
+            )
+        ]
+        if relevance_scores is not None:
+            for prospect, score in zip(prospects, relevance_scores):
+                prospect[SCORE_FIELD] = score
+    return prospects
+
+def _name_sampler(unique, rng, vocabulary=None):
+    """Return the UniqueNameSampler for a `unique` argument, seeding a new one from `rng` if True"""
+    if unique is True:
+        if vocabulary is None:
+            n_first, n_last = len(FIRST_NAMES), len(LAST_NAMES)
+        else:
+            n_first, n_last = len(vocabulary.first_names), len(vocabulary.last_names)
+        return UniqueNameSampler(n_first, n_last, seed=rng.getrandbits(64))
+    return unique or None
+
+def _seeded_random(seed):
+    """Return a private Random seeded with `seed`, or the module-level `random` if seed is None"""
+    return random if seed is None else random.Random(seed)
+
+def generate_companies_for_industry(industry, industry_focus=None, rng=random, vocabulary=None):
+    """
+    Generate industry-specific company names, drawing from `rng` (the `random` module by default).
+
+    If `vocabulary` has company stems, weighted stems replace the industry prefixes.
+    """
     
-    # Get prefixes and suffixes for the industry, or use defaults if not found
-    prefixes = industry_prefixes.get(industry, ["Global", "Advanced", "Innovative", "Strategic"])
-    suffixes = industry_suffixes.get(industry, ["Group", "Inc", "Corporation", "Company"])
+    # Prefixes, suffixes and every name they can form come precomputed from the catalog
+    prefixes, suffixes, plain, focused = company_candidates(industry, industry_focus)
     
     # Generate 8 industry-specific company names
+    specialized_companies = []
+    if vocabulary is not None and vocabulary.company_stems is not None:
+        stems = vocabulary.company_stems
+        focus_word = industry_focus.split()[0] if industry_focus else None
+        for _ in range(8):
+            stem = stems[stems.table.sample_one(rng)]
+            suffix = suffixes[rng.randrange(len(suffixes))]
+            if focus_word and rng.random() > 0.5:
+                specialized_companies.append(f"{stem} {focus_word} {suffix}")
+            else:
+                specialized_companies.append(f"{stem} {suffix}")
+        return list(BASE_COMPANIES) + specialized_companies
+
     for _ in range(8):
-        prefix = random.choice(prefixes)
-        suffix = random.choice(suffixes)
+        index = rng.randrange(len(prefixes)) * len(suffixes) + rng.randrange(len(suffixes))
         
         # If we have industry_focus, try to incorporate it sometimes
-        if industry_focus and random.random() > 0.5:
-            focus_word = industry_focus.split()[0] if " " in industry_focus else industry_focus
-            company_name = f"{prefix} {focus_word} {suffix}"
+        if industry_focus and rng.random() > 0.5:
+            specialized_companies.append(focused[index])
         else:
-            company_name = f"{prefix} {suffix}"
-        
-        specialized_companies.append(company_name)
+            specialized_companies.append(plain[index])
     
     # Combine base and specialized companies
-    all_companies = base_companies + specialized_companies
-    return all_companies
+    return list(BASE_COMPANIES) + specialized_companies
 
 def generate_job_titles(industry, target_role=None):
     """Generate job titles appropriate for the industry and target role"""
-    
-    # Base titles that could work for any industry
-    base_titles = ["CEO", "Founder", "Managing Director", "Business Owner", "Director of Operations"]
-    
-    # Industry-specific titles
-    industry_titles = {
-        "Technology & Software": [
-            "CTO", "Software Engineer", "Product Manager", "IT Director", 
-            "DevOps Manager", "Data Scientist", "VP of Engineering"
-        ],
-        "Finance & Banking": [
-            "CFO", "Financial Advisor", "Investment Banker", "Risk Manager", 
-            "Portfolio Manager", "Banking Executive", "Wealth Manager"
-        ],
-        "Healthcare & Pharmaceuticals": [
-            "Medical Director", "Chief Medical Officer", "Research Director", 
-            "Clinical Manager", "Healthcare Administrator", "Pharmaceutical Executive"
-        ],
-        "Manufacturing & Industrial": [
-            "Plant Manager", "Operations Director", "Production Supervisor",
-            "Quality Control Manager", "Supply Chain Director", "Process Engineer"
-        ],
-        "Retail & E-commerce": [
-            "Retail Manager", "E-commerce Director", "Merchandising Manager",
-            "Store Operations Director", "Digital Retail Strategist", "Buyer"
-        ],
-        "Education & Training": [
-            "Principal", "Dean", "Educational Director", "Training Coordinator",
-            "Curriculum Developer", "Academic Affairs Director"
-        ],
-        "Professional Services": [
-            "Managing Partner", "Senior Consultant", "Practice Lead",
-            "Principal Advisor", "Associate Director", "Client Services Manager"
-        ],
-        "Media & Entertainment": [
-            "Creative Director", "Content Producer", "Media Manager",
-            "Entertainment Executive", "Studio Head", "Production Manager"
-        ],
-        "Energy & Utilities": [
-            "Energy Director", "Operations Manager", "Sustainability Manager",
-            "Plant Supervisor", "Project Engineer", "Grid Operations Manager"
-        ]
-    }
-    
-    # Get titles for the industry, or use base titles if not found
-    specialized_titles = industry_titles.get(industry, base_titles)
-    
-    # If target_role is provided, make sure to include it and variations of it
-    if target_role:
-        role_variations = [
-            target_role,
-            f"Senior {target_role}",
-            f"Lead {target_role}",
-            f"Head of {target_role}",
-            f"{target_role} Manager"
-        ]
-        # Filter out variations that don't make sense
-        role_variations = [r for r in role_variations if "Manager Manager" not in r]
-        specialized_titles.extend(role_variations)
-    
-    # Combine base and specialized titles
-    all_titles = base_titles + specialized_titles
-    return all_titles
+    return list(title_pool(industry, target_role))
 
 def generate_email_template(name, title, company, industry, industry_focus=None, target_role=None):
     """
     Generate a personalized cold outreach email template using all available parameters.
     """
-    first_name = name.split()[0]
-    
-    # Create more specific subject line if we have industry focus
-    if industry_focus:
-        subject = f"Quick question about {company}'s {industry_focus} initiatives"
-    else:
-        subject = f"Quick question about {company}'s {industry} initiatives"
-    
-    # Industry-specific opening lines
-    industry_openings = {
-        "Technology & Software": [
-            f"I noticed your role as {title} at {company} and your focus on {industry_focus or 'technology'} really caught my attention.",
-            f"Your background in {target_role or 'technology leadership'} at {company} is impressive.",
-            f"I've been following {company}'s innovations in {industry_focus or 'the tech space'} and wanted to connect."
-        ],
-        "Finance & Banking": [
-            f"Your experience as {title} at {company} in the {industry_focus or 'financial'} sector stands out.",
-            f"I've been researching leaders in {industry_focus or 'finance'} and your work at {company} is noteworthy.",
-            f"Your background in {target_role or 'financial leadership'} is exactly what I was looking for."
-        ],
-        "Healthcare & Pharmaceuticals": [
-            f"I've been following {company}'s advancements in {industry_focus or 'healthcare'} and was impressed by your work as {title}.",
-            f"Your expertise in {target_role or 'healthcare management'} at {company} caught my attention.",
-            f"I'm reaching out to leaders in {industry_focus or 'healthcare'} like yourself who are making an impact."
-        ]
-    }
-    
-    # Get industry-specific opening or use generic one if not found
-    openings = industry_openings.get(industry, [
-        f"I noticed your role as {title} at {company} and your experience in the {industry} sector really caught my attention.",
-        f"Your background at {company} in {industry} is impressive.",
-        f"I've been researching leaders in {industry} and your work stood out to me."
-    ])
-    
-    # Use specific value proposition if we have industry focus and target role
-    if industry_focus and target_role:
-        value_prop = f"I'm reaching out because I've helped similar {industry_focus} companies improve their operations specifically for {target_role}s and drive growth."
-    elif industry_focus:
-        value_prop = f"I'm reaching out because I've helped similar companies in the {industry_focus} space streamline their operations and drive growth."
-    elif target_role:
-        value_prop = f"I'm reaching out because I've helped {target_role}s in {industry} companies streamline their operations and drive growth."
-    else:
-        value_prop = f"I'm reaching out because I've helped similar {industry} companies streamline their operations and drive growth."
-    
-    # Construct the email template
-    template = f"""Subject: {subject}
-
-Hi {first_name},
-
-{random.choice(openings)}
-
-{value_prop} I'd love to share some specific ideas I have for {company}.
-
-Would you be open to a brief 15-minute chat this week to discuss how we might be able to help?
-
-Best regards,
-[Your name]"""
-
-    return template
+    template_id = random.choice(email_template_ids(industry, industry_focus, target_role))
+    return render(template_id, {"first_name": name.split()[0], "company": company, "title": title})
 
 def generate_follow_up_templates(name, company, industry, industry_focus=None, target_role=None):
     """
     Generate follow-up email templates based on different response scenarios,
     incorporating industry, focus, and role information.
     """
-    first_name = name.split()[0]
-    
-    # More specific subject lines based on response type
-    positive_subject = "Excited to Connect – Next Steps"
-    negative_subject = "Appreciate Your Time – Happy to Stay in Touch"
-    no_response_subject = f"Following Up on {industry_focus or industry} Discussion"
-    
-    # Specific value proposition based on available parameters
-    if industry_focus and target_role:
-        value_prop = f"how we can support {company}'s {industry_focus} initiatives, particularly for {target_role}s"
-    elif industry_focus:
-        value_prop = f"how we can support {company}'s {industry_focus} initiatives"
-    elif target_role:
-        value_prop = f"how we can support {company}'s {target_role}s"
-    else:
-        value_prop = f"how we can support {company}"
-    
-    # Industry-specific resources to offer in negative response
-    industry_resources = {
-        "Technology & Software": f"our latest guide on optimizing {industry_focus or 'technology'} processes",
-        "Finance & Banking": f"a market analysis on trends in {industry_focus or 'financial services'}",
-        "Healthcare & Pharmaceuticals": f"a whitepaper on innovations in {industry_focus or 'healthcare'} management",
-        "Manufacturing & Industrial": f"our case study on improving efficiency in {industry_focus or 'manufacturing'} operations",
-        "Retail & E-commerce": f"our report on {industry_focus or 'retail'} customer engagement strategies",
-        "Education & Training": f"our guide on {industry_focus or 'education'} technology integration",
-        "Professional Services": f"a framework for optimizing {industry_focus or 'professional service'} delivery",
-        "Media & Entertainment": f"our analysis of {industry_focus or 'media'} audience engagement trends",
-        "Energy & Utilities": f"our whitepaper on {industry_focus or 'energy'} efficiency innovations"
-    }
-    
-    # Get industry-specific resource or use generic one if not found
-    resource = industry_resources.get(industry, f"some insights that might be valuable for {company}")
-    
-    # Create templates with the personalized information
+    values = {"first_name": name.split()[0], "company": company}
     return {
-        "positive": f"""Subject: {positive_subject}
-
-Hi {first_name},
-
-Thanks for your response! I'm glad to hear you're open to discussing {value_prop}.
-
-Let's schedule a time that works best for you. Are you available [provide two or three time slots], or would you prefer to suggest a time? I'll send over a calendar invite once we confirm.
-
-In the meantime, if there are any specific challenges or goals you'd like me to focus on during our call, feel free to share—I want to make the most of our time.
-
-Looking forward to our conversation!
-
-Best regards,
-[Your Name]""",
-
-        "negative": f"""Subject: {negative_subject}
-
-Hi {first_name},
-
-I appreciate you getting back to me. I completely understand that now might not be the right time.
-
-If things change or if you'd like to revisit this conversation down the road, I'd be happy to connect when it makes sense for you. In the meantime, I'll stay in touch and share {resource} that might be valuable for {company}.
-
-Wishing you continued success, and feel free to reach out anytime!
-
-Best regards,
-[Your Name]""",
-
-        "no_response": f"""Subject: {no_response_subject}
-
-Hi {first_name},
-
-I hope you're doing well! I wanted to follow up on my previous email to see if you had a chance to review it. I understand things get busy, and I completely respect your time.
-
-I'd still love the opportunity to connect and share some ideas on {value_prop}. Would you be open to a quick 15-minute chat this week? Let me know if there's a time that works for you.
-
-Best regards,
-[Your Name]"""
-    }
\ No newline at end of file
+        scenario: render(template_id, values)
+        for scenario, template_id in follow_up_template_ids(industry, industry_focus, target_role).items()
+    }